@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Python Thinker App
+Generates a synthetic workspace and times storage operations on it
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from dataclasses import asdict
+
+from thinker_app import ThinkerApp, Thought, ThinkingSession
+from thinker_ids import new_id
+from thinker_site import build_site
+from thinker_index import HierarchyIndex, LinkIndex, PrefixIndex, ReminderScheduler
+from thinker_query import ThoughtFilter, parse_capture
+from thinker_storage import atomic_data_writer, write_json_array
+from thinker_viewer import MappedWorkspace
+from thinker_watch import DataFileWatcher
+
+CATEGORIES = ["general", "ideas", "goals", "tasks", "questions", "notes"]
+TAGS = ["infra", "ui", "research", "action", "discuss", "later"]
+
+
+def make_sessions(session_count: int, thoughts_per_session: int, seed: int = 42):
+    """Build a synthetic list of sessions"""
+    rng = random.Random(seed)
+    sessions = []
+    for s in range(session_count):
+        thoughts = []
+        for t in range(thoughts_per_session):
+            timestamp = f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00.{s:03d}{t:03d}"
+            thoughts.append(Thought(
+                id=f"{s:04x}{t:04x}",
+                content=f"Thought {t} of session {s}: " + " ".join(rng.choices(TAGS + CATEGORIES, k=8)),
+                category=rng.choice(CATEGORIES),
+                priority=rng.randint(1, 5),
+                tags=rng.sample(TAGS, 2),
+                created_at=timestamp,
+                updated_at=timestamp,
+                is_completed=rng.random() < 0.6,
+            ))
+        sessions.append(ThinkingSession(
+            id=f"s{s:07x}", title=f"Session {s}", description="Benchmark session",
+            thoughts=thoughts, created_at=thoughts[0].created_at if thoughts else "2026-01-01T00:00:00",
+            updated_at="2026-10-01T00:00:00",
+        ))
+    return sessions
+
+
+def timed(action):
+    """Run action with its chatter suppressed and return elapsed seconds"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        action()
+    return time.perf_counter() - start
+
+
+def bench_storage(sessions, directory: str):
+    """Time save/load and report disk size for each codec and layout"""
+    print("\nStorage (save / load / size):")
+    print(f"{'file':<28} {'save s':>8} {'load s':>8} {'size MB':>9}")
+    for name in ["thoughts.json", "thoughts.json.gz", "thoughts.json.bz2", "thoughts.json.xz"]:
+        for compact in (False, True):
+            path = os.path.join(directory, name)
+            app = ThinkerApp(path, compact=compact)
+            app.sessions = sessions
+            save_time = timed(app.save_data)
+            load_time = timed(lambda: ThinkerApp(path))
+            size = os.path.getsize(path) / 1e6
+            label = name + (" (compact)" if compact else "")
+            print(f"{label:<28} {save_time:>8.2f} {load_time:>8.2f} {size:>9.2f}")
+            os.remove(path)
+
+
+def bench_incremental_save(sessions, directory: str):
+    """Time a full save against a save after touching one thought"""
+    path = os.path.join(directory, "thoughts.json")
+    app = ThinkerApp(path)
+    app.sessions = sessions
+    app.rebuild_indexes()
+    full = timed(app.save_data)
+    clean = timed(app.save_data)
+    timed(lambda: app.complete_thought(sessions[0].thoughts[0].id))
+    one = timed(app.save_data)
+    print("\nIncremental save:")
+    print(f"   full save {full:.2f}s, clean save {clean:.4f}s, one changed thought {one:.2f}s")
+    os.remove(path)
+
+
+def bench_migration(sessions, directory: str):
+    """Time loading and upgrading a legacy (schema version 0) bare-list file"""
+    path = os.path.join(directory, "legacy.json")
+    with atomic_data_writer(path) as f:
+        write_json_array(f, (asdict(session) for session in sessions))
+    loaded = []
+    legacy_load = timed(lambda: loaded.append(ThinkerApp(path)))
+    upgrade_save = timed(loaded[0].save_data)
+    current_load = timed(lambda: ThinkerApp(path))
+    print("\nSchema migration (version 0 -> current):")
+    print(f"   legacy load {legacy_load:.2f}s, upgrading save {upgrade_save:.2f}s, "
+          f"load after upgrade {current_load:.2f}s")
+    os.remove(path)
+    os.remove(path + ".v0.bak")
+
+
+def bench_viewer(sessions, directory: str):
+    """Time opening a file in the read-only viewer against a full load"""
+    path = os.path.join(directory, "thoughts.json")
+    app = ThinkerApp(path)
+    app.sessions = sessions
+    app.rebuild_indexes()
+    timed(app.save_data)
+    full = timed(lambda: ThinkerApp(path))
+    opened = []
+    index = timed(lambda: opened.append(MappedWorkspace(path)))
+    with opened[0] as workspace:
+        search = timed(lambda: workspace.search("ideas"))
+    print("\nRead-only viewer:")
+    print(f"   full load {full:.2f}s, viewer index {index:.2f}s, first 50 search hits {search * 1000:.1f} ms")
+    os.remove(path)
+
+
+def bench_watch(sessions, directory: str):
+    """Time picking up one session edited by another process against a full reload"""
+    path = os.path.join(directory, "thoughts.json")
+    writer = ThinkerApp(path)
+    writer.sessions = sessions
+    writer.rebuild_indexes()
+    timed(writer.save_data)
+    loaded = []
+    full = timed(lambda: loaded.append(ThinkerApp(path)))
+    watcher = DataFileWatcher(loaded[0])
+    baseline = timed(watcher.baseline)
+    timed(lambda: writer.complete_thought(sessions[-1].thoughts[0].id))
+    timed(writer.save_data)
+    found = []
+    scan = timed(lambda: found.append(watcher.poll()))
+    apply = timed(lambda: loaded[0].apply_external_changes(found[0]))
+    print("\nExternal change watcher:")
+    print(f"   full reload {full:.2f}s, baseline hashes {baseline:.2f}s, "
+          f"scan {scan:.2f}s ({len(found[0].changed)} changed), apply {apply * 1000:.1f} ms")
+    os.remove(path)
+
+
+def bench_session_cache(sessions, directory: str, budget_mb: int = 16):
+    """Compare memory held and access times with every session resident and with a small budget"""
+    path = os.path.join(directory, "thoughts.json")
+    app = ThinkerApp(path)
+    app.sessions = sessions
+    app.rebuild_indexes()
+    timed(app.save_data)
+    print("\nSession cache (memory after load, select every session, workspace query, save after one edit):")
+    for budget in (None, budget_mb * 1024 * 1024):
+        loaded = []
+        tracemalloc.start()
+        timed(lambda: loaded.append(ThinkerApp(path, memory_budget=budget)))
+        held = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        app = loaded[0]
+        select = timed(lambda: [app.select_session(session.id) for session in app.sessions])
+        query = timed(lambda: app.query_thoughts("all thoughts where priority>=4 and tag:infra"))
+        timed(lambda: app.complete_thought(sessions[0].thoughts[0].id))
+        save = timed(app.save_data)
+        stats = app.session_cache.stats()
+        label = "unbounded" if budget is None else f"{budget_mb} MB budget"
+        print(f"   {label:<14} {held:>7.1f} MB held, select {select:.2f}s, query {query:.2f}s, save {save:.2f}s "
+              f"({stats['resident_sessions']} sessions resident, {stats['misses']} misses, "
+              f"{stats['evictions']} evictions)")
+    os.remove(path)
+
+
+def bench_bulk(sessions, directory: str):
+    """Time completing and deleting every match of a query one ID at a time against one bulk update"""
+    base = os.path.join(directory, "bulk-base.json")
+    path = os.path.join(directory, "thoughts.json")
+    app = ThinkerApp(base)
+    app.sessions = sessions
+    app.rebuild_indexes()
+    timed(app.save_data)
+    query = "all thoughts where tag:later and priority<=2"
+    print("\nBulk updates (per-ID calls against one bulk update, then the save):")
+    for action, single in (("complete", ThinkerApp.complete_thought), ("delete", ThinkerApp.delete_thought)):
+        shutil.copyfile(base, path)
+        app = ThinkerApp(path)
+        matches = [thought.id for thought in app.query_thoughts(query)[1]]
+        one_by_one = timed(lambda: [single(app, thought_id) for thought_id in matches])
+        shutil.copyfile(base, path)
+        app = ThinkerApp(path)
+        bulk = timed(lambda: app.bulk_update(query, action, save=False))
+        save = timed(app.save_data)
+        print(f"   {action:<9} {len(matches)} thoughts: one by one {one_by_one:.2f}s, bulk {bulk:.2f}s, "
+              f"save {save:.2f}s")
+    os.remove(path)
+    os.remove(base)
+
+
+def bench_export_cache(sessions, directory: str):
+    """Time exporting every session twice: rendered, then copied from the cache"""
+    path = os.path.join(directory, "thoughts.json")
+    app = ThinkerApp(path)
+    app.sessions = sessions
+    app.rebuild_indexes()
+    target = os.path.join(directory, "export.md")
+    working_set = sessions[:app.render_cache.capacity]
+    cold = timed(lambda: [app._export_to_markdown(session, target) for session in working_set])
+    warm = timed(lambda: [app._export_to_markdown(session, target) for session in working_set])
+    print("\nExport render cache:")
+    print(f"   {len(working_set)} markdown exports: rendered {cold:.2f}s, cached {warm:.2f}s "
+          f"({app.render_cache.hits} hits, {app.render_cache.misses} misses)")
+    os.remove(target)
+
+
+def bench_site(sessions, directory: str):
+    """Time a full static site build, a rebuild with no changes and one after a single edit"""
+    app = ThinkerApp(os.path.join(directory, "thoughts.json"))
+    app.sessions = sessions
+    app.rebuild_indexes()
+    target = os.path.join(directory, "site")
+    full = build_site(app, target)
+    unchanged = build_site(app, target)
+    timed(lambda: app.complete_thought(sessions[0].thoughts[1].id))
+    edited = build_site(app, target)
+    print("\nStatic site:")
+    print(f"   full build {full.rendered} pages in {full.seconds:.2f}s ({full.pages_per_second:.0f} pages/sec), "
+          f"no changes {unchanged.seconds:.2f}s, one edit {edited.rendered} pages in {edited.seconds:.2f}s")
+
+
+def bench_ids(count: int = 1_000_000):
+    """Time generating IDs and resolving unique prefixes of them"""
+    ids = []
+    generate = timed(lambda: ids.extend(new_id() for _ in range(count)))
+    index = PrefixIndex()
+    build = timed(lambda: [index.add(thought_id) for thought_id in ids])
+    probes = random.Random(7).sample(ids, 10_000)
+    resolve = timed(lambda: [index.matches(thought_id[:12]) for thought_id in probes])
+    print("\nIDs:")
+    print(f"   {count} IDs ({len(set(ids))} unique): generate {generate:.2f}s, index {build:.2f}s, "
+          f"{len(probes)} prefix lookups {resolve * 1000:.1f} ms")
+
+
+def bench_reminders(count: int = 100_000):
+    """Time scheduling reminders and finding the next due one among count pending"""
+    rng = random.Random(11)
+    reminders = [Thought(id=f"r{n:07x}", content="", category="general", priority=3, tags=[],
+                         created_at="2026-01-01T00:00:00", updated_at="2026-01-01T00:00:00",
+                         remind_at=f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00")
+                 for n in range(count)]
+    scheduler = ReminderScheduler()
+    owner = ThinkingSession("s", "", "", reminders, "", "")
+    build = timed(lambda: scheduler.rebuild([owner]))
+    peeks = timed(lambda: [scheduler.next() for _ in range(10_000)])
+    edits = reminders[:10_000]
+
+    def reschedule():
+        for thought in edits:
+            scheduler.remove(owner, thought)
+            thought.remind_at = "2026-06-15T12:00:00"
+            scheduler.add(owner, thought)
+    moved = timed(reschedule)
+    fired = []
+    pop = timed(lambda: fired.extend(scheduler.pop_due("2026-02-01")))
+    print("\nReminders:")
+    print(f"   {count} pending: build {build * 1000:.1f} ms, 10000 next-due lookups {peeks * 1000:.1f} ms, "
+          f"10000 reschedules {moved * 1000:.1f} ms, fired {len(fired)} due in {pop * 1000:.1f} ms")
+
+
+def bench_hierarchy(count: int = 100_000, fanout: int = 5):
+    """Time indexing a tree of count sub-thoughts and querying and updating it"""
+    thoughts = [Thought(id=f"h{n:07x}", content="", category="general", priority=3, tags=[],
+                        created_at="2026-01-01T00:00:00", updated_at="2026-01-01T00:00:00",
+                        parent_id=f"h{(n - 1) // fanout:07x}" if n else None)
+                for n in range(count)]
+    owner = ThinkingSession("s", "", "", thoughts, "", "")
+    index = HierarchyIndex()
+    build = timed(lambda: index.rebuild([owner]))
+    root = thoughts[0]
+    counts = timed(lambda: [index.progress(thought) for thought in thoughts[:10_000]])
+    subtree = timed(lambda: index.descendants(root.id))
+    leaves = thoughts[-1000:]
+
+    def complete_leaves():
+        for thought in leaves:
+            index.remove(owner, thought)
+            thought.is_completed = True
+            index.add(owner, thought)
+    complete = timed(complete_leaves)
+    print("\nSub-thoughts:")
+    print(f"   {count} thoughts, depth {len(index.ancestors(thoughts[-1].id))}: build {build * 1000:.1f} ms, "
+          f"10000 subtree totals {counts * 1000:.1f} ms, full subtree {subtree * 1000:.1f} ms, "
+          f"completing 1000 leaves {complete * 1000:.1f} ms ({index.progress(root)[0]} done at the root)")
+
+
+def bench_links(count: int = 100_000, links_per_thought: int = 3):
+    """Time indexing a random link graph and running path and component queries on it"""
+    rng = random.Random(5)
+    thoughts = [Thought(id=f"g{n:07x}", content="", category="general", priority=3, tags=[],
+                        created_at="2026-01-01T00:00:00", updated_at="2026-01-01T00:00:00",
+                        links=[[f"g{rng.randrange(count):07x}", "related"] for _ in range(links_per_thought)])
+                for n in range(count)]
+    owner = ThinkingSession("s", "", "", thoughts, "", "")
+    index = LinkIndex()
+    build = timed(lambda: index.rebuild([owner]))
+    pairs = [(rng.choice(thoughts).id, rng.choice(thoughts).id) for _ in range(100)]
+    paths = []
+    search = timed(lambda: paths.extend(index.shortest_path(a, b) for a, b in pairs))
+    groups = []
+    components = timed(lambda: groups.extend(index.components()))
+    longest = max(len(path) - 1 for path in paths if path)
+    print("\nThought links:")
+    print(f"   {count} thoughts, {index.link_count()} links: build {build:.2f}s, 100 shortest paths {search:.2f}s "
+          f"(longest {longest} links), components {components:.2f}s ({len(groups)} groups)")
+
+
+def bench_capture(count: int = 20_000):
+    """Time parsing pasted brainstorm lines and adding them one at a time against in one batch"""
+    rng = random.Random(9)
+    lines = [f"!{rng.randint(1, 5)} @{rng.choice(CATEGORIES)} #{rng.choice(TAGS)} pasted idea number {n}"
+             for n in range(count)]
+    captures = []
+    parse = timed(lambda: captures.extend(parse_capture(line, "brainstorm", 3, ["brainstorm"]) for line in lines))
+    print("\nBrainstorm capture:")
+    print(f"   parse {count} lines {parse:.3f}s ({count / parse:,.0f} lines/sec)")
+    with tempfile.TemporaryDirectory() as directory:
+        for label in ("one at a time", "one batch"):
+            app = ThinkerApp(os.path.join(directory, "capture.json"))
+            timed(lambda: app.create_session("Paste"))
+            if label == "one batch":
+                elapsed = timed(lambda: app.add_thoughts(captures))
+            else:
+                elapsed = timed(lambda: [app.add_thought(c.content, c.category, c.priority, c.tags) for c in captures])
+            print(f"   add {label:<14} {elapsed:.2f}s ({count / elapsed:,.0f} thoughts/sec)")
+
+
+def bench_live_filter(sessions):
+    """Time the GUI live filter over every thought, typed one character at a time"""
+    thoughts = [thought for session in sessions for thought in session.thoughts]
+    source, previous, slowest = thoughts, None, 0.0
+    for length in range(1, len("ideas") + 1):
+        live = ThoughtFilter(text="ideas"[:length])
+        if previous is None or not live.refines(previous):
+            source = thoughts
+        start = time.perf_counter()
+        source = [thought for thought in source if live.matches(thought)]
+        slowest = max(slowest, time.perf_counter() - start)
+        previous = live
+    full = timed(lambda: [thought for thought in thoughts if previous.matches(thought)])
+    print("\nLive filter:")
+    print(f"   {len(thoughts)} thoughts: full pass {full * 1000:.1f} ms, "
+          f"slowest keystroke while refining {slowest * 1000:.1f} ms")
+
+
+def main():
+    """Run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--thoughts", type=int, default=250, help="thoughts per session")
+    args = parser.parse_args()
+
+    print(f"Python Thinker benchmark: {args.sessions} sessions x {args.thoughts} thoughts")
+    sessions = make_sessions(args.sessions, args.thoughts)
+    with tempfile.TemporaryDirectory() as directory:
+        bench_storage(sessions, directory)
+        bench_incremental_save(sessions, directory)
+        bench_migration(sessions, directory)
+        bench_viewer(sessions, directory)
+        bench_watch(sessions, directory)
+        bench_session_cache(sessions, directory)
+        bench_bulk(sessions, directory)
+        bench_export_cache(sessions, directory)
+        bench_site(sessions, directory)
+    bench_live_filter(sessions)
+    bench_capture()
+    bench_reminders()
+    bench_hierarchy()
+    bench_links()
+    bench_ids()
+
+
+if __name__ == "__main__":
+    main()
@@ -63,6 +63,21 @@ def create_release_structure():
         "launcher.py",
         "thinker_app.py", 
         "thinker_gui.py",
+        "thinker_cache.py",
+        "thinker_export.py",
+        "thinker_graph.py",
+        "thinker_ids.py",
+        "thinker_index.py",
+        "thinker_query.py",
+        "thinker_schema.py",
+        "thinker_site.py",
+        "thinker_storage.py",
+        "thinker_sync.py",
+        "thinker_viewer.py",
+        "thinker_watch.py",
+        "benchmark.py",
+        "test_thinker_sync.py",
+        "test_thinker_site.py",
         "build_standalone.bat",
         "build_standalone.ps1",
         "build_standalone.py",
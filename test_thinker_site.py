@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for static site generation
+Run with: python -m unittest test_thinker_site
+"""
+
+import contextlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from thinker_app import ThinkerApp
+from thinker_site import build_site, slug
+
+
+def quietly(action, *args, **kwargs):
+    """Call action with its chatter suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return action(*args, **kwargs)
+
+
+class SlugCollisionTests(unittest.TestCase):
+    """Categories and tags whose plain slugs collide must still get pages of their own"""
+
+    NAMES = ["C++", "C#", "c", "日本", "研究", "Python", "python"]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = ThinkerApp(os.path.join(self.directory, "data.json"))
+        quietly(self.app.create_session, "Languages")
+        for name in self.NAMES:
+            quietly(self.app.add_thought, f"About {name}", category=name, tags=[name])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_slugs_are_distinct(self):
+        self.assertEqual(len({slug(name) for name in self.NAMES}), len(self.NAMES))
+        self.assertEqual(slug("c"), "c")
+        self.assertEqual(slug("2026-10"), "2026-10")
+        self.assertEqual(slug("C++"), slug("C++"))
+
+    def test_each_name_gets_its_own_page(self):
+        site = os.path.join(self.directory, "site")
+        quietly(build_site, self.app, site, workers=1)
+        for group in ("categories", "tags"):
+            self.assertEqual(len(os.listdir(os.path.join(site, group))), len(self.NAMES))
+            for name in self.NAMES:
+                with open(os.path.join(site, group, f"{slug(name)}.html"), encoding='utf-8') as f:
+                    page = f.read()
+                self.assertIn('<p class="meta">1 thoughts</p>', page)
+                self.assertIn(f"About {name}", page.replace("&#x27;", "'").replace("&amp;", "&"))
+
+        with open(os.path.join(site, "index.html"), encoding='utf-8') as f:
+            links = re.findall(r'href="((?:categories|tags)/[^"]+)"', f.read())
+        self.assertEqual(len(set(links)), 2 * len(self.NAMES))
+        self.assertTrue(all(os.path.exists(os.path.join(site, link)) for link in links))
+
+
+if __name__ == "__main__":
+    unittest.main()
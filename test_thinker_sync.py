@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for Merkle sync between an open workspace and another data file
+Run with: python -m unittest test_thinker_sync
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from thinker_app import ThinkerApp
+from thinker_sync import FileReplica
+
+
+def quietly(action, *args, **kwargs):
+    """Call action with its chatter suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return action(*args, **kwargs)
+
+
+def placement(path: str):
+    """{thought id: session id} and {session id: tombstoned thought ids} of a data file"""
+    with open(path, encoding='utf-8') as f:
+        sessions = json.load(f)['sessions']
+    owners = {thought['id']: session['id'] for session in sessions for thought in session['thoughts']}
+    tombstones = {session['id']: set(session['deleted_thoughts']) for session in sessions}
+    return owners, tombstones
+
+
+class SyncMoveTests(unittest.TestCase):
+    """Thoughts moved between sessions on one side must sync as a move, in either direction"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.local_file = os.path.join(self.directory, "a.json")
+        self.remote_file = os.path.join(self.directory, "b.json")
+        app = ThinkerApp(self.local_file)
+        for title in ("One", "Two", "Three"):
+            quietly(app.create_session, title)
+            for n in range(40):
+                quietly(app.add_thought, f"{title} thought {n}")
+        quietly(app.save_data)
+        shutil.copy(self.local_file, self.remote_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def move_and_sync(self, mover: ThinkerApp, other: ThinkerApp, sync_file: str):
+        one, two = mover.sessions[0], mover.sessions[1]
+        moved = [thought.id for thought in list(one.thoughts)[:25]]
+        quietly(mover.bulk_apply, moved, 'move', two.id)
+        report = quietly(other.sync_with, sync_file)
+        self.assertTrue(report.sessions_compared)
+        quietly(other.save_data)
+
+        local, remote = placement(self.local_file), placement(self.remote_file)
+        self.assertEqual(local, remote)
+        owners, tombstones = local
+        self.assertEqual(len(owners), 120)
+        self.assertTrue(all(owners[thought_id] == two.id for thought_id in moved))
+        self.assertTrue(set(moved) <= tombstones[one.id])
+        self.assertFalse(quietly(other.sync_with, sync_file).sessions_compared)
+        return moved
+
+    def test_bulk_move_then_sync(self):
+        local = ThinkerApp(self.local_file)
+        self.move_and_sync(local, local, self.remote_file)
+
+    def test_move_in_the_other_file(self):
+        remote = ThinkerApp(self.remote_file)
+        local = ThinkerApp(self.local_file)
+        self.move_and_sync(remote, local, self.remote_file)
+
+    def test_move_with_evicted_sessions(self):
+        local = ThinkerApp(self.local_file, memory_budget=1)
+        self.move_and_sync(local, local, self.remote_file)
+
+    def test_bulk_move_of_sub_thoughts_then_sync(self):
+        local = ThinkerApp(self.local_file)
+        one, two = local.sessions[0], local.sessions[1]
+        parent, child, grandchild = list(one.thoughts)[:3]
+        quietly(local.nest_thought, child.id, parent.id)
+        quietly(local.nest_thought, grandchild.id, child.id)
+        quietly(local.save_data)
+        shutil.copy(self.local_file, self.remote_file)
+
+        quietly(local.bulk_apply, [parent.id, grandchild.id], 'move', two.id)
+        moved_at = local.thought_index.get(parent.id)[1].updated_at
+        self.assertEqual(one.deleted_thoughts[parent.id], moved_at)
+        remote = ThinkerApp(self.remote_file)
+        quietly(remote.sync_with, self.local_file)
+        quietly(remote.save_data)
+
+        self.assertEqual(placement(self.local_file), placement(self.remote_file))
+        for app in (local, ThinkerApp(self.remote_file)):
+            self.assertEqual(app.thought_index.get(child.id)[0].id, one.id)
+            self.assertIsNone(app.thought_index.get(child.id)[1].parent_id)
+            self.assertIsNone(app.thought_index.get(grandchild.id)[1].parent_id)
+            self.assertEqual(app.thought_index.get(parent.id)[0].id, two.id)
+
+    def test_failed_merge_leaves_both_sides_untouched(self):
+        remote = ThinkerApp(self.remote_file)
+        quietly(remote.bulk_apply, [thought.id for thought in remote.sessions[2].thoughts], 'complete')
+        local = ThinkerApp(self.local_file)
+        quietly(local.bulk_apply, [thought.id for thought in list(local.sessions[0].thoughts)[:10]],
+                'move', local.sessions[1].id, save=False)
+        before = [(session.id, [vars(thought).copy() for thought in session.thoughts], dict(session.deleted_thoughts))
+                  for session in local.sessions]
+        dirty = {session_id: set(ids) for session_id, ids in local.dirty.items()}
+        with open(self.remote_file, 'rb') as f:
+            remote_bytes = f.read()
+
+        calls = []
+        put_thought = FileReplica.put_thought
+
+        def failing_put(replica, *args):
+            calls.append(args)
+            if len(calls) == 5:
+                raise RuntimeError("disk on fire")
+            return put_thought(replica, *args)
+
+        with mock.patch.object(FileReplica, 'put_thought', failing_put):
+            with self.assertRaises(RuntimeError):
+                quietly(local.sync_with, self.remote_file)
+
+        after = [(session.id, [vars(thought).copy() for thought in session.thoughts], dict(session.deleted_thoughts))
+                 for session in local.sessions]
+        self.assertEqual(after, before)
+        self.assertEqual(local.dirty, dirty)
+        with open(self.remote_file, 'rb') as f:
+            self.assertEqual(f.read(), remote_bytes)
+        self.assertEqual(len(local.thought_index), 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
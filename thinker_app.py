@@ -3,12 +3,33 @@
 Python Thinker App - A tool to help organize thoughts, brainstorm ideas, and structure thinking
 """
 
+import io
 import json
 import os
+import bisect
 import datetime
-from typing import List, Dict, Any
-from dataclasses import dataclass, asdict
-import uuid
+import heapq
+import itertools
+import shutil
+from typing import List, Dict, Any, Callable, Optional
+from dataclasses import dataclass, asdict, field, replace
+import copy
+import functools
+
+from thinker_cache import SessionCache, SpilledSession, estimate_size, thought_size
+from thinker_export import RenderCache, file_stamp
+from thinker_graph import component_graph, session_mind_map
+from thinker_ids import new_id
+from thinker_index import (WorkspaceAnalytics, ThoughtIdIndex, TimeIndex, AttributeIndex, OrderedIndex, PrefixIndex,
+                           DueIndex, ReminderScheduler, HierarchyIndex, LinkIndex)
+from thinker_query import (QueryPlanner, QueryError, Capture, parse_capture, parse_query, parse_time_bound,
+                           parse_when)
+from thinker_site import build_site
+from thinker_schema import SCHEMA_VERSION, SchemaError, DataDocument, encode_session, write_document
+from thinker_storage import open_data_file, atomic_data_writer, archive_file, STREAM_ERRORS
+from thinker_sync import export_changes, load_tombstones, save_tombstones, sync_with_file
+from thinker_viewer import run_viewer
+from thinker_watch import ExternalChanges, record_hash
 
 @dataclass
 class Thought:
@@ -21,6 +42,10 @@ class Thought:
     created_at: str
     updated_at: str
     is_completed: bool = False
+    due_at: Optional[str] = None  # a date ('2026-10-23') or an ISO timestamp
+    remind_at: Optional[str] = None  # ISO timestamp; cleared once the reminder fires
+    parent_id: Optional[str] = None  # set on sub-thoughts; the parent is in the same session
+    links: List[List[str]] = field(default_factory=list)  # [target thought id, link type], any session
 
 @dataclass
 class ThinkingSession:
@@ -31,55 +56,390 @@ class ThinkingSession:
     thoughts: List[Thought]
     created_at: str
     updated_at: str
+    deleted_thoughts: Dict[str, str] = field(default_factory=dict)  # id -> deleted_at tombstones
+
+@dataclass
+class SaveSnapshot:
+    """Everything one save writes, detached from the live sessions
+    
+    records holds, per session, its ID and its cached encoding, the spill file of
+    an evicted session or a detached copy still to be encoded, so write() may run
+    on a worker thread.
+    """
+    data_file: str
+    indent: Optional[int]
+    records: List[Any]
+    metadata: Dict[str, Any]
+    deleted_sessions: Dict[str, str]
+    backup: Optional[str]  # where to keep the pre-upgrade file, if upgrading
+    dirty: Dict[str, set]
+    structure_dirty: bool
+    versions: Dict[str, int] = field(default_factory=dict)  # session versions being written
+    hashes: Dict[str, str] = field(default_factory=dict)  # session id -> record_hash of what write() wrote
+    
+    def write(self, progress: Callable[[float], None] = None) -> Dict[str, str]:
+        """Write the data file, returning the encodings made for changed sessions"""
+        if self.backup and not os.path.exists(self.backup):
+            # Keep the pre-upgrade file in case an older copy of the app still needs it
+            shutil.copyfile(self.data_file, self.backup)
+        encoded = {}
+        
+        def encoded_sessions():
+            for position, (session_id, record) in enumerate(self.records, 1):
+                if isinstance(record, SpilledSession):
+                    record = record.text(self.indent)
+                elif not isinstance(record, str):
+                    text = encode_session(asdict(record), self.indent)
+                    encoded[session_id] = text
+                    record = text
+                self.hashes[session_id] = record_hash(record)
+                yield record
+                if progress:
+                    progress(position / len(self.records))
+        
+        # Sessions are written one at a time and the file is replaced only once complete
+        with atomic_data_writer(self.data_file) as f:
+            write_document(f, encoded_sessions(), self.metadata, self.indent)
+        save_tombstones(self.data_file, self.deleted_sessions)
+        return encoded
+
+def detached_session(session: ThinkingSession) -> ThinkingSession:
+    """Copy a session and its thoughts so later edits don't reach the copy"""
+    return replace(session, thoughts=[copy.copy(thought) for thought in session.thoughts],
+                   deleted_thoughts=dict(session.deleted_thoughts))
+
+def holding_sessions(method):
+    """Keep every session an operation faults in resident until it returns"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.session_cache.hold():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def outline_by_category(thoughts: List[Thought]) -> Dict[str, List[tuple]]:
+    """Group top-level thoughts by category, each followed by its sub-thoughts as (depth, thought)
+    
+    Thoughts are ordered by priority (high to low) among their siblings. Works
+    on detached copies, so the links are rebuilt from the list in one pass.
+    """
+    ids = {thought.id for thought in thoughts}
+    children: Dict[str, List[Thought]] = {}
+    categories: Dict[str, List[Thought]] = {}
+    for thought in thoughts:
+        if thought.parent_id in ids:
+            children.setdefault(thought.parent_id, []).append(thought)
+        else:
+            categories.setdefault(thought.category, []).append(thought)
+    
+    def by_priority(siblings, depth):
+        # Reversed for the stack, so the highest priority (then the earliest added) comes off first
+        return [(depth, thought) for thought in reversed(sorted(siblings, key=lambda x: x.priority, reverse=True))]
+    
+    outline: Dict[str, List[tuple]] = {}
+    placed = set()
+    for category, roots in categories.items():
+        entries = outline[category] = []
+        stack = by_priority(roots, 0)
+        while stack:
+            depth, thought = stack.pop()
+            placed.add(thought.id)
+            entries.append((depth, thought))
+            stack.extend(by_priority(children.get(thought.id, []), depth + 1))
+    # Thoughts caught in a parent cycle (only possible in hand-edited files) are listed flat
+    for thought in thoughts:
+        if thought.id not in placed:
+            outline.setdefault(thought.category, []).append((0, thought))
+    return outline
+
+def session_from_dict(data: Dict[str, Any]) -> ThinkingSession:
+    """Build a ThinkingSession (and its thoughts) from its saved dictionary form"""
+    return ThinkingSession(
+        id=data['id'],
+        title=data['title'],
+        description=data['description'],
+        thoughts=[Thought(**thought) for thought in data['thoughts']],
+        created_at=data['created_at'],
+        updated_at=data['updated_at'],
+        deleted_thoughts=data.get('deleted_thoughts', {})
+    )
 
 class ThinkerApp:
     """Main application class for the Python Thinker"""
     
-    def __init__(self, data_file: str = "thoughts.json"):
+    def __init__(self, data_file: str = "thoughts.json", compact: bool = False,
+                 progress: Callable[[float], None] = None, export_cache: str = None,
+                 memory_budget: int = None):
         self.data_file = data_file
+        self.compact = compact  # write JSON without indentation
         self.sessions: List[ThinkingSession] = []
         self.current_session: ThinkingSession = None
-        self.load_data()
+        self.analytics = WorkspaceAnalytics()
+        self.thought_index = ThoughtIdIndex()
+        self.time_index = TimeIndex()
+        self.category_index = AttributeIndex(lambda t: [t.category.lower()])
+        self.tag_index = AttributeIndex(lambda t: [tag.lower() for tag in t.tags])
+        self.completed_index = AttributeIndex(lambda t: [t.is_completed])
+        self.priority_index = AttributeIndex(lambda t: [t.priority])
+        # Display order: priority high to low, then oldest first
+        self.display_order = OrderedIndex(lambda t: (-t.priority, t.created_at))
+        self.due_index = DueIndex()
+        self.reminders = ReminderScheduler()
+        self.hierarchy = HierarchyIndex()
+        self.link_index = LinkIndex()
+        self.session_order: List[tuple] = []  # sorted (created_at, session_id)
+        self.session_map: Dict[str, ThinkingSession] = {}
+        self.session_prefixes = PrefixIndex()
+        self.deleted_sessions: Dict[str, str] = {}  # session id -> deleted_at tombstones
+        # Dirty tracking: changed thought IDs per touched session, plus whether the
+        # session list itself changed. Unchanged sessions are saved from _encoded.
+        self.dirty: Dict[str, set] = {}
+        self.structure_dirty = False
+        self._encoded: Dict[str, str] = {}
+        self._encoded_indent = None
+        self._saved_file = None
+        self.metadata: Dict[str, Any] = {"created_by": "Python Thinker App"}
+        self.loaded_version = SCHEMA_VERSION  # schema version of the file as it is on disk
+        self.load_error = None  # set when the data file exists but could not be read
+        self.loaded_stamp = None  # file_stamp of the data file as loaded, and as last saved
+        self.saved_stamp = None
+        self.saved_hashes: Dict[str, str] = {}  # record_hash per session of the file as last saved
+        self._archive = None  # cold store, loaded on first use
+        # Bumped on every mutation of a session; rendered exports are cached per version.
+        # saved_versions are the versions the data file on disk holds.
+        self.session_versions: Dict[str, int] = {}
+        self.saved_versions: Dict[str, int] = {}
+        # Sync's Merkle subtree per session: session id -> (session, version, node)
+        self.merkle_nodes: Dict[str, tuple] = {}
+        self.render_cache = RenderCache(directory=export_cache)
+        self.planner = QueryPlanner(self)
+        # Thought lists of sessions not used lately are spilled to disk past memory_budget bytes
+        self.session_cache = SessionCache(self, memory_budget, Thought)
+        self.load_data(progress)
+    
+    def _indexes(self):
+        """Indexes that must be kept in step with every thought mutation"""
+        return [self.analytics, self.thought_index, self.time_index, self.category_index,
+                self.tag_index, self.completed_index, self.priority_index, self.display_order,
+                self.due_index, self.reminders, self.hierarchy, self.link_index]
+    
+    def _index_thought(self, session: ThinkingSession, thought: Thought):
+        """Register a thought with every index"""
+        for index in self._indexes():
+            index.add(session, thought)
+        self.session_cache.resize(session, thought_size(thought))
+        self.mark_dirty(session, thought.id)
+    
+    def _index_thoughts(self, session: ThinkingSession, thoughts: List[Thought]):
+        """Register a batch of new thoughts of one session with every index at once"""
+        for index in self._indexes():
+            index.add_many(session, thoughts)
+        self.session_cache.resize(session, estimate_size(thoughts))
+        self.mark_dirty(session)
+        self.dirty[session.id].update(thought.id for thought in thoughts)
+    
+    def _unindex_thought(self, session: ThinkingSession, thought: Thought):
+        """Remove a thought from every index"""
+        self.session_cache.adopt(session, thought)
+        for index in self._indexes():
+            index.remove(session, thought)
+        self.session_cache.resize(session, -thought_size(thought))
+        self.mark_dirty(session, thought.id)
+    
+    def mark_dirty(self, session: ThinkingSession, thought_id: str = None):
+        """Record that a session (and optionally one of its thoughts) needs saving"""
+        changed = self.dirty.setdefault(session.id, set())
+        if thought_id:
+            changed.add(thought_id)
+        self.session_versions[session.id] = self.session_versions.get(session.id, 0) + 1
     
-    def load_data(self):
-        """Load existing thinking sessions from file"""
+    def session_version(self, session: ThinkingSession) -> int:
+        """Return a session's version, which changes whenever the session does"""
+        return self.session_versions.get(session.id, 0)
+    
+    def is_dirty(self) -> bool:
+        """Whether anything changed since the last load or save"""
+        return bool(self.dirty) or self.structure_dirty
+    
+    def rebuild_indexes(self):
+        """Rebuild every index from scratch (done once after loading)"""
+        for index in self._indexes():
+            index.rebuild(self.sessions)
+        self.session_order = sorted((s.created_at, s.id) for s in self.sessions)
+        self.session_map = {s.id: s for s in self.sessions}
+        self.session_prefixes = PrefixIndex(self.session_map)
+    
+    def find_thought(self, thought_id: str):
+        """Return (session, thought) for a thought ID anywhere in the workspace, or None"""
+        return self.thought_index.get(thought_id)
+    
+    def _resolve_prefix(self, prefix: str, known: Dict[str, Any], prefixes: PrefixIndex, kind: str):
+        """Expand a unique ID prefix to the full ID, printing an error if there is none"""
+        if prefix in known:
+            return prefix
+        matches = prefixes.matches(prefix, limit=5) if prefix else []
+        if len(matches) == 1:
+            return matches[0]
+        if not matches:
+            print(f"❌ {kind} with ID '{prefix}' not found")
+        else:
+            more = ", ..." if len(matches) == 5 else ""
+            print(f"❌ '{prefix}' matches several {kind.lower()}s ({', '.join(matches)}{more}); type more of the ID")
+        return None
+    
+    def load_data(self, progress: Callable[[float], None] = None):
+        """Load existing thinking sessions from file, upgrading older schema versions
+        
+        progress, if given, is called with the fraction of the file read so far.
+        """
+        self.load_error = None
+        self._archive = None
+        self.loaded_version = SCHEMA_VERSION
+        self.loaded_stamp = None
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.data_file, 'rb') as raw, open_data_file(self.data_file, fileobj=raw) as f:
+                    stat = os.fstat(raw.fileno())
+                    size = stat.st_size or 1
+                    document = DataDocument(f)
                     self.sessions = []
-                    for session_data in data:
-                        thoughts = [Thought(**thought) for thought in session_data['thoughts']]
-                        session = ThinkingSession(
-                            id=session_data['id'],
-                            title=session_data['title'],
-                            description=session_data['description'],
-                            thoughts=thoughts,
-                            created_at=session_data['created_at'],
-                            updated_at=session_data['updated_at']
-                        )
-                        self.sessions.append(session)
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"Error loading data: {e}")
+                    for record in document.sessions():
+                        self.sessions.append(session_from_dict(record))
+                        if progress:
+                            progress(raw.tell() / size)
+                self.metadata = document.metadata
+                self.loaded_version = document.version
+                self.loaded_stamp = file_stamp(self.data_file, stat)
+                if document.version < SCHEMA_VERSION:
+                    print(f"🔄 Upgraded data from schema version {document.version} to {SCHEMA_VERSION} "
+                          f"(written on the next save)")
+            except (json.JSONDecodeError, KeyError, TypeError, SchemaError) + STREAM_ERRORS as e:
+                print(f"❌ Error loading data: {e}")
+                print(f"   {self.data_file} will not be overwritten until it is fixed or another file is loaded")
+                self.load_error = str(e)
                 self.sessions = []
+        self.deleted_sessions = load_tombstones(self.data_file)
+        self.rebuild_indexes()
+        self.dirty, self.structure_dirty = {}, self.loaded_version < SCHEMA_VERSION
+        self._encoded = {}
+        self._saved_file = self.data_file
+        self._load_versions()
+        self.session_cache.reset(self.sessions)
     
-    def save_data(self):
-        """Save thinking sessions to file"""
+    def _load_versions(self):
+        """Restore session versions for the on-disk export cache, if it matches the data file"""
+        self.session_versions, self.saved_versions = {}, {}
+        self.render_cache.clear()
+        if not self.render_cache.directory or self.load_error or not os.path.exists(self.data_file):
+            return
+        stamp = file_stamp(self.data_file)
+        saved = self.render_cache.load_versions(stamp)
+        if saved is None:
+            saved = {session.id: 0 for session in self.sessions}
+            self.render_cache.save_versions(stamp, saved)
+        self.session_versions, self.saved_versions = dict(saved), saved
+    
+    def save_data(self) -> bool:
+        """Save thinking sessions to file, skipping the write when nothing changed
+        
+        A loaded archive is saved afterwards, and only if the workspace was saved.
+        Returns whether the data on disk is now current.
+        """
+        ready = self.check_save()
+        if ready is not None:
+            return ready
+        snapshot = self.snapshot_for_save()
         try:
-            data = []
-            for session in self.sessions:
-                session_dict = asdict(session)
-                data.append(session_dict)
-            
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print("✅ Data saved successfully!")
+            encoded = snapshot.write()
         except Exception as e:
+            self.abort_save(snapshot)
             print(f"❌ Error saving data: {e}")
+            return False
+        return self.finish_save(snapshot, encoded)
+    
+    def check_save(self) -> Optional[bool]:
+        """Return None if a write is needed, otherwise what save_data should report"""
+        same_file = self._saved_file == self.data_file and os.path.exists(self.data_file)
+        if same_file and self.load_error:
+            print(f"❌ Not saving: {self.data_file} could not be read ({self.load_error})")
+            return False
+        if same_file and not self.is_dirty():
+            print("✅ No changes to save")
+            return self._save_archive()
+        return None
+    
+    def snapshot_for_save(self) -> "SaveSnapshot":
+        """Detach what the next save writes so it can be serialized while the model changes
+        
+        Unchanged sessions contribute their cached encoding; touched ones a copy.
+        Changes made after this call stay dirty for the following save.
+        """
+        indent = self.save_indent()
+        if indent != self._encoded_indent:
+            self._encoded, self._encoded_indent = {}, indent
+        
+        records = []
+        for session in self.sessions:
+            text = self._encoded.get(session.id)
+            spilled = self.session_cache.spilled_record(session)
+            if spilled:
+                records.append((session.id, spilled))
+            else:
+                records.append((session.id, detached_session(session)
+                                if text is None or session.id in self.dirty else text))
+        
+        backup = None
+        if self._saved_file == self.data_file and self.loaded_version < SCHEMA_VERSION:
+            backup = f"{self.data_file}.v{self.loaded_version}.bak"
+        versions = {session.id: self.session_version(session) for session in self.sessions}
+        snapshot = SaveSnapshot(self.data_file, indent, records, dict(self.metadata),
+                                dict(self.deleted_sessions), backup, self.dirty, self.structure_dirty, versions)
+        self.dirty, self.structure_dirty = {}, False
+        return snapshot
+    
+    def save_indent(self) -> Optional[int]:
+        """JSON indentation the data file is written with"""
+        return None if self.compact else 2
+    
+    def cached_encoding(self, session: ThinkingSession, indent: Optional[int]) -> Optional[str]:
+        """Return a clean session's encoding from the last save, if made with indent"""
+        if session.id in self.dirty or indent != self._encoded_indent:
+            return None
+        return self._encoded.get(session.id)
+    
+    def drop_cached_encoding(self, session: ThinkingSession):
+        """Forget a session's cached encoding (its spill file holds it while evicted)"""
+        self._encoded.pop(session.id, None)
+    
+    def finish_save(self, snapshot: "SaveSnapshot", encoded: Dict[str, str]) -> bool:
+        """Record a completed snapshot write, then save the archive if needed"""
+        self._encoded.update(encoded)
+        self._saved_file = snapshot.data_file
+        self.loaded_version = SCHEMA_VERSION
+        if snapshot.data_file == self.data_file:
+            self.saved_stamp = file_stamp(self.data_file)
+            self.saved_hashes = snapshot.hashes
+            if self.render_cache.directory:
+                self.render_cache.save_versions(self.saved_stamp, snapshot.versions)
+                self.saved_versions = snapshot.versions
+        changed = sum(len(ids) for ids in snapshot.dirty.values())
+        print(f"✅ Data saved successfully! ({changed} changed thoughts)")
+        return self._save_archive()
+    
+    def abort_save(self, snapshot: "SaveSnapshot"):
+        """Mark everything a failed or cancelled snapshot held as dirty again"""
+        for session_id, thought_ids in snapshot.dirty.items():
+            self.dirty.setdefault(session_id, set()).update(thought_ids)
+        self.structure_dirty = self.structure_dirty or snapshot.structure_dirty
+    
+    def _save_archive(self) -> bool:
+        """Save the archive if it has been loaded and changed"""
+        if self._archive is None or not self._archive.is_dirty():
+            return True
+        return self._archive.save_data()
     
     def create_session(self, title: str, description: str = ""):
         """Create a new thinking session"""
-        session_id = str(uuid.uuid4())[:8]
+        session_id = new_id(self.session_map)
         timestamp = datetime.datetime.now().isoformat()
         
         session = ThinkingSession(
@@ -92,50 +452,90 @@ class ThinkerApp:
         )
         
         self.sessions.append(session)
+        bisect.insort(self.session_order, (session.created_at, session.id))
+        self.session_map[session.id] = session
+        self.session_prefixes.add(session.id)
+        self.session_cache.admit(session)
+        self.structure_dirty = True
+        self.mark_dirty(session)
         self.current_session = session
         print(f"🧠 Created new thinking session: '{title}' (ID: {session_id})")
         return session
     
-    def list_sessions(self):
-        """List all thinking sessions"""
+    def list_sessions(self, limit: int = None, after: str = None, compact: bool = False,
+                      include_archive: bool = False):
+        """List thinking sessions, optionally one page at a time"""
+        if include_archive:
+            self.list_archived_sessions()
         if not self.sessions:
-            print("📝 No thinking sessions found. Create one to get started!")
+            if not include_archive:
+                print("📝 No thinking sessions found. Create one to get started!")
             return
         
-        print("\n📚 Your Thinking Sessions:")
-        print("-" * 50)
-        for i, session in enumerate(self.sessions, 1):
-            status = "🟢 Active" if session == self.current_session else "⚪ Inactive"
-            thought_count = len(session.thoughts)
-            completed_thoughts = len([t for t in session.thoughts if t.is_completed])
+        if limit is None and after is None:
+            sessions, next_cursor, start = self.sessions, None, 0
+        else:
+            sessions, next_cursor, start = self.session_page(after, limit or 50)
+        
+        lines = ["\n📚 Your Thinking Sessions:", "-" * 50]
+        for i, session in enumerate(sessions, start + 1):
+            active = session == self.current_session
+            thought_count, completed_thoughts = self.analytics.session_counts(session.id)
+            
+            if compact:
+                marker = "🟢" if active else "⚪"
+                lines.append(f"{i}. {marker} {session.title[:40]} ({session.id}) - "
+                             f"{thought_count} thoughts ({completed_thoughts} done)")
+                continue
             
-            print(f"{i}. {session.title} ({session.id})")
-            print(f"   {status} | {thought_count} thoughts ({completed_thoughts} completed)")
-            print(f"   Created: {session.created_at[:19]}")
+            status = "🟢 Active" if active else "⚪ Inactive"
+            lines.append(f"{i}. {session.title} ({session.id})")
+            lines.append(f"   {status} | {thought_count} thoughts ({completed_thoughts} completed)")
+            lines.append(f"   Created: {session.created_at[:19]}")
             if session.description:
-                print(f"   Description: {session.description}")
-            print()
+                lines.append(f"   Description: {session.description}")
+            lines.append("")
+        if next_cursor:
+            lines.append(f"➡️ More: sessions --limit {limit or 50} --after {next_cursor}")
+        print("\n".join(lines))
+    
+    def session_page(self, after: str = None, limit: int = 50):
+        """Return (sessions, next_cursor, start_position) for one page in creation order"""
+        start = bisect.bisect_right(self.session_order, _parse_cursor(after)) if after else 0
+        keys = self.session_order[start:start + limit]
+        sessions = [self.session_map[session_id] for _, session_id in keys]
+        has_more = start + limit < len(self.session_order)
+        next_cursor = _format_cursor(keys[-1]) if keys and has_more else None
+        return sessions, next_cursor, start
     
     def select_session(self, session_id: str):
-        """Select a session to work with"""
-        for session in self.sessions:
-            if session.id == session_id:
-                self.current_session = session
-                print(f"🎯 Selected session: '{session.title}'")
-                return session
-        print(f"❌ Session with ID '{session_id}' not found")
-        return None
+        """Select a session to work with by its ID or a unique prefix of it"""
+        session_id = self._resolve_prefix(session_id, self.session_map, self.session_prefixes, "Session")
+        if session_id is None:
+            return None
+        session = self.session_map[session_id]
+        self.current_session = session
+        self.session_cache.touch(session)
+        print(f"🎯 Selected session: '{session.title}'")
+        return session
     
-    def add_thought(self, content: str, category: str = "general", priority: int = 3, tags: List[str] = None):
-        """Add a new thought to the current session"""
-        if not self.current_session:
+    def add_thought(self, content: str, category: str = "general", priority: int = 3, tags: List[str] = None,
+                    parent_id: str = None):
+        """Add a new thought to the current session, or as a sub-thought in its parent's session"""
+        session = self.current_session
+        if parent_id is not None:
+            parent = self._resolve_thought(parent_id)
+            if not parent:
+                return
+            session, parent_id = parent[0], parent[1].id
+        elif not session:
             print("❌ No active session. Create or select a session first.")
             return
         
         if tags is None:
             tags = []
         
-        thought_id = str(uuid.uuid4())[:8]
+        thought_id = new_id(self.thought_index.entries)
         timestamp = datetime.datetime.now().isoformat()
         
         thought = Thought(
@@ -145,12 +545,37 @@ class ThinkerApp:
             priority=priority,
             tags=tags,
             created_at=timestamp,
-            updated_at=timestamp
+            updated_at=timestamp,
+            parent_id=parent_id
         )
         
-        self.current_session.thoughts.append(thought)
-        self.current_session.updated_at = timestamp
+        session.thoughts.append(thought)
+        session.updated_at = timestamp
+        self._index_thought(session, thought)
         print(f"💡 Added thought: '{content[:50]}...' (ID: {thought_id})")
+        return thought
+    
+    def add_thoughts(self, captures: List[Capture]) -> List[Thought]:
+        """Add a batch of captured thoughts to the current session, all with one timestamp"""
+        session = self.current_session
+        if not session:
+            print("❌ No active session. Create or select a session first.")
+            return []
+        
+        timestamp = datetime.datetime.now().isoformat()
+        # IDs from one process only increase, so the batch cannot collide with itself
+        thoughts = [Thought(id=new_id(self.thought_index.entries), content=capture.content,
+                            category=capture.category, priority=capture.priority, tags=list(capture.tags),
+                            created_at=timestamp, updated_at=timestamp)
+                    for capture in captures]
+        session.thoughts.extend(thoughts)
+        session.updated_at = timestamp
+        self._index_thoughts(session, thoughts)
+        if len(thoughts) == 1:
+            print(f"💡 Added thought: '{thoughts[0].content[:50]}...' (ID: {thoughts[0].id})")
+        elif thoughts:
+            print(f"💡 Added {len(thoughts)} thoughts to '{session.title}'")
+        return thoughts
     
     def list_thoughts(self, category: str = None, completed: bool = None):
         """List thoughts in the current session"""
@@ -179,46 +604,846 @@ class ThinkerApp:
         thoughts.sort(key=lambda x: x.priority, reverse=True)
         
         for thought in thoughts:
-            status = "✅" if thought.is_completed else "⭕"
-            priority_stars = "⭐" * thought.priority
-            
-            print(f"{status} {thought.content}")
-            print(f"   ID: {thought.id} | Category: {thought.category} | Priority: {priority_stars}")
-            if thought.tags:
-                print(f"   Tags: {', '.join(thought.tags)}")
-            print(f"   Created: {thought.created_at[:19]}")
-            print()
+            self._print_thought(thought)
     
-    def complete_thought(self, thought_id: str):
-        """Mark a thought as completed"""
-        if not self.current_session:
+    def _print_thought(self, thought: Thought):
+        """Print a single thought in the standard multi-line layout"""
+        print(self._format_thought(thought))
+    
+    def _format_thought(self, thought: Thought, compact: bool = False) -> str:
+        """Format a thought as the standard block or a single compact line"""
+        status = "✅" if thought.is_completed else "⭕"
+        priority_stars = "⭐" * thought.priority
+        
+        if compact:
+            content = thought.content[:60] + "..." if len(thought.content) > 60 else thought.content
+            return f"{status} {thought.priority} [{thought.category}] {content} ({thought.id})"
+        
+        lines = [
+            f"{status} {thought.content}",
+            f"   ID: {thought.id} | Category: {thought.category} | Priority: {priority_stars}",
+        ]
+        if thought.tags:
+            lines.append(f"   Tags: {', '.join(thought.tags)}")
+        done, total = self.hierarchy.progress(thought)
+        if thought.parent_id or total:
+            nesting = [f"Parent: {thought.parent_id}"] if thought.parent_id else []
+            nesting += [f"Sub-thoughts: {done}/{total} done"] if total else []
+            lines.append(f"   {' | '.join(nesting)}")
+        if thought.links or thought.id in self.link_index.incoming:
+            lines.append(f"   Links: {len(self.link_index.neighbors(thought.id))} (see 'links {thought.id}')")
+        if thought.due_at or thought.remind_at:
+            schedule = [f"Due: {thought.due_at[:16]}"] if thought.due_at else []
+            schedule += [f"Reminder: {thought.remind_at[:16]}"] if thought.remind_at else []
+            lines.append(f"   {' | '.join(schedule)}")
+        lines.append(f"   Created: {thought.created_at[:19]}")
+        lines.append("")
+        return "\n".join(lines)
+    
+    def thought_page(self, after: str = None, limit: int = 50, session_id: str = None):
+        """Return (thoughts, next_cursor) for one page in display order
+        
+        Pages are sliced straight from the display-order index, so fetching a page
+        costs O(log n + limit) however large the session is.
+        """
+        entries = self.display_order.page(_parse_cursor(after) if after else None, limit, session_id)
+        thoughts = [self.thought_index.get(thought_id)[1] for _, thought_id in entries]
+        next_cursor = None
+        if len(entries) == limit and self.display_order.page(entries[-1], 1, session_id):
+            next_cursor = _format_cursor(entries[-1])
+        return thoughts, next_cursor
+    
+    def list_thoughts_page(self, after: str = None, limit: int = 50, compact: bool = False,
+                           workspace: bool = False):
+        """List one page of thoughts and print the cursor for the next one"""
+        if not workspace and not self.current_session:
+            print("❌ No active session selected")
+            return
+        
+        session_id = None if workspace else self.current_session.id
+        try:
+            thoughts, next_cursor = self.thought_page(after, limit, session_id)
+        except ValueError:
+            print(f"❌ Invalid cursor '{after}'")
+            return
+        if not thoughts:
+            print("🤔 No more thoughts")
+            return
+        
+        scope = "the workspace" if workspace else f"'{self.current_session.title}'"
+        lines = [f"\n💭 Thoughts in {scope}:", "-" * 60]
+        lines.extend(self._format_thought(thought, compact) for thought in thoughts)
+        if next_cursor:
+            flags = " --compact" if compact else ""
+            flags += " --all" if workspace else ""
+            lines.append(f"➡️ More: thoughts --limit {limit} --after {next_cursor}{flags}")
+        print("\n".join(lines))
+    
+    def browse_thoughts(self, page_size: int = 20, workspace: bool = False):
+        """Interactive pager that fetches one page at a time from the display-order index"""
+        if not workspace and not self.current_session:
             print("❌ No active session selected")
             return
         
-        for thought in self.current_session.thoughts:
-            if thought.id == thought_id:
-                thought.is_completed = True
-                thought.updated_at = datetime.datetime.now().isoformat()
-                self.current_session.updated_at = thought.updated_at
-                print(f"✅ Marked thought as completed: '{thought.content[:50]}...'")
+        session_id = None if workspace else self.current_session.id
+        total = self.display_order.count(session_id)
+        cursor, shown = None, 0
+        while True:
+            thoughts, cursor = self.thought_page(cursor, page_size, session_id)
+            if not thoughts:
+                print("🤔 No thoughts to show")
                 return
+            print("\n".join(self._format_thought(thought, compact=True) for thought in thoughts))
+            shown += len(thoughts)
+            if not cursor:
+                print(f"-- end ({shown} of {total}) --")
+                return
+            try:
+                answer = input(f"-- {shown} of {total} -- [Enter] next page, q to quit: ").strip().lower()
+            except (KeyboardInterrupt, EOFError):
+                print()
+                return
+            if answer == 'q':
+                return
+    
+    def thoughts_in_range(self, start: str = None, end: str = None, field: str = 'created',
+                          session_id: str = None) -> List[Thought]:
+        """Return thoughts whose created/updated time is in [start, end), oldest first"""
+        thought_ids = self.time_index.range(field, start, end, session_id)
+        return [self.thought_index.get(thought_id)[1] for thought_id in thought_ids]
+    
+    def list_thoughts_in_range(self, start: str = None, end: str = None, field: str = 'created',
+                               workspace: bool = False):
+        """List thoughts created or updated within a time range"""
+        if not workspace and not self.current_session:
+            print("❌ No active session selected")
+            return
+        
+        session_id = None if workspace else self.current_session.id
+        thoughts = self.thoughts_in_range(start, end, field, session_id)
+        if not thoughts:
+            print("🤔 No thoughts found in that time range")
+            return
         
-        print(f"❌ Thought with ID '{thought_id}' not found")
+        scope = "the workspace" if workspace else f"'{self.current_session.title}'"
+        verb = "created" if field == 'created' else "updated"
+        print(f"\n🕒 Thoughts {verb} in {scope} ({len(thoughts)}):")
+        print("-" * 60)
+        for thought in thoughts:
+            self._print_thought(thought)
+    
+    def query_thoughts(self, text: str, session_only: bool = False, include_archive: bool = False):
+        """Parse and plan a query, returning (plan, matching thoughts)
+        
+        Queries run against the current session unless they start with 'all'
+        or no session is selected. With include_archive the same query also runs
+        against the cold store and the results are merged in query order.
+        """
+        query = parse_query(text)
+        if session_only and self.current_session:
+            query.workspace = False
+        if not query.workspace and not self.current_session:
+            query.workspace = True
+        session_id = None if query.workspace else self.current_session.id
+        plan = self.planner.plan(query, session_id)
+        thoughts = self.planner.execute(plan)
+        if include_archive:
+            archive = self.archive
+            if session_id is None or archive.get_session(session_id):
+                cold = archive.planner.execute(archive.planner.plan(query, session_id))
+                thoughts = QueryPlanner.order(query, itertools.chain(thoughts, cold))
+        return plan, thoughts
+    
+    def run_query(self, text: str, explain: bool = False):
+        """Run a query from the CLI and print the results or the plan"""
+        include_archive = text.endswith(' --archive')
+        if include_archive:
+            text = text[:-len(' --archive')]
+        try:
+            plan, thoughts = self.query_thoughts(text, include_archive=include_archive)
+        except QueryError as e:
+            print(f"❌ Invalid query: {e}")
+            return
+        
+        if explain:
+            print(plan.explain())
+            print(f"  rows:    {len(thoughts)}")
+            return
+        
+        if not thoughts:
+            print("🤔 No thoughts found with the specified criteria")
+            return
+        
+        scope = "the workspace" if plan.session_id is None else f"'{self.current_session.title}'"
+        if include_archive:
+            scope += " and the archive"
+        print(f"\n🔎 {len(thoughts)} matching thoughts in {scope}:")
+        print("-" * 60)
+        for thought in thoughts:
+            self._print_thought(thought)
+    
+    def _resolve_thought(self, thought_id: str):
+        """Look a thought up anywhere in the workspace by its ID or a unique prefix of it"""
+        index = self.thought_index
+        thought_id = self._resolve_prefix(thought_id, index.entries, index.prefixes, "Thought")
+        return index.get(thought_id) if thought_id is not None else None
+    
+    def complete_thought(self, thought_id: str):
+        """Mark a thought as completed (in any session)"""
+        found = self._resolve_thought(thought_id)
+        if not found:
+            return
+        
+        session, thought = found
+        self._unindex_thought(session, thought)
+        thought.is_completed = True
+        thought.updated_at = datetime.datetime.now().isoformat()
+        session.updated_at = thought.updated_at
+        self._index_thought(session, thought)
+        print(f"✅ Marked thought as completed: '{thought.content[:50]}...'")
+        return thought
     
     def delete_thought(self, thought_id: str):
-        """Delete a thought from the current session"""
-        if not self.current_session:
+        """Delete a thought (from any session)"""
+        found = self._resolve_thought(thought_id)
+        if not found:
+            return
+        
+        session, thought = found
+        self._discard_thought(session, thought, datetime.datetime.now().isoformat())
+        session.thoughts.remove(thought)
+        print(f"🗑️ Deleted thought: '{thought.content[:50]}...'")
+        return thought
+    
+    def _discard_thought(self, session: ThinkingSession, thought: Thought, deleted_at: str):
+        """Unindex a deleted thought, leave its tombstone and let go of its links and sub-thoughts
+        
+        The caller removes the thought from session.thoughts.
+        """
+        self._unindex_thought(session, thought)
+        session.updated_at = deleted_at
+        session.deleted_thoughts[thought.id] = deleted_at
+        # Links from other thoughts to the deleted one go with it
+        for source_id, kind in list(self.link_index.incoming.get(thought.id, ())):
+            found = self.thought_index.get(source_id)
+            if found:
+                self._set_links(*found, [link for link in found[1].links if link[0] != thought.id])
+        # Sub-thoughts move up to the deleted thought's parent rather than being orphaned
+        for child_id in list(self.hierarchy.child_ids(thought.id)):
+            child_session, child = self.thought_index.get(child_id)
+            self._unindex_thought(child_session, child)
+            child.parent_id = thought.parent_id
+            child.updated_at = deleted_at
+            self._index_thought(child_session, child)
+    
+    def bulk_update(self, query: str, action: str, value: Any = None, dry_run: bool = False,
+                    save: bool = True) -> Optional[int]:
+        """Apply one action to every thought a query matches (see bulk_apply)"""
+        try:
+            _, thoughts = self.query_thoughts(query)
+        except QueryError as e:
+            print(f"❌ Invalid query: {e}")
+            return None
+        return self.bulk_apply([thought.id for thought in thoughts], action, value, dry_run, save)
+    
+    @holding_sessions
+    def bulk_apply(self, thought_ids: List[str], action: str, value: Any = None, dry_run: bool = False,
+                   save: bool = True) -> Optional[int]:
+        """Apply one action to many thoughts in a single pass, then save once
+        
+        action is 'complete', 'priority' (value 1-5), 'category' (value a name),
+        'tag' (value (tags to add, tags to remove)), 'move' (value a session ID or
+        prefix) or 'delete'. Thoughts the action would not change are skipped.
+        Returns how many thoughts changed (or would, with dry_run).
+        """
+        target = None
+        if action == 'move':
+            target_id = self._resolve_prefix(value, self.session_map, self.session_prefixes, "Session")
+            if target_id is None:
+                return None
+            target = self.session_map[target_id]
+            self.session_cache.touch(target)  # resident before anything moves, and held until done
+        
+        # Looked up here rather than passed in: a search may have read a session since evicted
+        matches = [self.thought_index.get(thought_id) for thought_id in thought_ids]
+        matches = [(session, thought) for session, thought in filter(None, matches)
+                   if _bulk_changes(session, thought, action, value, target)]
+        if not matches:
+            print("🤔 No thoughts would change")
+            return 0
+        sessions = len({session.id for session, _ in matches})
+        described = f"{_describe_bulk(action, value, target, len(matches))} in {sessions} session(s)"
+        if dry_run:
+            print(f"🔎 Would {described} (dry run, nothing changed)")
+            return len(matches)
+        
+        timestamp = datetime.datetime.now().isoformat()
+        if action == 'delete':
+            deleted = set()
+            for session, thought in matches:
+                self._discard_thought(session, thought, timestamp)
+                deleted.add(thought.id)
+            for session in {session.id: session for session, _ in matches}.values():
+                session.thoughts = [thought for thought in session.thoughts if thought.id not in deleted]
+        elif action == 'move':
+            self._move_thoughts(matches, target, timestamp)
+        else:
+            for session, thought in matches:
+                self._unindex_thought(session, thought)
+                if action == 'complete':
+                    thought.is_completed = True
+                elif action == 'priority':
+                    thought.priority = value
+                elif action == 'category':
+                    thought.category = value
+                else:
+                    thought.tags = _retag(thought.tags, *value)
+                thought.updated_at = timestamp
+                session.updated_at = timestamp
+                self._index_thought(session, thought)
+        print(f"✅ Bulk update: {described}")
+        if save:
+            self.save_data()
+        return len(matches)
+    
+    def _move_thoughts(self, matches: List[tuple], target: ThinkingSession, timestamp: str):
+        """Move (session, thought) pairs to target, leaving tombstones where they were
+        
+        Moved thoughts keep their parent only if it moves too; sub-thoughts left
+        behind move up to their nearest ancestor that stays. Each moved thought's
+        updated_at and its tombstone in the old session are both the move time,
+        so sync sees a delete there and a newer insert in the target.
+        """
+        # Everything is looked up (and faulted in) before the first change, so nothing fails halfway
+        target_thoughts = self.session_cache.load(target)
+        moving = {thought.id for _, thought in matches}
+        left_behind = []
+        for _, thought in matches:
+            for child_id in self.hierarchy.child_ids(thought.id):
+                if child_id not in moving:
+                    staying = [a for a in self.hierarchy.ancestors(child_id) if a not in moving]
+                    session, child = self.thought_index.get(child_id)
+                    left_behind.append((session, child, staying[0] if staying else None))
+        
+        for session, thought in matches:
+            self._unindex_thought(session, thought)
+            session.deleted_thoughts[thought.id] = timestamp
+            session.updated_at = timestamp
+            target.deleted_thoughts.pop(thought.id, None)
+            if thought.parent_id not in moving:
+                thought.parent_id = None
+            thought.updated_at = timestamp
+        for session in {session.id: session for session, _ in matches}.values():
+            session.thoughts = [thought for thought in session.thoughts if thought.id not in moving]
+        target_thoughts.extend(thought for _, thought in matches)
+        target.updated_at = timestamp
+        for _, thought in matches:
+            self._index_thought(target, thought)
+        
+        for session, child, parent_id in left_behind:
+            self._unindex_thought(session, child)
+            child.parent_id = parent_id
+            child.updated_at = timestamp
+            self._index_thought(session, child)
+    
+    def nest_thought(self, thought_id: str, parent_id: Optional[str]):
+        """Make a thought a sub-thought of another in the same session (parent None makes it top-level)"""
+        found = self._resolve_thought(thought_id)
+        if not found:
+            return
+        session, thought = found
+        parent = None
+        if parent_id is not None:
+            resolved = self._resolve_thought(parent_id)
+            if not resolved:
+                return
+            if resolved[0] is not session:
+                print("❌ A sub-thought must be in the same session as its parent")
+                return
+            parent = resolved[1]
+            if parent is thought or thought.id in self.hierarchy.ancestors(parent.id):
+                print("❌ A thought can't be nested under itself or one of its own sub-thoughts")
+                return
+        
+        self._unindex_thought(session, thought)
+        thought.parent_id = parent.id if parent else None
+        thought.updated_at = datetime.datetime.now().isoformat()
+        session.updated_at = thought.updated_at
+        self._index_thought(session, thought)
+        if parent:
+            print(f"🌿 '{thought.content[:40]}' is now under '{parent.content[:40]}'")
+        else:
+            print(f"🌿 '{thought.content[:40]}' is now a top-level thought")
+        return thought
+    
+    def _set_links(self, session: ThinkingSession, thought: Thought, links: List[List[str]]):
+        """Replace a thought's links (a new list, so saves in progress keep the old one)"""
+        self._unindex_thought(session, thought)
+        thought.links = links
+        thought.updated_at = datetime.datetime.now().isoformat()
+        session.updated_at = thought.updated_at
+        self._index_thought(session, thought)
+    
+    def link_thoughts(self, source_id: str, target_id: str, kind: str = "related"):
+        """Link one thought to another (in any session) with a type such as supports or depends-on"""
+        source = self._resolve_thought(source_id)
+        target = source and self._resolve_thought(target_id)
+        if not target:
+            return
+        session, thought = source
+        other = target[1]
+        if other is thought:
+            print("❌ A thought can't be linked to itself")
+            return
+        if [other.id, kind] in thought.links:
+            print(f"🔗 Already linked ({kind})")
+            return thought
+        self._set_links(session, thought, thought.links + [[other.id, kind]])
+        print(f"🔗 '{thought.content[:30]}' --{kind}--> '{other.content[:30]}'")
+        return thought
+    
+    def unlink_thoughts(self, source_id: str, target_id: str):
+        """Remove every link between two thoughts, in either direction"""
+        first = self._resolve_thought(source_id)
+        second = first and self._resolve_thought(target_id)
+        if not second:
+            return
+        removed = 0
+        for (session, thought), other in ((first, second[1]), (second, first[1])):
+            kept = [link for link in thought.links if link[0] != other.id]
+            if len(kept) != len(thought.links):
+                removed += len(thought.links) - len(kept)
+                self._set_links(session, thought, kept)
+        print(f"✂️ Removed {removed} link(s)" if removed else "🤔 Those thoughts are not linked")
+        return removed
+    
+    def show_links(self, thought_id: str):
+        """List a thought's linked thoughts by type and direction, and the size of its group"""
+        found = self._resolve_thought(thought_id)
+        if not found:
+            return
+        thought = found[1]
+        neighbors = self.link_index.neighbors(thought.id)
+        if not neighbors:
+            print(f"🔗 '{thought.content[:50]}' has no links. Use 'link <from_id> <to_id> [type]'.")
+            return
+        lines = [f"\n🔗 Links of '{thought.content[:50]}' ({thought.id}):"]
+        for other_id, kind, direction in neighbors:
+            other = self.thought_index.get(other_id)
+            arrow = f"--{kind}-->" if direction == 'out' else f"<--{kind}--"
+            if other:
+                lines.append(f"   {arrow} {self._format_thought(other[1], compact=True)} - {other[0].title[:30]}")
+            else:
+                lines.append(f"   {arrow} (missing thought {other_id})")
+        lines.append(f"   Connected group: {len(self.link_index.component(thought.id))} thoughts")
+        print("\n".join(lines))
+    
+    def show_path(self, start_id: str, goal_id: str):
+        """Print the shortest chain of links between two thoughts"""
+        start = self._resolve_thought(start_id)
+        goal = start and self._resolve_thought(goal_id)
+        if not goal:
+            return
+        path = self.link_index.shortest_path(start[1].id, goal[1].id)
+        if path is None:
+            print("🤔 No chain of links connects those thoughts")
+            return
+        lines = [f"\n🧭 {len(path) - 1} link(s):"]
+        for step, (thought_id, kind) in enumerate(path):
+            session, thought = self.thought_index.get(thought_id)
+            prefix = f"   --{kind}--> " if step else "   "
+            lines.append(f"{prefix}{thought.content[:50]} ({thought.id}) - {session.title[:30]}")
+        print("\n".join(lines))
+        return path
+    
+    def export_graph(self, thought_id: str = None, filename: str = None):
+        """Write a DOT graph of the current session as a mind map, or of one thought's linked group"""
+        if thought_id:
+            found = self._resolve_thought(thought_id)
+            if not found:
+                return
+            text, name = component_graph(self, found[1].id), f"thought_links_{found[1].id}"
+        elif self.current_session:
+            text, name = session_mind_map(self, self.current_session), f"thinking_session_{self.current_session.id}"
+        else:
+            print("❌ No session to export")
+            return
+        filename = filename or f"{name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.dot"
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(text)
+        except OSError as e:
+            print(f"❌ Error exporting graph: {e}")
+            return
+        print(f"🕸️ Graph exported to: {filename} (render with: dot -Tsvg {filename} -o map.svg)")
+        return filename
+    
+    def sub_thoughts(self, thought: Thought) -> List[Thought]:
+        """A thought's direct sub-thoughts in display order"""
+        children = [self.thought_index.get(child_id)[1] for child_id in self.hierarchy.child_ids(thought.id)]
+        children.sort(key=self.display_order.key)
+        return children
+    
+    def show_tree(self, thought_id: str = None):
+        """Print the current session as an outline, or the subtree under one thought"""
+        if thought_id:
+            found = self._resolve_thought(thought_id)
+            if not found:
+                return
+            session, roots = found[0], [found[1]]
+        elif self.current_session:
+            session = self.current_session
+            ids = {thought.id for thought in session.thoughts}
+            roots = [thought for thought in session.thoughts if thought.parent_id not in ids]
+            roots.sort(key=self.display_order.key)
+        else:
             print("❌ No active session selected")
             return
         
-        for i, thought in enumerate(self.current_session.thoughts):
-            if thought.id == thought_id:
-                deleted_thought = self.current_session.thoughts.pop(i)
-                self.current_session.updated_at = datetime.datetime.now().isoformat()
-                print(f"🗑️ Deleted thought: '{deleted_thought.content[:50]}...'")
+        lines = [f"\n🌳 {session.title}:"]
+        stack = [(0, thought) for thought in reversed(roots)]
+        while stack:
+            depth, thought = stack.pop()
+            done, total = self.hierarchy.progress(thought)
+            summary = f" [{done}/{total} done]" if total else ""
+            status = "✅" if thought.is_completed else "⭕"
+            lines.append(f"{'   ' * depth}{status} {thought.content[:60]}{summary} ({thought.id})")
+            stack.extend((depth + 1, child) for child in reversed(self.sub_thoughts(thought)))
+        print("\n".join(lines))
+    
+    def edit_thought(self, thought_id: str, content: str = None, category: str = None,
+                     priority: int = None, tags: List[str] = None, due_at: str = None, remind_at: str = None):
+        """Edit fields of a thought (in any session); an empty due_at or remind_at clears it"""
+        found = self._resolve_thought(thought_id)
+        if not found:
+            return
+        
+        session, thought = found
+        self._unindex_thought(session, thought)
+        if content is not None:
+            thought.content = content
+        if category is not None:
+            thought.category = category
+        if priority is not None:
+            thought.priority = priority
+        if tags is not None:
+            thought.tags = tags
+        if due_at is not None:
+            thought.due_at = due_at or None
+        if remind_at is not None:
+            thought.remind_at = remind_at or None
+        thought.updated_at = datetime.datetime.now().isoformat()
+        session.updated_at = thought.updated_at
+        self._index_thought(session, thought)
+        print(f"✏️ Edited thought: '{thought.content[:50]}...'")
+        return thought
+    
+    def schedule_thought(self, thought_id: str, when: str, reminder: bool = False):
+        """Set (or with 'none', clear) a thought's due date or reminder from a 'friday' / '+2h' style time"""
+        kind = "Reminder" if reminder else "Due date"
+        if when in ('none', 'clear'):
+            value = ''
+        else:
+            try:
+                value = parse_when(when, default_time="09:00" if reminder else None)
+            except ValueError:
+                print(f"❌ Can't understand '{when}'; use today, tomorrow, a weekday, +2h, +3d, YYYY-MM-DD or an ISO time")
                 return
+        found = self._resolve_thought(thought_id)
+        if not found:
+            return
+        
+        session, thought = found
+        self._unindex_thought(session, thought)
+        if reminder:
+            thought.remind_at = value or None
+        else:
+            thought.due_at = value or None
+        thought.updated_at = datetime.datetime.now().isoformat()
+        session.updated_at = thought.updated_at
+        self._index_thought(session, thought)
+        if value:
+            print(f"📅 {kind} for '{thought.content[:50]}' set to {value}")
+        else:
+            print(f"📅 {kind} cleared for '{thought.content[:50]}'")
+        return thought
+    
+    def due_thoughts(self, limit: int = None):
+        """Return [(session, thought)] for open thoughts with a due date, soonest first"""
+        return [self.thought_index.get(thought_id) for _, thought_id in self.due_index.before(limit=limit)]
+    
+    def list_due(self, limit: int = 50):
+        """List open thoughts by due date: overdue, today, then upcoming"""
+        due = self.due_thoughts(limit)
+        if not due:
+            print("📅 Nothing is due. Use 'due <thought_id> <when>' to set a due date.")
+            return
+        
+        now = datetime.datetime.now()
+        today, moment = now.date().isoformat(), now.isoformat()
+        groups = {"⏰ Overdue": [], "📌 Due today": [], "📅 Upcoming": []}
+        for session, thought in due:
+            # A bare date is overdue only once the day is over
+            if thought.due_at < (today if len(thought.due_at) == 10 else moment):
+                group = "⏰ Overdue"
+            elif thought.due_at[:10] == today:
+                group = "📌 Due today"
+            else:
+                group = "📅 Upcoming"
+            groups[group].append(f"   {thought.due_at[:16]}  {self._format_thought(thought, compact=True)} "
+                                 f"- {session.title[:30]}")
+        lines = []
+        for heading, entries in groups.items():
+            if entries:
+                lines += [f"\n{heading} ({len(entries)}):", *entries]
+        if len(self.due_index) > len(due):
+            lines.append(f"\n... and {len(self.due_index) - len(due)} more")
+        if self.reminders:
+            remind_at, _ = self.reminders.next()
+            lines.append(f"🔔 {len(self.reminders)} reminders pending; next at {remind_at[:16]}")
+        print("\n".join(lines))
+    
+    def pop_due_reminders(self, now: str = None):
+        """Fire every reminder whose time has come, clearing it, and return [(session, thought)]"""
+        now = now or datetime.datetime.now().isoformat()
+        fired = []
+        for thought_id in self.reminders.pop_due(now):
+            session, thought = self.thought_index.get(thought_id)
+            self._unindex_thought(session, thought)
+            thought.remind_at = None
+            thought.updated_at = datetime.datetime.now().isoformat()
+            self._index_thought(session, thought)
+            fired.append((session, thought))
+        return fired
+    
+    def announce_reminders(self):
+        """Print reminders that have come due (the CLI checks before each prompt)"""
+        for session, thought in self.pop_due_reminders():
+            due = f" (due {thought.due_at[:16]})" if thought.due_at else ""
+            print(f"🔔 Reminder: {thought.content[:60]}{due} - {session.title[:30]} ({thought.id})")
+    
+    def show_thought(self, thought_id: str):
+        """Show a thought and the session it belongs to"""
+        found = self._resolve_thought(thought_id)
+        if not found:
+            return
         
-        print(f"❌ Thought with ID '{thought_id}' not found")
+        session, thought = found
+        print(f"\n📍 In session '{session.title}' ({session.id}):")
+        self._print_thought(thought)
+    
+    def iter_workspace_thoughts(self, session_ids: List[str] = None, category: str = None,
+                                completed: bool = None):
+        """Lazily yield thoughts across sessions in display order
+        
+        Each session's display-order list is already sorted, so they are merged with
+        heapq.merge and filtered as they stream; nothing is materialized up front.
+        When a category is given only the sessions that contain it are merged.
+        """
+        if session_ids is None:
+            if category:
+                session_ids = [sid for sid, postings in self.category_index.sessions.items()
+                               if category.lower() in postings]
+            else:
+                session_ids = list(self.display_order.sessions)
+        streams = [self.display_order.sessions.get(session_id, []) for session_id in session_ids]
+        
+        for _, thought_id in heapq.merge(*streams):
+            thought = self.thought_index.get(thought_id)[1]
+            if category and thought.category.lower() != category.lower():
+                continue
+            if completed is not None and thought.is_completed != completed:
+                continue
+            yield thought
+    
+    def list_workspace_thoughts(self, category: str = None, completed: bool = None, limit: int = 50):
+        """List thoughts from every session, highest priority first"""
+        thoughts = list(itertools.islice(self.iter_workspace_thoughts(category=category, completed=completed), limit))
+        if not thoughts:
+            print("🤔 No thoughts found with the specified criteria")
+            return
+        
+        lines = [f"\n🌐 Top {len(thoughts)} thoughts across {len(self.sessions)} sessions:", "-" * 60]
+        for thought in thoughts:
+            session, _ = self.thought_index.get(thought.id)
+            lines.append(f"{self._format_thought(thought, compact=True)} - {session.title[:30]}")
+        print("\n".join(lines))
+    
+    def delete_session(self, session_id: str):
+        """Delete a session and all of its thoughts"""
+        session = self.get_session(session_id)
+        if not session:
+            print(f"❌ Session with ID '{session_id}' not found")
+            return
+        
+        self.remove_session(session, datetime.datetime.now().isoformat())
+        print(f"🗑️ Deleted session: '{session.title}'")
+        return session
+    
+    def get_session(self, session_id: str):
+        """Return the session with the given ID, or None"""
+        return self.session_map.get(session_id)
+    
+    # Low-level mutations used by delete_session and replica sync. They keep the
+    # indexes current but leave timestamps exactly as given and print nothing.
+    
+    def insert_session(self, session: ThinkingSession):
+        """Add a complete session, indexing its thoughts"""
+        self.sessions.append(session)
+        bisect.insort(self.session_order, (session.created_at, session.id))
+        self.session_map[session.id] = session
+        self.session_prefixes.add(session.id)
+        self.deleted_sessions.pop(session.id, None)
+        self.structure_dirty = True
+        self.mark_dirty(session)
+        for thought in session.thoughts:
+            self._index_thought(session, thought)
+        self.session_cache.admit(session)
+    
+    def remove_session(self, session: ThinkingSession, deleted_at: Optional[str]):
+        """Remove a session and leave a tombstone (none when deleted_at is None, i.e. archived)"""
+        for thought in session.thoughts:
+            self._unindex_thought(session, thought)
+        self.sessions.remove(session)
+        self.session_order.remove((session.created_at, session.id))
+        del self.session_map[session.id]
+        self.session_prefixes.discard(session.id)
+        if deleted_at is not None:
+            self.deleted_sessions[session.id] = deleted_at
+        self.dirty.pop(session.id, None)
+        self._encoded.pop(session.id, None)
+        self.session_cache.forget(session)
+        self.structure_dirty = True
+        if self.current_session is session:
+            self.current_session = None
+    
+    def put_thought(self, session: ThinkingSession, thought: Thought):
+        """Insert a thought into a session, replacing any thought with the same ID"""
+        found = self.thought_index.get(thought.id)
+        if found:
+            self._unindex_thought(*found)
+            found[0].thoughts.remove(found[1])
+        session.thoughts.append(thought)
+        session.deleted_thoughts.pop(thought.id, None)
+        self._index_thought(session, thought)
+    
+    def drop_thought(self, session: ThinkingSession, thought_id: str, deleted_at: str):
+        """Remove a thought from a session (if present) and leave a tombstone"""
+        found = self.thought_index.get(thought_id)
+        if found and found[0] is session:
+            self._unindex_thought(session, found[1])
+            session.thoughts.remove(found[1])
+        session.deleted_thoughts[thought_id] = max(deleted_at, session.deleted_thoughts.get(thought_id, ''))
+        self.mark_dirty(session, thought_id)
+    
+    @holding_sessions
+    def apply_external_changes(self, changes: ExternalChanges) -> Dict[str, Any]:
+        """Bring sessions changed on disk by another process into the workspace
+        
+        Only the sessions in changes.changed are touched (sessions missing from
+        the file are removed); thoughts that did not change keep their objects.
+        Sessions with unsaved local changes are left alone. Returns the session
+        IDs updated, added and removed, the thought IDs changed and the titles
+        of sessions skipped.
+        """
+        result = {'updated': [], 'added': [], 'removed': [], 'thoughts': set(), 'skipped': []}
+        structure_dirty = self.structure_dirty
+        records = {}
+        for session_id, record in changes.changed.items():
+            session = self.session_map.get(session_id)
+            if session_id in self.dirty or (session is None and session_id in self.deleted_sessions):
+                result['skipped'].append(record['title'])
+            else:
+                records[session_id] = record
+        gone = [s for s in self.sessions if s.id not in changes.hashes and s.id not in self.dirty]
+        
+        # Unindex everything leaving or changing first, so a thought that moved
+        # between two changed sessions is never indexed twice
+        for session in gone:
+            self.remove_session(session, None)
+            result['removed'].append(session.id)
+            result['thoughts'].update(t.id for t in session.thoughts)
+        kept = {}
+        for session_id, record in records.items():
+            session = self.session_map.get(session_id)
+            if session is None:
+                continue
+            incoming = {thought['id']: thought for thought in record['thoughts']}
+            kept[session_id] = {}
+            for thought in session.thoughts:
+                if vars(thought) == incoming.get(thought.id):
+                    kept[session_id][thought.id] = thought
+                else:
+                    self._unindex_thought(session, thought)
+                    result['thoughts'].add(thought.id)
+        
+        for session_id, record in records.items():
+            session = self.session_map.get(session_id)
+            if session is None:
+                self.insert_session(session_from_dict(record))
+                result['added'].append(session_id)
+                result['thoughts'].update(thought['id'] for thought in record['thoughts'])
+            else:
+                thoughts = []
+                for data in record['thoughts']:
+                    thought = kept[session_id].get(data['id'])
+                    if thought is None:
+                        thought = Thought(**data)
+                        self._index_thought(session, thought)
+                        result['thoughts'].add(thought.id)
+                    thoughts.append(thought)
+                session.thoughts = thoughts
+                session.title, session.description = record['title'], record['description']
+                session.updated_at = record['updated_at']
+                session.deleted_thoughts = record.get('deleted_thoughts', {})
+                self.mark_dirty(session)  # bumps the session version for cached exports
+                result['updated'].append(session_id)
+            # The session now matches the file, so it is clean but its cached encoding is not
+            self.dirty.pop(session_id, None)
+            self._encoded.pop(session_id, None)
+        
+        self.structure_dirty = structure_dirty
+        self.deleted_sessions.update(load_tombstones(self.data_file))
+        return result
+    
+    def show_analytics(self):
+        """Show workspace-wide thought analytics"""
+        stats = self.analytics
+        if not stats.total:
+            print("📊 No thoughts yet - nothing to report")
+            return
+        
+        print("\n📊 Workspace Analytics:")
+        print("-" * 50)
+        print(f"Thoughts: {stats.total} ({stats.completed} completed, {stats.completion_rate():.0%})")
+        
+        print("\nBy category:")
+        for category, count in stats.by_category.most_common():
+            done = stats.completed_by_category[category]
+            print(f"  {category:<20} {count:>6} ({done} completed)")
+        
+        print("\nBy priority:")
+        for priority in sorted(stats.by_priority, reverse=True):
+            print(f"  {'⭐' * priority:<10} {stats.by_priority[priority]:>6}")
+        
+        print("\nCreated per day (last 7 active days):")
+        for day in sorted(stats.by_day)[-7:]:
+            print(f"  {day}  {stats.by_day[day]:>6}")
+        
+        print("\nCreated per week (last 4 active weeks):")
+        for week in sorted(stats.by_week)[-4:]:
+            print(f"  {week}    {stats.by_week[week]:>6}")
+        print()
+    
+    def show_cache(self):
+        """Show how much of the workspace is in memory and the session cache counters"""
+        stats = self.session_cache.stats()
+        budget = "unlimited" if stats['budget'] is None else f"{stats['budget'] / 1048576:.1f} MB"
+        print(f"\n💾 Session cache (budget {budget}):")
+        print(f"  In memory:  {stats['resident_sessions']} sessions (~{stats['resident_bytes'] / 1048576:.1f} MB)")
+        print(f"  On disk:    {stats['spilled_sessions']} sessions")
+        print(f"  Hits: {stats['hits']}  Misses: {stats['misses']}  "
+              f"Evictions: {stats['evictions']}  Flushes: {stats['flushes']}")
     
     def brainstorm_session(self):
         """Interactive brainstorming session"""
@@ -239,30 +1464,13 @@ class ThinkerApp:
                 elif user_input.lower() == 'help':
                     self.show_brainstorm_help()
                     continue
-                elif user_input.lower().startswith('priority:'):
-                    # Handle priority setting: "priority:5 This is important"
-                    parts = user_input.split(' ', 1)
-                    if len(parts) == 2:
-                        try:
-                            priority = int(parts[0].split(':')[1])
-                            content = parts[1]
-                            self.add_thought(content, priority=min(max(priority, 1), 5))
-                        except ValueError:
-                            print("❌ Invalid priority format. Use: priority:1-5 your thought")
-                    continue
-                elif user_input.lower().startswith('category:'):
-                    # Handle category setting: "category:ideas This is an idea"
-                    parts = user_input.split(' ', 1)
-                    if len(parts) == 2:
-                        category = parts[0].split(':')[1]
-                        content = parts[1]
-                        self.add_thought(content, category=category)
-                    continue
-                elif not user_input:
+                elif user_input.lower() == 'paste':
+                    self.add_thoughts(read_pasted_captures())
                     continue
                 
-                # Regular thought
-                self.add_thought(user_input)
+                capture = parse_capture(user_input)
+                if capture:
+                    self.add_thoughts([capture])
                 
             except KeyboardInterrupt:
                 print("\n\n🛑 Brainstorming session interrupted")
@@ -274,8 +1482,10 @@ class ThinkerApp:
         """Show help for brainstorming session"""
         print("\n📖 Brainstorming Commands:")
         print("  • Just type your thought and press Enter")
-        print("  • 'priority:1-5 your thought' - Set priority (1=low, 5=high)")
-        print("  • 'category:name your thought' - Set category")
+        print("  • '!1-5 your thought' - Set priority (1=low, 5=high); 'priority:5' also works")
+        print("  • '@name your thought' - Set category; 'category:name' also works")
+        print("  • '#tag your thought' - Add a tag (markers go first: '!5 @ideas #ui #later text')")
+        print("  • 'paste' - Paste many lines at once, one thought per line, then a line with '.'")
         print("  • 'help' - Show this help")
         print("  • 'done' - Finish brainstorming session")
     
@@ -288,6 +1498,7 @@ class ThinkerApp:
         if not session:
             print("❌ No session to export")
             return
+        self.session_cache.touch(session)
         
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"thinking_session_{session.id}_{timestamp}.{format}"
@@ -305,9 +1516,213 @@ class ThinkerApp:
         except Exception as e:
             print(f"❌ Error exporting session: {e}")
     
-    def _export_to_txt(self, session: ThinkingSession, filename: str):
+    def publish_site(self, directory: str = "site"):
+        """Render the whole workspace as static HTML, rebuilding only changed pages"""
+        try:
+            report = build_site(self, directory)
+        except OSError as e:
+            print(f"❌ Error building site: {e}")
+            return
+        print(f"🌐 Site built in {directory}: {report.rendered} pages rendered, {report.unchanged} unchanged, "
+              f"{report.removed} removed in {report.seconds:.2f}s ({report.pages_per_second:.0f} pages/sec)")
+        return report
+    
+    def export_changes(self, target: str = "thinking_changes.jsonl", workspace: bool = False):
+        """Append thoughts changed since the last export to target as a JSONL change feed"""
+        if workspace:
+            sessions = self.sessions
+        elif self.current_session:
+            sessions = [self.current_session]
+        else:
+            print("❌ No session to export")
+            return
+        
+        try:
+            counts = export_changes(self, sessions, target)
+        except OSError as e:
+            print(f"❌ Error exporting changes: {e}")
+            return
+        print(f"📤 Exported {counts['upsert']} changed and {counts['delete']} deleted thoughts "
+              f"({counts['session']} session updates) to: {target}")
+        return counts
+    
+    @holding_sessions
+    def sync_with(self, path: str):
+        """Two-way merge of this workspace with another data file"""
+        if os.path.abspath(path) == os.path.abspath(self.data_file):
+            print("❌ Cannot sync a workspace with itself")
+            return
+        
+        try:
+            report = sync_with_file(self, path, indent=None if self.compact else 2)
+        except (json.JSONDecodeError, KeyError, SchemaError) + STREAM_ERRORS as e:
+            print(f"❌ Error syncing with {path}: {e}")
+            return
+        
+        if not report.sessions_compared:
+            print(f"🔄 Already in sync with {path} (root hashes match)")
+            return report
+        print(f"\n🔄 Synced with {path}:")
+        print("\n".join(f"   {line}" for line in report.lines()))
+        if report.changes['local']:
+            # Tombstones for sessions neither side holds touch no session, so force the save
+            self.structure_dirty = True
+            self.save_data()
+        return report
+    
+    @property
+    def archive(self) -> "ThinkerApp":
+        """The cold store next to the data file, loaded the first time it is needed"""
+        if self._archive is None:
+            self._archive = ThinkerApp(archive_file(self.data_file), compact=self.compact)
+        return self._archive
+    
+    def _archive_shadow(self, session: ThinkingSession) -> ThinkingSession:
+        """Return the archive's copy of a session, creating an empty one if needed"""
+        shadow = self.archive.get_session(session.id)
+        if shadow is None:
+            shadow = ThinkingSession(id=session.id, title=session.title, description=session.description,
+                                     thoughts=[], created_at=session.created_at, updated_at=session.updated_at)
+            self.archive.insert_session(shadow)
+        return shadow
+    
+    def archive_old(self, days: int = 90):
+        """Move dormant sessions and old completed thoughts to the archive
+        
+        Sessions not updated for `days` move whole (except the selected one);
+        in the others, completed thoughts not updated for `days` move alone.
+        """
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=days)).isoformat()
+        archive = self.archive
+        if self.load_error or archive.load_error:
+            print("❌ Not archiving: the data file or the archive could not be read")
+            return
+        
+        moved_sessions = moved_thoughts = 0
+        for session in list(self.sessions):
+            if session is self.current_session:
+                continue
+            if session.updated_at < cutoff:
+                self.remove_session(session, None)
+                shadow = archive.get_session(session.id)
+                if shadow is None:
+                    archive.insert_session(session)
+                else:
+                    for thought in session.thoughts:
+                        archive.put_thought(shadow, thought)
+                    shadow.title, shadow.description = session.title, session.description
+                    shadow.updated_at = session.updated_at
+                moved_sessions += 1
+                continue
+            cold = [t for t in session.thoughts if t.is_completed and t.updated_at < cutoff]
+            if cold:
+                shadow = self._archive_shadow(session)
+                for thought in cold:
+                    self._unindex_thought(session, thought)
+                    session.thoughts.remove(thought)
+                    archive.put_thought(shadow, thought)
+                moved_thoughts += len(cold)
+        
+        if not moved_sessions and not moved_thoughts:
+            print(f"🗄️ Nothing older than {days} days to archive")
+            return
+        # The archive is written first: a crash in between duplicates rather than loses
+        if archive.save_data():
+            self.save_data()
+        print(f"🗄️ Archived {moved_sessions} sessions and {moved_thoughts} completed thoughts "
+              f"to {archive.data_file}")
+    
+    def unarchive(self, item_id: str):
+        """Bring an archived session (or a single archived thought) back into the workspace"""
+        archive = self.archive
+        shadow = archive.get_session(item_id)
+        found = None if shadow else archive.find_thought(item_id)
+        if not shadow and not found:
+            print(f"❌ Nothing with ID '{item_id}' in the archive")
+            return
+        
+        if found:
+            shadow, thought = found
+            session = self.get_session(shadow.id)
+            if session is None:
+                session = ThinkingSession(id=shadow.id, title=shadow.title, description=shadow.description,
+                                          thoughts=[], created_at=shadow.created_at, updated_at=shadow.updated_at)
+                self.insert_session(session)
+            archive._unindex_thought(shadow, thought)
+            shadow.thoughts.remove(thought)
+            if not shadow.thoughts:
+                archive.remove_session(shadow, None)
+            self.put_thought(session, thought)
+            restored = f"thought '{thought.content[:50]}'"
+        else:
+            archive.remove_session(shadow, None)
+            session = self.get_session(shadow.id)
+            if session is None:
+                self.insert_session(shadow)
+            else:
+                for thought in shadow.thoughts:
+                    self.put_thought(session, thought)
+            restored = f"session '{shadow.title}' ({len(shadow.thoughts)} thoughts)"
+        
+        # save_data writes the workspace before the archive, so a crash duplicates rather than loses
+        self.save_data()
+        print(f"📤 Restored {restored}")
+    
+    def list_archived_sessions(self):
+        """List the sessions held in the archive"""
+        archive = self.archive
+        if not archive.sessions:
+            print("🗄️ The archive is empty")
+            return
+        
+        archived = {session.id: session for session in archive.sessions}
+        active = {session.id for session in self.sessions}
+        lines = ["\n🗄️ Archived Sessions:", "-" * 50]
+        for _, session_id in archive.session_order:
+            session = archived[session_id]
+            thought_count, completed_thoughts = archive.analytics.session_counts(session_id)
+            note = " - older thoughts of an active session" if session_id in active else ""
+            lines.append(f"🗄️ {session.title} ({session.id}) - {thought_count} thoughts "
+                         f"({completed_thoughts} completed){note}")
+        print("\n".join(lines))
+    
+    def export_text(self, session: ThinkingSession, format: str, progress: Callable[[float], None] = None,
+                    version: int = None) -> str:
+        """Render a session as 'txt' or 'md', reusing the cached rendering of an unchanged session
+        
+        version defaults to the session's current version; pass the version taken
+        when the session was detached to render a copy on another thread.
+        """
+        if version is None:
+            version = self.session_version(session)
+        key = (session.id, version, format)
+        text = self.render_cache.get(key)
+        if text is None:
+            render = self._render_txt if format == "txt" else self._render_markdown
+            text = render(session, progress)
+            # Only versions the saved data file holds are safe to keep across runs
+            self.render_cache.put(key, text, persist=self.saved_versions.get(session.id) == version)
+        elif progress:
+            progress(1.0)
+        return text
+    
+    def _export_to_txt(self, session: ThinkingSession, filename: str,
+                       progress: Callable[[float], None] = None, version: int = None):
         """Export session to plain text"""
+        text = self.export_text(session, "txt", progress, version)
         with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+    
+    def _export_to_markdown(self, session: ThinkingSession, filename: str,
+                            progress: Callable[[float], None] = None, version: int = None):
+        """Export session to markdown"""
+        text = self.export_text(session, "md", progress, version)
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+    
+    def _render_txt(self, session: ThinkingSession, progress: Callable[[float], None] = None) -> str:
+        """Render a session as plain text"""
+        with io.StringIO() as f:
             f.write(f"Thinking Session: {session.title}\n")
             f.write("=" * 50 + "\n\n")
             
@@ -318,30 +1733,29 @@ class ThinkerApp:
             f.write(f"Updated: {session.updated_at[:19]}\n")
             f.write(f"Total Thoughts: {len(session.thoughts)}\n\n")
             
-            # Group thoughts by category
-            categories = {}
-            for thought in session.thoughts:
-                if thought.category not in categories:
-                    categories[thought.category] = []
-                categories[thought.category].append(thought)
-            
-            for category, thoughts in categories.items():
+            # Group thoughts by category, sub-thoughts indented under their parent
+            written = 0
+            for category, entries in outline_by_category(session.thoughts).items():
                 f.write(f"\n{category.upper()}\n")
                 f.write("-" * len(category) + "\n\n")
                 
-                # Sort by priority
-                thoughts.sort(key=lambda x: x.priority, reverse=True)
-                
-                for thought in thoughts:
+                for depth, thought in entries:
+                    indent = "    " * depth
                     status = "[✓]" if thought.is_completed else "[ ]"
                     priority = "★" * thought.priority
-                    f.write(f"{status} {thought.content}\n")
-                    f.write(f"    Priority: {priority} | Tags: {', '.join(thought.tags)}\n")
-                    f.write(f"    Created: {thought.created_at[:19]}\n\n")
+                    f.write(f"{indent}{status} {thought.content}\n")
+                    f.write(f"{indent}    Priority: {priority} | Tags: {', '.join(thought.tags)}\n")
+                    if thought.due_at:
+                        f.write(f"{indent}    Due: {thought.due_at[:16]}\n")
+                    f.write(f"{indent}    Created: {thought.created_at[:19]}\n\n")
+                    if progress:
+                        written += 1
+                        progress(written / len(session.thoughts))
+            return f.getvalue()
     
-    def _export_to_markdown(self, session: ThinkingSession, filename: str):
-        """Export session to markdown"""
-        with open(filename, 'w', encoding='utf-8') as f:
+    def _render_markdown(self, session: ThinkingSession, progress: Callable[[float], None] = None) -> str:
+        """Render a session as markdown"""
+        with io.StringIO() as f:
             f.write(f"# {session.title}\n\n")
             
             if session.description:
@@ -351,31 +1765,40 @@ class ThinkerApp:
             f.write(f"- **Updated:** {session.updated_at[:19]}\n")
             f.write(f"- **Total Thoughts:** {len(session.thoughts)}\n\n")
             
-            # Group thoughts by category
-            categories = {}
-            for thought in session.thoughts:
-                if thought.category not in categories:
-                    categories[thought.category] = []
-                categories[thought.category].append(thought)
-            
-            for category, thoughts in categories.items():
+            # Group thoughts by category, sub-thoughts as nested list items
+            written = 0
+            for category, entries in outline_by_category(session.thoughts).items():
                 f.write(f"\n## {category.title()}\n\n")
                 
-                # Sort by priority
-                thoughts.sort(key=lambda x: x.priority, reverse=True)
-                
-                for thought in thoughts:
+                for depth, thought in entries:
+                    indent = "  " * depth
                     checkbox = "- [x]" if thought.is_completed else "- [ ]"
                     priority = "⭐" * thought.priority
-                    f.write(f"{checkbox} **{thought.content}**\n")
-                    f.write(f"  - Priority: {priority}\n")
+                    f.write(f"{indent}{checkbox} **{thought.content}**\n")
+                    f.write(f"{indent}  - Priority: {priority}\n")
                     if thought.tags:
-                        f.write(f"  - Tags: {', '.join(thought.tags)}\n")
-                    f.write(f"  - Created: {thought.created_at[:19]}\n\n")
+                        f.write(f"{indent}  - Tags: {', '.join(thought.tags)}\n")
+                    if thought.due_at:
+                        f.write(f"{indent}  - Due: {thought.due_at[:16]}\n")
+                    f.write(f"{indent}  - Created: {thought.created_at[:19]}\n\n")
+                    if progress:
+                        written += 1
+                        progress(written / len(session.thoughts))
+            return f.getvalue()
+
+def create_app() -> ThinkerApp:
+    """Create the app, honouring THINKER_DATA_FILE (e.g. thoughts.json.xz), THINKER_COMPACT_JSON=1
+    THINKER_EXPORT_CACHE (a directory keeping rendered exports between runs) and
+    THINKER_MEMORY_BUDGET (megabytes of thoughts kept in memory; the rest spill to disk)"""
+    budget = os.environ.get("THINKER_MEMORY_BUDGET")
+    return ThinkerApp(os.environ.get("THINKER_DATA_FILE", "thoughts.json"),
+                      compact=os.environ.get("THINKER_COMPACT_JSON") == "1",
+                      export_cache=os.environ.get("THINKER_EXPORT_CACHE"),
+                      memory_budget=int(float(budget) * 1024 * 1024) if budget else None)
 
 def main():
     """Main function to run the Thinker App"""
-    app = ThinkerApp()
+    app = create_app()
     
     print("🧠 Welcome to the Python Thinker App!")
     print("💭 Organize your thoughts, brainstorm ideas, and structure your thinking")
@@ -383,7 +1806,9 @@ def main():
     
     while True:
         try:
-            command = input("🤔 thinker> ").strip().lower()
+            app.announce_reminders()
+            raw_command = input("🤔 thinker> ").strip()
+            command = raw_command.lower()
             
             if command == 'help':
                 show_help()
@@ -393,6 +1818,15 @@ def main():
                 break
             elif command == 'sessions':
                 app.list_sessions()
+            elif command.startswith('sessions --'):
+                try:
+                    flags = parse_listing_flags(command.split()[1:])
+                    if flags['all'] and flags['limit'] is None and flags['after'] is None:
+                        app.list_sessions(compact=flags['compact'], include_archive=True)
+                    else:
+                        app.list_sessions(flags['limit'] or 50, flags['after'], flags['compact'], flags['all'])
+                except ValueError as e:
+                    print(f"❌ {e}")
             elif command.startswith('create '):
                 title = command[7:].strip()
                 if title:
@@ -408,20 +1842,114 @@ def main():
                     app.add_thought(content)
                 else:
                     print("❌ Please provide thought content")
+            elif command.startswith('sub '):
+                parts = command[4:].strip().split(' ', 1)
+                if len(parts) == 2 and parts[1].strip():
+                    app.add_thought(parts[1].strip(), parent_id=parts[0])
+                else:
+                    print("❌ Use: sub <parent_id> <thought>")
+            elif command.startswith('nest '):
+                parts = command.split()
+                if len(parts) == 3:
+                    app.nest_thought(parts[1], None if parts[2] in ('none', 'top') else parts[2])
+                else:
+                    print("❌ Use: nest <thought_id> <parent_id|none>")
+            elif command == 'tree' or command.startswith('tree '):
+                app.show_tree(command[5:].strip() or None)
             elif command == 'thoughts':
                 app.list_thoughts()
+            elif command.startswith('thoughts --'):
+                try:
+                    flags = parse_listing_flags(command.split()[1:])
+                except ValueError as e:
+                    print(f"❌ {e}")
+                    continue
+                app.list_thoughts_page(flags['after'], flags['limit'] or 50, flags['compact'], flags['all'])
+            elif command in ('browse', 'browse all'):
+                app.browse_thoughts(workspace=command == 'browse all')
+            elif command.startswith('thoughts since ') or command.startswith('changed since '):
+                run_time_range_command(app, command)
+            elif command.startswith('thoughts ') or command.startswith('all thoughts'):
+                app.run_query(command)
+            elif command.startswith('explain '):
+                app.run_query(command[8:], explain=True)
+            elif command.startswith('bulk '):
+                run_bulk_command(app, command)
+            elif command == 'everywhere' or command.startswith('everywhere '):
+                run_workspace_listing_command(app, command)
+            elif command.startswith('show '):
+                app.show_thought(command[5:].strip())
+            elif command.startswith('edit '):
+                parts = command[5:].strip().split(' ', 1)
+                if len(parts) == 2 and parts[1].strip():
+                    app.edit_thought(parts[0], content=parts[1].strip())
+                else:
+                    print("❌ Use: edit <thought_id> <new content>")
             elif command.startswith('complete '):
                 thought_id = command[9:].strip()
                 app.complete_thought(thought_id)
             elif command.startswith('delete '):
                 thought_id = command[7:].strip()
                 app.delete_thought(thought_id)
+            elif command == 'due':
+                app.list_due()
+            elif command.startswith('due ') or command.startswith('remind '):
+                parts = command.split(None, 2)
+                if len(parts) == 3:
+                    app.schedule_thought(parts[1], parts[2], reminder=parts[0] == 'remind')
+                else:
+                    print(f"❌ Use: {parts[0]} <thought_id> <when|none>")
             elif command == 'brainstorm':
                 app.brainstorm_session()
+            elif command == 'analytics':
+                app.show_analytics()
+            elif command == 'cache':
+                app.show_cache()
+            elif command.startswith('link '):
+                parts = command.split()
+                if len(parts) in (3, 4):
+                    app.link_thoughts(parts[1], parts[2], parts[3] if len(parts) == 4 else "related")
+                else:
+                    print("❌ Use: link <from_id> <to_id> [type]")
+            elif command.startswith('unlink '):
+                parts = command.split()
+                if len(parts) == 3:
+                    app.unlink_thoughts(parts[1], parts[2])
+                else:
+                    print("❌ Use: unlink <id> <id>")
+            elif command.startswith('links '):
+                app.show_links(command[6:].strip())
+            elif command.startswith('path '):
+                parts = command.split()
+                if len(parts) == 3:
+                    app.show_path(parts[1], parts[2])
+                else:
+                    print("❌ Use: path <from_id> <to_id>")
+            elif command == 'export dot' or command.startswith('export dot '):
+                app.export_graph(command[11:].strip() or None)
+            elif command.startswith('export changes'):
+                words = command.split()[2:]
+                workspace = 'all' in words
+                words = [w for w in words if w != 'all']
+                app.export_changes(words[0] if words else "thinking_changes.jsonl", workspace)
             elif command.startswith('export'):
                 parts = command.split()
                 format_type = parts[1] if len(parts) > 1 else "txt"
                 app.export_session(format=format_type)
+            elif command.startswith('sync '):
+                app.sync_with(raw_command[5:].strip())
+            elif command == 'site' or command.startswith('site '):
+                app.publish_site(raw_command[4:].strip() or "site")
+            elif command.startswith('view '):
+                run_viewer(raw_command[5:].strip())
+            elif command == 'archive' or command.startswith('archive '):
+                days = command[8:].strip()
+                if days and not days.isdigit():
+                    print("❌ Use: archive [days]")
+                else:
+                    app.archive_old(int(days) if days else 90)
+            elif command.startswith('unarchive '):
+                app.unarchive(command[10:].strip())
             elif command == 'save':
                 app.save_data()
             elif command == '':
@@ -434,6 +1962,167 @@ def main():
         except Exception as e:
             print(f"❌ An error occurred: {e}")
 
+def _format_cursor(entry) -> str:
+    """Encode an index entry as a lowercase-safe cursor ('3_2026-10-19t11:41:37.457705_ab12cd34')"""
+    key, record_id = entry
+    if isinstance(key, tuple):
+        negated_priority, timestamp = key
+        return f"{-negated_priority}_{timestamp.lower()}_{record_id}"
+    return f"{key.lower()}_{record_id}"
+
+def _parse_cursor(cursor: str):
+    """Decode a cursor produced by _format_cursor back into an index entry"""
+    parts = cursor.strip().split('_')
+    if len(parts) == 3:
+        return ((-int(parts[0]), parts[1].upper()), parts[2])
+    if len(parts) == 2:
+        return (parts[0].upper(), parts[1])
+    raise ValueError(f"Invalid cursor: {cursor}")
+
+def _bulk_changes(session: ThinkingSession, thought: Thought, action: str, value: Any,
+                  target: Optional[ThinkingSession]) -> bool:
+    """Whether a bulk action would change a thought"""
+    if action == 'complete':
+        return not thought.is_completed
+    if action == 'priority':
+        return thought.priority != value
+    if action == 'category':
+        return thought.category != value
+    if action == 'tag':
+        return _retag(thought.tags, *value) != thought.tags
+    if action == 'move':
+        return session is not target
+    return True
+
+def _retag(tags: List[str], added: List[str], removed: List[str]) -> List[str]:
+    """Return a new tag list with removed dropped (ignoring case) and added appended if missing"""
+    dropped = {tag.lower() for tag in removed}
+    kept = [tag for tag in tags if tag.lower() not in dropped]
+    present = {tag.lower() for tag in kept}
+    for tag in added:
+        if tag.lower() not in present:
+            kept.append(tag)
+            present.add(tag.lower())
+    return kept
+
+def _describe_bulk(action: str, value: Any, target: Optional[ThinkingSession], count: int) -> str:
+    """Describe a bulk action for messages, e.g. 'set priority 5 on 12 thoughts'"""
+    thoughts = f"{count} thought{'s' if count != 1 else ''}"
+    if action == 'priority':
+        return f"set priority {value} on {thoughts}"
+    if action == 'category':
+        return f"set category '{value}' on {thoughts}"
+    if action == 'tag':
+        changes = [f"+{tag}" for tag in value[0]] + [f"-{tag}" for tag in value[1]]
+        return f"retag {thoughts} ({' '.join(changes)})"
+    if action == 'move':
+        return f"move {thoughts} to '{target.title}'"
+    return f"{action} {thoughts}"
+
+def read_pasted_captures() -> List[Capture]:
+    """Read pasted lines up to a line with just '.' (or end of input), one thought per line"""
+    print("📋 Paste your thoughts, one per line, then enter a line with just '.'")
+    captures = []
+    while True:
+        try:
+            line = input()
+        except EOFError:
+            break
+        if line.strip() == '.':
+            break
+        capture = parse_capture(line)
+        if capture:
+            captures.append(capture)
+    return captures
+
+def parse_listing_flags(words: List[str]) -> Dict[str, Any]:
+    """Parse '--limit N --after CURSOR --compact --all' listing flags"""
+    flags = {'limit': None, 'after': None, 'compact': False, 'all': False}
+    words = list(words)
+    while words:
+        word = words.pop(0)
+        if word == '--limit' and words:
+            flags['limit'] = int(words.pop(0))
+        elif word == '--after' and words:
+            flags['after'] = words.pop(0)
+        elif word == '--compact':
+            flags['compact'] = True
+        elif word == '--all':
+            flags['all'] = True
+        else:
+            raise ValueError(f"Unknown option '{word}'")
+    return flags
+
+def run_workspace_listing_command(app: ThinkerApp, command: str):
+    """Handle 'everywhere [category:<name>] [done|open] [limit <n>]'"""
+    category, completed, limit = None, None, 50
+    words = command.split()[1:]
+    try:
+        while words:
+            word = words.pop(0)
+            if word.startswith('category:'):
+                category = word.split(':', 1)[1]
+            elif word in ('done', 'open'):
+                completed = word == 'done'
+            elif word == 'limit':
+                limit = int(words.pop(0))
+            else:
+                raise ValueError(word)
+    except (ValueError, IndexError):
+        print("❌ Use: everywhere [category:<name>] [done|open] [limit <n>]")
+        return
+    app.list_workspace_thoughts(category, completed, limit)
+
+def run_bulk_command(app: ThinkerApp, command: str):
+    """Handle 'bulk <action> [value] [--dry-run] <query>'"""
+    usage = ("❌ Use: bulk complete|delete|priority <1-5>|category <name>|tag +<tag> -<tag> ...|move <session_id>\n"
+             "       [--dry-run] [all] thoughts where <condition>")
+    words = command.split()[1:]
+    dry_run = '--dry-run' in words
+    words = [word for word in words if word != '--dry-run']
+    try:
+        action, value = words.pop(0), None
+        if action in ('priority', 'category', 'move'):
+            value = words.pop(0)
+            if action == 'priority':
+                value = int(value)
+                if not 1 <= value <= 5:
+                    raise ValueError(value)
+        elif action == 'tag':
+            changes = []
+            while words and len(words[0]) > 1 and words[0][0] in '+-':
+                changes.append(words.pop(0))
+            if not changes:
+                raise ValueError(action)
+            value = ([c[1:] for c in changes if c[0] == '+'], [c[1:] for c in changes if c[0] == '-'])
+        elif action not in ('complete', 'delete'):
+            raise ValueError(action)
+    except (IndexError, ValueError):
+        print(usage)
+        return
+    if not words or words[0] not in ('thoughts', 'all'):
+        print(usage)
+        return
+    app.bulk_update(' '.join(words), action, value, dry_run)
+
+def run_time_range_command(app: ThinkerApp, command: str):
+    """Handle 'thoughts since <when> [until <when>] [all]' and 'changed since ...'"""
+    field = 'updated' if command.startswith('changed') else 'created'
+    words = command.split()[2:]
+    workspace = 'all' in words
+    words = [w for w in words if w != 'all']
+    
+    try:
+        start = parse_time_bound(words[0])
+        end = None
+        if len(words) >= 3 and words[1] == 'until':
+            end = parse_time_bound(words[2], end=True)
+    except (IndexError, ValueError):
+        print("❌ Use: thoughts since <YYYY-MM-DD|today|yesterday> [until <date>] [all]")
+        return
+    
+    app.list_thoughts_in_range(start, end, field, workspace)
+
 def show_help():
     """Display help information"""
     print("\n📖 Python Thinker App Commands:")
@@ -441,26 +2130,73 @@ def show_help():
     print("🗂️  Session Management:")
     print("  sessions                 - List all thinking sessions")
     print("  create <title>          - Create a new thinking session")
-    print("  select <session_id>     - Select a session to work with")
+    print("  sessions --limit N [--after <cursor>] [--compact]")
+    print("                          - List sessions one page at a time")
+    print("  select <session_id>     - Select a session to work with (any unique ID prefix works)")
+    print("  sessions --all          - Also list archived sessions")
     print()
     print("💭 Thought Management:")
     print("  add <thought>           - Add a thought to current session")
+    print("  sub <parent_id> <thought> - Add a sub-thought under another thought")
+    print("  nest <thought_id> <parent_id|none>")
+    print("                          - Move a thought under another (none makes it top-level)")
+    print("  tree [thought_id]       - Show the session (or one thought's subtree) as an outline")
+    print("  link <from_id> <to_id> [type]")
+    print("                          - Link two thoughts (related, supports, contradicts, depends-on, ...)")
+    print("  unlink <id> <id>        - Remove the links between two thoughts")
+    print("  links <thought_id>      - Show a thought's links and how many thoughts it connects to")
+    print("  path <from_id> <to_id>  - Shortest chain of links between two thoughts")
     print("  thoughts                - List thoughts in current session")
-    print("  complete <thought_id>   - Mark a thought as completed")
-    print("  delete <thought_id>     - Delete a thought")
+    print("  thoughts --limit N [--after <cursor>] [--compact] [--all]")
+    print("                          - List thoughts one page at a time")
+    print("  browse [all]            - Page through thoughts interactively")
+    print("  thoughts since <date> [until <date>] [all]")
+    print("                          - List thoughts created in a time range")
+    print("  changed since <date> [until <date>] [all]")
+    print("                          - List thoughts updated in a time range")
+    print("  thoughts where <query>  - Query thoughts, e.g.")
+    print("      thoughts where priority>=4 and tag:infra and not done order by created desc limit 50")
+    print("  all thoughts where ...  - Query across every session")
+    print("  ... --archive           - Append to a query to include archived thoughts")
+    print("  explain <query>         - Show the plan chosen for a query")
+    print("  everywhere [category:<name>] [done|open] [limit <n>]")
+    print("                          - List top thoughts across all sessions")
+    print("  show <thought_id>       - Show a thought and its session")
+    print("  edit <thought_id> <text> - Replace a thought's content")
+    print("  complete <thought_id>   - Mark a thought as completed (any session, unique ID prefix)")
+    print("  delete <thought_id>     - Delete a thought (any session, unique ID prefix)")
+    print("  bulk <action> [--dry-run] <query>")
+    print("                          - Apply complete, delete, priority <1-5>, category <name>,")
+    print("                            tag +<tag> -<tag> or move <session_id> to every match, e.g.")
+    print("      bulk tag +later -urgent --dry-run all thoughts where done and created<2026-01-01")
+    print("  due                     - List open thoughts by due date (overdue first)")
+    print("  due <thought_id> <when> - Set a due date: today, tomorrow, friday, +3d, 2026-11-01 or none")
+    print("  remind <thought_id> <when>")
+    print("                          - Set a reminder: +2h, tomorrow (9:00), 2026-11-01T14:30 or none")
     print()
     print("🧠 Thinking Tools:")
     print("  brainstorm              - Start interactive brainstorming")
     print("  export [txt|md]         - Export current session to file")
+    print("  export dot [thought_id] - Export the session as a Graphviz mind map, or one thought's linked group")
+    print("  export changes [file] [all]")
+    print("                          - Append changes since the last export to a JSONL feed")
+    print("  analytics               - Show workspace-wide thought statistics")
+    print("  cache                   - Show the session cache (THINKER_MEMORY_BUDGET) and its counters")
     print()
     print("💾 Data Management:")
     print("  save                    - Save all data to file")
+    print("  sync <file>             - Two-way merge with another data file")
+    print("  view <file>             - Browse a huge data file read-only without loading it")
+    print("  site [dir]              - Publish the workspace as static HTML (changed pages only)")
+    print("  archive [days]          - Move sessions idle for N days (default 90) and old")
+    print("                            completed thoughts to the archive file")
+    print("  unarchive <id>          - Restore an archived session or thought")
     print("  quit/exit               - Save and exit the application")
     print()
     print("💡 Tips:")
     print("  • Use descriptive session titles")
-    print("  • Set priorities (1-5) during brainstorming: 'priority:5 important idea'")
-    print("  • Categorize thoughts: 'category:goals finish the project'")
+    print("  • Set priorities (1-5) during brainstorming: '!5 important idea'")
+    print("  • Categorize and tag thoughts: '@goals #q4 finish the project'")
     print("  • Use tags to organize related thoughts")
 
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Bounded-memory session cache
+Keeps the thought lists of recently used sessions in memory, least recently
+used first out once their estimated size passes a memory budget. An evicted
+session keeps its metadata and its index entries; only its thoughts are written
+to a spill file (skipped when the file already holds the session's current
+version) and replaced by a placeholder that faults them back in on first use.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from thinker_schema import encode_session
+
+THOUGHT_BYTES = 700  # measured footprint of a thought's object, fields and lists, besides its content
+
+
+def thought_size(thought) -> int:
+    """Estimate the memory one thought takes, in bytes"""
+    return THOUGHT_BYTES + len(thought.content)
+
+
+def estimate_size(thoughts) -> int:
+    """Estimate the memory a list of thoughts takes, in bytes"""
+    return sum(thought_size(thought) for thought in thoughts)
+
+
+@dataclass
+class SpilledSession:
+    """An evicted session's spill file: its record as encode_session wrote it"""
+    path: str
+    indent: Optional[int]
+    version: int  # session version the file holds
+
+    def text(self, indent: Optional[int]) -> str:
+        """Read the encoded record, re-encoding it if it was spilled with another indent"""
+        with open(self.path, encoding='utf-8') as f:
+            text = f.read()
+        return text if indent == self.indent else encode_session(json.loads(text), indent)
+
+
+class SpilledThoughts:
+    """Stands in for an evicted session's thought list, faulting it back in on any use"""
+
+    __slots__ = ('cache', 'session')
+
+    def __init__(self, cache: "SessionCache", session):
+        self.cache = cache
+        self.session = session
+
+    def _load(self):
+        return self.cache.load(self.session)
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __bool__(self):
+        return bool(self._load())
+
+    def __contains__(self, item):
+        return item in self._load()
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __setitem__(self, key, value):
+        self._load()[key] = value
+
+    def __delitem__(self, key):
+        del self._load()[key]
+
+    def __reversed__(self):
+        return reversed(self._load())
+
+    def __add__(self, other):
+        return self._load() + other
+
+    def __radd__(self, other):
+        return other + self._load()
+
+    def __iadd__(self, other):
+        thoughts = self._load()
+        thoughts += other
+        return thoughts
+
+    def extend(self, items):
+        self._load().extend(items)
+
+    def append(self, item):
+        self._load().append(item)
+
+    def __eq__(self, other):
+        return self._load() == other
+
+    def __repr__(self):
+        return f"<thoughts of session {self.session.id} spilled to disk>"
+
+
+class SessionCache:
+    """LRU of resident session thought lists within a memory budget (None means unbounded)
+
+    Sessions are touched when selected, exported or searched, and whenever an
+    evicted one is faulted back in. The current session is never evicted, nor is
+    anything while an operation holds the cache.
+    """
+
+    def __init__(self, app, budget: Optional[int] = None, thought_class=None, directory: str = None):
+        self.app = app
+        self.budget = budget  # bytes
+        self.thought_class = thought_class
+        self.parent_directory = directory
+        self.directory = None  # created on the first spill, removed with the cache
+        self.resident: "OrderedDict[str, int]" = OrderedDict()  # session id -> estimated bytes, LRU first
+        self.spills: Dict[str, SpilledSession] = {}
+        self.size = 0
+        self.holds = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flushes = 0
+        app.thought_index.fault = self.load
+
+    def reset(self, sessions):
+        """Start over with every session resident (after a load), then trim to the budget"""
+        for spill in self.spills.values():
+            _discard(spill.path)
+        self.spills = {}
+        self.resident.clear()
+        self.size = 0
+        for session in sessions:
+            self.admit(session)
+        self.shrink()
+
+    def is_spilled(self, session) -> bool:
+        """Whether a session's thoughts are currently on disk"""
+        return isinstance(session.thoughts, SpilledThoughts)
+
+    def touch(self, session):
+        """Mark a session as just used, faulting its thoughts in if needed, and return them"""
+        if self.is_spilled(session):
+            return self.load(session)
+        self.hits += 1
+        self.admit(session)
+        self.shrink(session)
+        return session.thoughts
+
+    def load(self, session):
+        """Fault an evicted session's thoughts back in and return the list"""
+        if not self.is_spilled(session):
+            return session.thoughts
+        self.misses += 1
+        spill = self.spills[session.id]
+        with open(spill.path, encoding='utf-8') as f:
+            record = json.load(f)
+        thoughts = [self.thought_class(**thought) for thought in record['thoughts']]
+        session.thoughts = thoughts
+        self.app.thought_index.attach(session, thoughts)
+        self.admit(session)
+        self.shrink(session)
+        return thoughts
+
+    def admit(self, session):
+        """Account for a resident session as the most recently used"""
+        size = estimate_size(session.thoughts)
+        self.size += size - self.resident.get(session.id, 0)
+        self.resident[session.id] = size
+        self.resident.move_to_end(session.id)
+
+    def resize(self, session, delta: int):
+        """Adjust a resident session's estimate as thoughts are indexed (+) or unindexed (-)"""
+        if session.id in self.resident:
+            self.resident[session.id] += delta
+            self.size += delta
+
+    def adopt(self, session, thought):
+        """Make a thought object the resident one for its ID before it is reindexed
+
+        A caller may have read the thought before its session was evicted and
+        faulted back in; its changes must not be lost with the stale object.
+        """
+        if self.budget is None:
+            return
+        entry = self.app.thought_index.get(thought.id)
+        if entry is not None and entry[0] is session and entry[1] is not thought:
+            thoughts = session.thoughts
+            thoughts[thoughts.index(entry[1])] = thought
+            self.app.thought_index.attach(session, [thought])
+
+    def forget(self, session):
+        """Stop tracking a session leaving the workspace, keeping its thoughts in memory"""
+        self.load(session)
+        self.size -= self.resident.pop(session.id, 0)
+        spill = self.spills.pop(session.id, None)
+        if spill:
+            _discard(spill.path)
+
+    def shrink(self, keep=None):
+        """Evict least recently used sessions until the resident ones fit the budget"""
+        if self.budget is None or self.holds:
+            return
+        for session_id in list(self.resident):
+            if self.size <= self.budget:
+                break
+            session = self.app.get_session(session_id)
+            if session is None:
+                self.size -= self.resident.pop(session_id)
+            elif session is not keep and session is not self.app.current_session:
+                self.evict(session)
+
+    def evict(self, session):
+        """Write a session's thoughts to its spill file (unless already current) and drop them"""
+        if self.is_spilled(session):
+            return
+        version = self.app.session_version(session)
+        indent = self.app.save_indent()
+        spill = self.spills.get(session.id)
+        if spill is None or spill.version != version or spill.indent != indent:
+            text = self.app.cached_encoding(session, indent) or encode_session(asdict(session), indent)
+            spill = SpilledSession(self._spill_path(session.id), indent, version)
+            with open(spill.path + ".tmp", 'w', encoding='utf-8') as f:
+                f.write(text)
+            # Replaced whole, so a save reading the previous spill on another thread never sees half a file
+            os.replace(spill.path + ".tmp", spill.path)
+            self.spills[session.id] = spill
+            self.flushes += 1
+        self.app.thought_index.detach(session, session.thoughts)
+        self.app.drop_cached_encoding(session)
+        session.thoughts = SpilledThoughts(self, session)
+        self.size -= self.resident.pop(session.id, 0)
+        self.evictions += 1
+
+    def spilled_record(self, session) -> Optional[SpilledSession]:
+        """Return the spill file holding a session's current version, if it is evicted"""
+        spill = self.spills.get(session.id)
+        if self.is_spilled(session) and spill.version == self.app.session_version(session):
+            return spill
+        return None
+
+    @contextmanager
+    def hold(self):
+        """Keep every session faulted in during an operation resident until it finishes"""
+        self.holds += 1
+        try:
+            yield
+        finally:
+            self.holds -= 1
+            self.shrink()
+
+    def _spill_path(self, session_id: str) -> str:
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix="thinker-spill-", dir=self.parent_directory)
+            weakref.finalize(self, shutil.rmtree, self.directory, True)
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and current occupancy"""
+        return {'budget': self.budget, 'resident_bytes': self.size, 'resident_sessions': len(self.resident),
+                'spilled_sessions': sum(1 for s in self.app.sessions if self.is_spilled(s)),
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'flushes': self.flushes}
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Export render cache
+Rendered txt/md exports are cached by (session ID, session version, format) in
+a bounded LRU, so exporting an unchanged session again only copies text.
+Optionally the cache is backed by a directory that outlives the process; its
+versions.json records which version each session had in the data file as last
+saved, so cached files are only trusted while that file is unchanged.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+RenderKey = Tuple[str, int, str]  # (session id, version, format)
+
+
+def file_stamp(path: str, stat: os.stat_result = None):
+    """Identify a data file's current contents by path, size and modification time"""
+    stat = stat or os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+class RenderCache:
+    """Bounded LRU of rendered exports, optionally persisted in a directory"""
+
+    def __init__(self, capacity: int = 64, directory: str = None):
+        self.capacity = capacity
+        self.directory = directory
+        self.entries: "OrderedDict[RenderKey, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # exports may render on the GUI's worker thread
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: RenderKey) -> str:
+        session_id, version, format = key
+        return os.path.join(self.directory, f"{session_id}.{version}.{format}")
+
+    def clear(self):
+        """Forget the renderings held in memory (persisted files are checked by version)"""
+        with self.lock:
+            self.entries.clear()
+
+    def get(self, key: RenderKey) -> Optional[str]:
+        """Return the cached rendering for key, or None"""
+        with self.lock:
+            text = self.entries.get(key)
+            if text is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return text
+        if self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key), encoding='utf-8') as f:
+                text = f.read()
+            self.put(key, text)
+            with self.lock:
+                self.hits += 1
+            return text
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: RenderKey, text: str, persist: bool = False):
+        """Cache a rendering; persist also writes it to the directory"""
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        if persist and self.directory:
+            temp_path = self._path(key) + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_path, self._path(key))
+
+    def load_versions(self, stamp) -> Optional[Dict[str, int]]:
+        """Return the session versions saved for a data file stamp, or None
+
+        When the stamp does not match (the file changed outside the app, or it
+        belongs to another data file) every cached file is dropped.
+        """
+        if not self.directory:
+            return None
+        try:
+            with open(os.path.join(self.directory, "versions.json"), encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('stamp') == stamp:
+                return {session_id: int(version) for session_id, version in saved['sessions'].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+        self._prune({})
+        return None
+
+    def save_versions(self, stamp, versions: Dict[str, int]):
+        """Record the versions a freshly saved data file holds and drop stale files"""
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, "versions.json")
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({'stamp': stamp, 'sessions': versions}, f)
+        os.replace(path + ".tmp", path)
+        self._prune(versions)
+
+    def _prune(self, versions: Dict[str, int]):
+        """Delete cached files whose session is not at the given version"""
+        for name in os.listdir(self.directory):
+            parts = name.split('.')
+            if len(parts) == 3 and versions.get(parts[0]) != (int(parts[1]) if parts[1].isdigit() else None):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Graphviz export of thought links
+Renders a session as a mind map (the session in the middle, thoughts around it
+following their sub-thought structure, typed links as dashed edges) or one
+connected group of linked thoughts with a cluster per session, in DOT.
+Render the files with e.g. `dot -Tsvg map.dot -o map.svg`.
+"""
+
+import textwrap
+from typing import Dict, Iterable, List, Tuple
+
+LINK_STYLES = {
+    'supports': 'color="forestgreen"',
+    'contradicts': 'color="firebrick"',
+    'depends-on': 'color="darkorange"',
+}
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def _label(thought) -> str:
+    return "\n".join(textwrap.wrap(thought.content, 30)[:4]) or thought.id
+
+
+def _node(thought, extra: str = "") -> str:
+    style = ' style="rounded,filled" fillcolor="#e8f5e9"' if thought.is_completed else ""
+    return f'  {_quote(thought.id)} [label={_quote(_label(thought))}{style}{extra}];'
+
+
+def _link_edges(app, thought_ids: Iterable[str], shown) -> List[str]:
+    """Dashed, labelled edges for links between shown thoughts"""
+    lines = []
+    for thought_id in thought_ids:
+        for target, kind in sorted(app.link_index.outgoing.get(thought_id, ())):
+            if target in shown:
+                style = LINK_STYLES.get(kind, 'color="gray40"')
+                lines.append(f'  {_quote(thought_id)} -> {_quote(target)} '
+                             f'[label={_quote(kind)} style="dashed" {style}];')
+    return lines
+
+
+def session_mind_map(app, session) -> str:
+    """A session as a mind map; linked thoughts in other sessions are drawn greyed out"""
+    ids = {thought.id for thought in session.thoughts}
+    lines = [f"digraph {_quote(session.title)} {{", '  graph [layout="twopi" overlap="false"];',
+             '  node [shape="box" style="rounded"];',
+             f'  "session" [label={_quote(session.title)} shape="ellipse" style="filled" fillcolor="#bbdefb" root="true"];']
+    for thought in session.thoughts:
+        lines.append(_node(thought))
+    for thought in session.thoughts:
+        parent = thought.parent_id if thought.parent_id in ids else "session"
+        lines.append(f'  {_quote(parent)} -> {_quote(thought.id)} [arrowhead="none"];')
+
+    outside: Dict[str, Tuple] = {}
+    for thought in session.thoughts:
+        for other, _, _ in app.link_index.neighbors(thought.id):
+            found = app.find_thought(other)
+            if other not in ids and found:
+                outside[other] = found
+    for other_session, thought in outside.values():
+        lines.append(_node(thought, f' color="gray60" fontcolor="gray40" tooltip={_quote(other_session.title)}'))
+    shown = ids | set(outside)
+    lines += _link_edges(app, shown, shown)
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def component_graph(app, thought_id: str) -> str:
+    """Every thought connected to one thought by links, clustered by session"""
+    members = app.link_index.component(thought_id)
+    by_session: Dict[str, List] = {}
+    for member in members:
+        session, thought = app.find_thought(member)
+        by_session.setdefault(session.id, [session]).append(thought)
+    lines = ['digraph "links" {', '  graph [overlap="false" rankdir="LR"];', '  node [shape="box" style="rounded"];']
+    for position, (session, *thoughts) in enumerate(by_session.values()):
+        lines.append(f'  subgraph "cluster_{position}" {{')
+        lines.append(f'    label={_quote(session.title)};')
+        lines += ["  " + _node(thought, ' penwidth="2"' if thought.id == thought_id else "") for thought in thoughts]
+        lines.append("  }")
+    lines += _link_edges(app, members, set(members))
+    lines.append("}")
+    return "\n".join(lines) + "\n"
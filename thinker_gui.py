@@ -5,22 +5,113 @@ A visual interface for organizing thoughts and brainstorming
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, scrolledtext
+from tkinter import ttk, messagebox, filedialog, scrolledtext, simpledialog
 import json
 import os
 import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 import uuid
 from dataclasses import dataclass, asdict
 
 # Import the core classes from the main app
-from thinker_app import Thought, ThinkingSession, ThinkerApp
+from thinker_app import (Thought, ThinkingSession, ThinkerApp, create_app, parse_time_bound, parse_when,
+                         QueryError, detached_session)
+from thinker_query import ThoughtFilter, parse_capture
+from thinker_storage import DATA_FILE_TYPES
+from thinker_viewer import MappedWorkspace
+from thinker_watch import DataFileWatcher
+
+FILTER_DEBOUNCE_MS = 150  # wait this long after the last keystroke before filtering
+FRAME_BUDGET = 0.010  # seconds of filtering per event-loop turn, below one 60 Hz frame
+ROW_PAGE = 200  # Treeview rows inserted at a time; more are added as you scroll
+WATCH_INTERVAL_MS = 2000  # how often to check the data file for changes made elsewhere
+PLACEHOLDER = '__placeholder__'  # tag of the dummy child that gives collapsed rows an expand arrow
+REMINDER_MAX_WAIT_MS = 60_000  # re-check the next reminder at least this often (clock changes, sleep)
+
+HEADINGS = {'Status': '✓', 'Content': 'Content', 'Category': 'Category',
+            'Priority': 'Priority', 'Tags': 'Tags', 'Due': 'Due', 'Created': 'Created'}
+
+SORT_KEYS = {
+    'Status': lambda t: t.is_completed,
+    'Content': lambda t: t.content.lower(),
+    'Category': lambda t: t.category.lower(),
+    'Priority': lambda t: t.priority,
+    'Tags': lambda t: ", ".join(t.tags).lower(),
+    'Due': lambda t: (t.due_at is None, t.due_at or ''),
+    'Created': lambda t: t.created_at,
+}
+
+class OperationCancelled(Exception):
+    """Raised inside a background task once its Cancel button has been pressed"""
+
+class BackgroundTask:
+    """One operation running on the GUI's worker pool, polled from the Tk event loop"""
+    
+    def __init__(self, title: str, blocks_edits: bool = False):
+        self.title = title
+        self.blocks_edits = blocks_edits  # edits would be lost (e.g. while another file loads)
+        self.cancelled = threading.Event()
+        self.fraction = 0.0
+        self.future = None
+        self.on_done = None
+    
+    def progress(self, fraction: float):
+        """Record progress from the worker thread, stopping the work once cancelled"""
+        if self.cancelled.is_set():
+            raise OperationCancelled()
+        self.fraction = fraction
+
+class SortKeyCache:
+    """Per-column sort keys for thoughts, recomputed only for thoughts that changed
+    
+    Each entry remembers the thought's updated_at, which every edit bumps.
+    """
+    
+    def __init__(self):
+        self.columns: Dict[str, Dict[str, tuple]] = {column: {} for column in SORT_KEYS}
+    
+    def key(self, column: str, thought: Thought):
+        cache = self.columns[column]
+        entry = cache.get(thought.id)
+        if entry is None or entry[0] != thought.updated_at:
+            entry = cache[thought.id] = (thought.updated_at, SORT_KEYS[column](thought))
+        return entry[1]
+    
+    def clear(self):
+        for cache in self.columns.values():
+            cache.clear()
 
 class ThinkerGUI:
     """GUI wrapper for the ThinkerApp"""
     
     def __init__(self):
-        self.app = ThinkerApp()
+        self.app = create_app()
+        # Load, save and export run here so the window stays responsive; Tk is
+        # only ever touched from the main thread, which polls the task with after()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.task: BackgroundTask = None
+        self.io_buttons = []  # disabled while any task runs
+        self.edit_buttons = []  # also disabled while a task that blocks edits runs
+        # Live filter state: thoughts before filtering, the last completed filter and
+        # its results (to refine from), and the rows the Treeview is showing
+        self.base_thoughts: List[Thought] = []
+        self.last_filter = None
+        self.filter_generation = 0
+        self.filter_after_id = None
+        self.rows: List[Thought] = []  # top-level rows; sub-thoughts are inserted when expanded
+        self.rendered_rows = 0
+        self.row_order: Dict[str, int] = {}  # sorted position of every matched thought
+        self.sorted_rows: List[Thought] = []
+        self.expanded = set()  # IDs of rows to keep open across refreshes
+        # Column sorting: (column, descending) from primary to last, applied to matched
+        self.sort_columns: List[tuple] = []
+        self.sort_keys = SortKeyCache()
+        self.matched: List[Thought] = []
+        self.reminder_after_id = None
+        self.reminder_window = None
         self.root = tk.Tk()
         self.root.title("🧠 Python Thinker App")
         self.root.geometry("1000x700")
@@ -34,6 +125,7 @@ class ThinkerGUI:
         
         self.create_widgets()
         self.refresh_displays()
+        self.start_watching()
     
     def create_widgets(self):
         """Create and layout GUI widgets"""
@@ -59,6 +151,12 @@ class ThinkerGUI:
         
         # Bottom panel - Controls
         self.create_control_panel(main_frame)
+        
+        # Footer - Analytics summary
+        self.create_analytics_panel(main_frame)
+        
+        # Status bar - progress of background tasks (hidden while idle)
+        self.create_status_bar(main_frame)
     
     def create_session_panel(self, parent):
         """Create the session management panel"""
@@ -80,6 +178,7 @@ class ThinkerGUI:
         
         create_btn = ttk.Button(create_frame, text="Create", command=self.create_session)
         create_btn.grid(row=0, column=2, padx=(5, 0))
+        self.edit_buttons.append(create_btn)
         
         # Session list
         self.session_listbox = tk.Listbox(session_frame, height=10)
@@ -95,9 +194,14 @@ class ThinkerGUI:
         session_btn_frame = ttk.Frame(session_frame)
         session_btn_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0))
         
-        ttk.Button(session_btn_frame, text="Export TXT", command=lambda: self.export_session('txt')).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(session_btn_frame, text="Export MD", command=lambda: self.export_session('md')).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(session_btn_frame, text="Delete", command=self.delete_session).pack(side=tk.LEFT)
+        export_txt_btn = ttk.Button(session_btn_frame, text="Export TXT", command=lambda: self.export_session('txt'))
+        export_txt_btn.pack(side=tk.LEFT, padx=(0, 5))
+        export_md_btn = ttk.Button(session_btn_frame, text="Export MD", command=lambda: self.export_session('md'))
+        export_md_btn.pack(side=tk.LEFT, padx=(0, 5))
+        delete_btn = ttk.Button(session_btn_frame, text="Delete", command=self.delete_session)
+        delete_btn.pack(side=tk.LEFT)
+        self.io_buttons += [export_txt_btn, export_md_btn]
+        self.edit_buttons.append(delete_btn)
     
     def create_thoughts_panel(self, parent):
         """Create the thoughts management panel"""
@@ -136,6 +240,7 @@ class ThinkerGUI:
         
         add_btn = ttk.Button(meta_frame, text="Add Thought", command=self.add_thought)
         add_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self.edit_buttons.append(add_btn)
         
         # Thoughts display
         thoughts_display_frame = ttk.Frame(thoughts_frame)
@@ -144,50 +249,458 @@ class ThinkerGUI:
         thoughts_display_frame.rowconfigure(0, weight=1)
         
         # Thoughts treeview
-        columns = ('Status', 'Content', 'Category', 'Priority', 'Tags', 'Created')
-        self.thoughts_tree = ttk.Treeview(thoughts_display_frame, columns=columns, show='headings', height=15)
+        columns = ('Status', 'Content', 'Category', 'Priority', 'Tags', 'Due', 'Created')
+        self.thoughts_tree = ttk.Treeview(thoughts_display_frame, columns=columns, show='tree headings', height=15)
+        self.thoughts_tree.bind('<<TreeviewOpen>>', self.on_thought_open)
+        self.thoughts_tree.bind('<<TreeviewClose>>', self.on_thought_close)
+        # Ctrl/Shift-click selects several rows; the context menu then acts on all of them
+        self.thoughts_tree.bind('<Control-a>', self.select_all_thoughts)
         
         # Configure columns
-        self.thoughts_tree.heading('Status', text='✓')
-        self.thoughts_tree.heading('Content', text='Content')
-        self.thoughts_tree.heading('Category', text='Category')
-        self.thoughts_tree.heading('Priority', text='Priority')
-        self.thoughts_tree.heading('Tags', text='Tags')
-        self.thoughts_tree.heading('Created', text='Created')
+        # Click a heading to sort by it (again to reverse, a third time to reset);
+        # Shift-click adds it as a further sort key
+        for column, text in HEADINGS.items():
+            self.thoughts_tree.heading(column, text=text, command=lambda c=column: self.sort_by(c))
+        self.thoughts_tree.bind('<Shift-Button-1>', self.on_heading_shift_click)
         
+        self.thoughts_tree.column('#0', width=40, minwidth=40, stretch=False)  # expand arrows for sub-thoughts
         self.thoughts_tree.column('Status', width=50, minwidth=50)
         self.thoughts_tree.column('Content', width=300, minwidth=200)
         self.thoughts_tree.column('Category', width=100, minwidth=80)
         self.thoughts_tree.column('Priority', width=80, minwidth=60)
         self.thoughts_tree.column('Tags', width=120, minwidth=100)
+        self.thoughts_tree.column('Due', width=110, minwidth=80)
         self.thoughts_tree.column('Created', width=150, minwidth=120)
         
         self.thoughts_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Thoughts scrollbar
-        thoughts_scrollbar = ttk.Scrollbar(thoughts_display_frame, orient=tk.VERTICAL, command=self.thoughts_tree.yview)
-        thoughts_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.thoughts_tree.configure(yscrollcommand=thoughts_scrollbar.set)
+        self.thoughts_scrollbar = ttk.Scrollbar(thoughts_display_frame, orient=tk.VERTICAL, command=self.thoughts_tree.yview)
+        self.thoughts_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.thoughts_tree.configure(yscrollcommand=self.on_thoughts_scroll)
+        
+        # Date range filter, query bar and live filter
+        self.create_date_filter(thoughts_frame)
+        self.create_query_bar(thoughts_frame)
+        self.create_live_filter(thoughts_frame)
         
         # Thoughts context menu
         self.create_thoughts_context_menu()
     
+    def create_date_filter(self, parent):
+        """Create the date range filter below the thoughts treeview"""
+        filter_frame = ttk.Frame(parent)
+        filter_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.date_field_var = tk.StringVar(value="Created")
+        ttk.Combobox(filter_frame, textvariable=self.date_field_var, values=("Created", "Updated"),
+                     state="readonly", width=8).pack(side=tk.LEFT)
+        
+        ttk.Label(filter_frame, text="From:").pack(side=tk.LEFT, padx=(10, 0))
+        self.date_from_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.date_from_var, width=12).pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Label(filter_frame, text="To:").pack(side=tk.LEFT)
+        self.date_to_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.date_to_var, width=12).pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Button(filter_frame, text="Apply", command=self.refresh_thoughts_display).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(filter_frame, text="Clear", command=self.clear_date_filter).pack(side=tk.LEFT)
+    
+    def create_query_bar(self, parent):
+        """Create the query filter bar below the date filter"""
+        query_frame = ttk.Frame(parent)
+        query_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        query_frame.columnconfigure(1, weight=1)
+        
+        ttk.Label(query_frame, text="Query:").grid(row=0, column=0, sticky=tk.W)
+        self.query_var = tk.StringVar()
+        query_entry = ttk.Entry(query_frame, textvariable=self.query_var)
+        query_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(5, 5))
+        query_entry.bind('<Return>', lambda e: self.refresh_thoughts_display())
+        
+        ttk.Button(query_frame, text="Run", command=self.refresh_thoughts_display).grid(row=0, column=2, padx=(0, 5))
+        ttk.Button(query_frame, text="Explain", command=self.explain_query).grid(row=0, column=3, padx=(0, 5))
+        ttk.Button(query_frame, text="Clear", command=self.clear_query).grid(row=0, column=4)
+    
+    def create_live_filter(self, parent):
+        """Create the live filter bar, which narrows the thoughts shown as you type"""
+        filter_frame = ttk.Frame(parent)
+        filter_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        filter_frame.columnconfigure(1, weight=1)
+        
+        ttk.Label(filter_frame, text="Filter:").grid(row=0, column=0, sticky=tk.W)
+        self.filter_text_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.filter_text_var).grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(5, 10))
+        
+        ttk.Label(filter_frame, text="Category:").grid(row=0, column=2)
+        self.filter_category_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.filter_category_var, width=10).grid(row=0, column=3, padx=(5, 10))
+        
+        ttk.Label(filter_frame, text="Tag:").grid(row=0, column=4)
+        self.filter_tag_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.filter_tag_var, width=10).grid(row=0, column=5, padx=(5, 10))
+        
+        ttk.Label(filter_frame, text="Priority:").grid(row=0, column=6)
+        self.filter_min_var = tk.StringVar(value="1")
+        ttk.Spinbox(filter_frame, from_=1, to=5, textvariable=self.filter_min_var, width=3).grid(row=0, column=7, padx=(5, 0))
+        ttk.Label(filter_frame, text="–").grid(row=0, column=8)
+        self.filter_max_var = tk.StringVar(value="5")
+        ttk.Spinbox(filter_frame, from_=1, to=5, textvariable=self.filter_max_var, width=3).grid(row=0, column=9, padx=(0, 10))
+        
+        self.filter_status_var = tk.StringVar(value="All")
+        ttk.Combobox(filter_frame, textvariable=self.filter_status_var, values=("All", "Open", "Done"),
+                     state='readonly', width=6).grid(row=0, column=10, padx=(0, 10))
+        ttk.Button(filter_frame, text="Clear", command=self.clear_live_filter).grid(row=0, column=11)
+        
+        self.filter_count_var = tk.StringVar()
+        ttk.Label(filter_frame, textvariable=self.filter_count_var).grid(row=1, column=0, columnspan=12, sticky=tk.W)
+        
+        for var in (self.filter_text_var, self.filter_category_var, self.filter_tag_var,
+                    self.filter_min_var, self.filter_max_var, self.filter_status_var):
+            var.trace_add('write', self.schedule_live_filter)
+    
+    def get_live_filter(self) -> ThoughtFilter:
+        """Read the live filter bar (an unfinished priority bound is ignored)"""
+        def bound(var, default):
+            value = var.get().strip()
+            return int(value) if value.isdigit() else default
+        
+        status = self.filter_status_var.get()
+        return ThoughtFilter(
+            text=self.filter_text_var.get(),
+            category=self.filter_category_var.get(),
+            tag=self.filter_tag_var.get(),
+            min_priority=bound(self.filter_min_var, 1),
+            max_priority=bound(self.filter_max_var, 5),
+            done=None if status == "All" else status == "Done",
+        )
+    
+    def clear_live_filter(self):
+        """Reset the live filter bar"""
+        for var in (self.filter_text_var, self.filter_category_var, self.filter_tag_var):
+            var.set("")
+        self.filter_min_var.set("1")
+        self.filter_max_var.set("5")
+        self.filter_status_var.set("All")
+    
+    def schedule_live_filter(self, *args):
+        """Debounce filter edits: only the last change in a burst of typing runs"""
+        if self.filter_after_id:
+            self.root.after_cancel(self.filter_after_id)
+        self.filter_after_id = self.root.after(FILTER_DEBOUNCE_MS, self.apply_live_filter)
+    
+    def apply_live_filter(self):
+        """Filter the current thoughts, starting from the last results when the filter only narrowed"""
+        if self.filter_after_id:
+            self.root.after_cancel(self.filter_after_id)
+            self.filter_after_id = None
+        self.filter_generation += 1  # any filtering still in progress is now stale
+        live = self.get_live_filter()
+        if live.is_empty():
+            self.last_filter = (live, self.base_thoughts)
+            self.show_rows(self.base_thoughts)
+            return
+        
+        source = self.base_thoughts
+        if self.last_filter and live.refines(self.last_filter[0]):
+            source = self.last_filter[1]
+        self._filter_slice(self.filter_generation, live, source, 0, [])
+    
+    def _filter_slice(self, generation: int, live: ThoughtFilter, source: List[Thought], start: int,
+                      matches: List[Thought]):
+        """Filter for at most one frame budget, then yield to the event loop and continue"""
+        if generation != self.filter_generation:
+            return
+        deadline = time.perf_counter() + FRAME_BUDGET
+        position = start
+        while position < len(source) and time.perf_counter() < deadline:
+            chunk = source[position:position + 2000]
+            matches.extend(thought for thought in chunk if live.matches(thought))
+            position += len(chunk)
+        if position < len(source):
+            self.root.after(1, self._filter_slice, generation, live, source, position, matches)
+            return
+        self.last_filter = (live, matches)
+        self.show_rows(matches)
+    
+    def show_rows(self, thoughts: List[Thought]):
+        """Show thoughts in the Treeview in sort order, inserting only the first page of rows"""
+        self.matched = thoughts
+        rows = thoughts
+        if self.sort_columns:
+            # One stable sort per key, last key first; ties keep the default order
+            rows = list(thoughts)
+            for column, descending in reversed(self.sort_columns):
+                rows.sort(key=lambda t, c=column: self.sort_keys.key(c, t), reverse=descending)
+        self.thoughts_tree.delete(*self.thoughts_tree.get_children())
+        # Sub-thoughts whose parent is also shown appear under it; the rest are top-level rows
+        self.sorted_rows = rows
+        self.row_order = {thought.id: position for position, thought in enumerate(rows)}
+        self.rows = [thought for thought in rows if thought.parent_id not in self.row_order]
+        self.rendered_rows = 0
+        self.render_more_rows()
+    
+    def sort_by(self, column: str, add: bool = False):
+        """Sort by a column: ascending, then descending, then back to the default order"""
+        current = dict(self.sort_columns)
+        if column not in current:
+            state = False
+        elif not current[column]:
+            state = True
+        else:
+            state = None
+        
+        if add:
+            columns = [(c, d) for c, d in self.sort_columns if c != column]
+            if state is not None:
+                position = [c for c, _ in self.sort_columns].index(column) if column in current else len(columns)
+                columns.insert(position, (column, state))
+        else:
+            columns = [] if state is None else [(column, state)]
+        self.sort_columns = columns
+        
+        for name, text in HEADINGS.items():
+            marker = ""
+            for rank, (sorted_column, descending) in enumerate(self.sort_columns, 1):
+                if sorted_column == name:
+                    marker = (" ▼" if descending else " ▲") + (str(rank) if len(self.sort_columns) > 1 else "")
+            self.thoughts_tree.heading(name, text=text + marker)
+        self.show_rows(self.matched)
+    
+    def on_heading_shift_click(self, event):
+        """Shift-click on a heading adds that column as a further sort key"""
+        if self.thoughts_tree.identify_region(event.x, event.y) != 'heading':
+            return
+        column_index = int(self.thoughts_tree.identify_column(event.x)[1:]) - 1
+        if column_index < 0:
+            return  # the expand-arrow column
+        self.sort_by(list(HEADINGS)[column_index], add=True)
+        return 'break'
+    
+    def render_more_rows(self):
+        """Insert the next page of rows"""
+        for thought in self.rows[self.rendered_rows:self.rendered_rows + ROW_PAGE]:
+            self.insert_thought_row('', thought)
+        self.rendered_rows = min(len(self.rows), self.rendered_rows + ROW_PAGE)
+        
+        total = len(self.base_thoughts)
+        matched = len(self.sorted_rows)
+        shown = f"{matched} of {total} thoughts" if matched != total else f"{total} thoughts"
+        self.filter_count_var.set(shown)
+    
+    def shown_children(self, thought) -> List[Thought]:
+        """A thought's sub-thoughts that are among the matched rows, in sort order"""
+        positions = [self.row_order[child_id] for child_id in self.app.hierarchy.child_ids(thought.id)
+                     if child_id in self.row_order]
+        return [self.sorted_rows[position] for position in sorted(positions)]
+    
+    def insert_thought_row(self, parent_item: str, thought) -> str:
+        """Insert a row; one with sub-thoughts gets a placeholder child until it is expanded"""
+        item = self.thoughts_tree.insert(parent_item, tk.END, values=self.thought_row_values(thought),
+                                         tags=(thought.id,))  # Store ID in tags for reference
+        if thought.id in self.expanded and self.shown_children(thought):
+            self.expand_thought_row(item, thought)
+        elif any(child_id in self.row_order for child_id in self.app.hierarchy.child_ids(thought.id)):
+            self.thoughts_tree.insert(item, tk.END, tags=(PLACEHOLDER,))
+        return item
+    
+    def expand_thought_row(self, item: str, thought):
+        """Replace a row's placeholder with its sub-thought rows and open it"""
+        self.thoughts_tree.delete(*self.thoughts_tree.get_children(item))
+        for child in self.shown_children(thought):
+            self.insert_thought_row(item, child)
+        self.thoughts_tree.item(item, open=True)
+    
+    def on_thought_open(self, event):
+        """Insert a row's sub-thoughts the first time it is expanded"""
+        item = self.thoughts_tree.focus()
+        thought_id = str(self.thoughts_tree.item(item, 'tags')[0])
+        self.expanded.add(thought_id)
+        children = self.thoughts_tree.get_children(item)
+        if children and PLACEHOLDER in self.thoughts_tree.item(children[0], 'tags'):
+            found = self.app.find_thought(thought_id)
+            if found:
+                self.expand_thought_row(item, found[1])
+    
+    def on_thought_close(self, event):
+        """Forget that a row was expanded"""
+        self.expanded.discard(str(self.thoughts_tree.item(self.thoughts_tree.focus(), 'tags')[0]))
+    
+    def iter_tree_items(self, parent_item: str = ''):
+        """Every inserted row, parents before their sub-thoughts (placeholders excluded)"""
+        stack = list(reversed(self.thoughts_tree.get_children(parent_item)))
+        while stack:
+            item = stack.pop()
+            if PLACEHOLDER in self.thoughts_tree.item(item, 'tags'):
+                continue
+            yield item
+            stack.extend(reversed(self.thoughts_tree.get_children(item)))
+    
+    def thought_row_values(self, thought) -> tuple:
+        """The Treeview column values for a thought"""
+        status = "✅" if thought.is_completed else "⭕"
+        done, total = self.app.hierarchy.progress(thought)
+        if total:
+            status += f" {done}/{total}"  # completion across all sub-thoughts
+        priority_stars = "⭐" * thought.priority
+        tags_str = ", ".join(thought.tags)
+        due_str = (thought.due_at or "")[:16].replace('T', ' ')
+        created_str = thought.created_at[:19]
+        
+        # Truncate long content for display
+        content_display = thought.content[:80] + "..." if len(thought.content) > 80 else thought.content
+        if thought.parent_id:
+            content_display = "↳ " + content_display
+        return (status, content_display, thought.category, priority_stars, tags_str, due_str, created_str)
+    
+    def on_thoughts_scroll(self, first, last):
+        """Keep the scrollbar in step and add rows as the end of the list comes into view"""
+        self.thoughts_scrollbar.set(first, last)
+        if float(last) > 0.9 and self.rendered_rows < len(self.rows):
+            self.root.after_idle(self.render_more_rows)
+    
+    def clear_query(self):
+        """Reset the query bar"""
+        self.query_var.set("")
+        self.refresh_thoughts_display()
+    
+    def explain_query(self):
+        """Show the plan chosen for the current query"""
+        text = self.query_var.get().strip()
+        if not text:
+            messagebox.showwarning("Warning", "Please enter a query")
+            return
+        
+        try:
+            plan, thoughts = self.app.query_thoughts(text, session_only=True)
+        except QueryError as e:
+            messagebox.showerror("Invalid Query", str(e))
+            return
+        messagebox.showinfo("Query Plan", f"{plan.explain()}\n  rows:    {len(thoughts)}")
+    
+    def clear_date_filter(self):
+        """Reset the date range filter"""
+        self.date_from_var.set("")
+        self.date_to_var.set("")
+        self.refresh_thoughts_display()
+    
+    def get_date_range(self):
+        """Return (field, start, end) from the date filter, or None when it is empty"""
+        start_text = self.date_from_var.get().strip()
+        end_text = self.date_to_var.get().strip()
+        if not start_text and not end_text:
+            return None
+        
+        try:
+            start = parse_time_bound(start_text) if start_text else None
+            end = parse_time_bound(end_text, end=True) if end_text else None
+        except ValueError:
+            messagebox.showwarning("Warning", "Dates must be YYYY-MM-DD, 'today' or 'yesterday'")
+            return None
+        return self.date_field_var.get().lower(), start, end
+    
     def create_control_panel(self, parent):
         """Create the control panel"""
         control_frame = ttk.Frame(parent)
         control_frame.grid(row=3, column=0, columnspan=3, pady=(20, 0))
         
-        ttk.Button(control_frame, text="🧠 Brainstorm Mode", command=self.brainstorm_mode).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(control_frame, text="💾 Save Data", command=self.save_data).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(control_frame, text="📁 Load Data", command=self.load_data).pack(side=tk.LEFT, padx=(0, 10))
+        brainstorm_btn = ttk.Button(control_frame, text="🧠 Brainstorm Mode", command=self.brainstorm_mode)
+        brainstorm_btn.pack(side=tk.LEFT, padx=(0, 10))
+        save_btn = ttk.Button(control_frame, text="💾 Save Data", command=self.save_data)
+        save_btn.pack(side=tk.LEFT, padx=(0, 10))
+        load_btn = ttk.Button(control_frame, text="📁 Load Data", command=self.load_data)
+        load_btn.pack(side=tk.LEFT, padx=(0, 10))
+        archive_btn = ttk.Button(control_frame, text="🗄️ Archive Old", command=self.archive_old)
+        archive_btn.pack(side=tk.LEFT, padx=(0, 10))
+        view_btn = ttk.Button(control_frame, text="👀 View File", command=self.view_file)
+        view_btn.pack(side=tk.LEFT, padx=(0, 10))
+        self.io_buttons += [save_btn, load_btn, archive_btn, view_btn]
+        self.edit_buttons.append(brainstorm_btn)
         ttk.Button(control_frame, text="❓ Help", command=self.show_help).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(control_frame, text="🚪 Exit", command=self.exit_app).pack(side=tk.RIGHT)
     
+    def create_analytics_panel(self, parent):
+        """Create the workspace analytics summary panel"""
+        analytics_frame = ttk.LabelFrame(parent, text="📊 Analytics", padding="5")
+        analytics_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.analytics_var = tk.StringVar()
+        ttk.Label(analytics_frame, textvariable=self.analytics_var).pack(anchor=tk.W)
+    
+    def create_status_bar(self, parent):
+        """Create the progress bar and Cancel button shown while a background task runs"""
+        self.status_frame = ttk.Frame(parent)
+        self.status_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(5, 0))
+        self.status_frame.columnconfigure(1, weight=1)
+        
+        self.status_var = tk.StringVar()
+        ttk.Label(self.status_frame, textvariable=self.status_var).grid(row=0, column=0, sticky=tk.W)
+        self.progress_bar = ttk.Progressbar(self.status_frame, maximum=1.0)
+        self.progress_bar.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=10)
+        ttk.Button(self.status_frame, text="Cancel", command=self.cancel_task).grid(row=0, column=2)
+        self.status_frame.grid_remove()
+    
+    def run_task(self, title: str, work, on_done, blocks_edits: bool = False):
+        """Run work(progress) on the worker pool and call on_done(result, error) on the Tk thread"""
+        if self.task:
+            messagebox.showwarning("Busy", f"Please wait: {self.task.title}")
+            return
+        
+        task = BackgroundTask(title, blocks_edits)
+        task.on_done = on_done
+        task.future = self.executor.submit(work, task.progress)
+        self.task = task
+        self.set_busy(True)
+        self.status_var.set(f"{title}...")
+        self.progress_bar['value'] = 0
+        self.status_frame.grid()
+        self.root.after(100, self._poll_task, task)
+    
+    def _poll_task(self, task: BackgroundTask):
+        """Update the progress bar until the task finishes"""
+        if self.task is not task:
+            return
+        self.progress_bar['value'] = task.fraction
+        if task.future.done():
+            self._finish_task(task)
+        else:
+            self.root.after(100, self._poll_task, task)
+    
+    def _finish_task(self, task: BackgroundTask):
+        """Hand a finished task's result (or error) back to its caller"""
+        self.task = None
+        self.status_frame.grid_remove()
+        self.set_busy(False)
+        error = task.future.exception()
+        task.on_done(None if error else task.future.result(), error)
+    
+    def cancel_task(self):
+        """Ask the running task to stop at its next progress report"""
+        if self.task:
+            self.task.cancelled.set()
+            self.status_var.set(f"Cancelling: {self.task.title}...")
+    
+    def set_busy(self, busy: bool):
+        """Disable actions that conflict with the running task"""
+        blocks_edits = busy and self.task is not None and self.task.blocks_edits
+        for button in self.io_buttons:
+            button.state(['disabled'] if busy else ['!disabled'])
+        for button in self.edit_buttons:
+            button.state(['disabled'] if blocks_edits else ['!disabled'])
+    
     def create_thoughts_context_menu(self):
         """Create context menu for thoughts"""
         self.thoughts_menu = tk.Menu(self.root, tearoff=0)
         self.thoughts_menu.add_command(label="Complete", command=self.complete_thought)
         self.thoughts_menu.add_command(label="Edit", command=self.edit_thought)
+        self.thoughts_menu.add_command(label="Add Sub-thought...", command=self.add_sub_thought)
+        self.thoughts_menu.add_separator()
+        self.thoughts_menu.add_command(label="Set Priority...", command=lambda: self.bulk_action('priority'))
+        self.thoughts_menu.add_command(label="Set Category...", command=lambda: self.bulk_action('category'))
+        self.thoughts_menu.add_command(label="Tags...", command=lambda: self.bulk_action('tag'))
+        self.thoughts_menu.add_command(label="Move to Session...", command=lambda: self.bulk_action('move'))
+        self.thoughts_menu.add_separator()
         self.thoughts_menu.add_command(label="Delete", command=self.delete_thought)
         
         self.thoughts_tree.bind("<Button-3>", self.show_thoughts_context_menu)
@@ -195,7 +708,7 @@ class ThinkerGUI:
     def show_thoughts_context_menu(self, event):
         """Show context menu for thoughts"""
         item = self.thoughts_tree.selection()[0] if self.thoughts_tree.selection() else None
-        if item:
+        if item and not (self.task and self.task.blocks_edits):
             try:
                 self.thoughts_menu.tk_popup(event.x_root, event.y_root)
             finally:
@@ -240,18 +753,93 @@ class ThinkerGUI:
         
         self.refresh_thoughts_display()
     
-    def complete_thought(self):
-        """Mark selected thought as completed"""
+    def add_sub_thought(self):
+        """Add a sub-thought under the selected thought, using the category, priority and tags fields"""
         selection = self.thoughts_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select a thought")
             return
         
-        item = selection[0]
-        thought_id = self.thoughts_tree.item(item)['tags'][0]  # Store ID in tags
-        self.app.complete_thought(thought_id)
+        parent_id = str(self.thoughts_tree.item(selection[0])['tags'][0])
+        content = simpledialog.askstring("Add Sub-thought", "Sub-thought:", parent=self.root)
+        if not content or not content.strip():
+            return
+        category = self.category_var.get().strip() or "general"
+        tags = [tag.strip() for tag in self.tags_var.get().split(',') if tag.strip()]
+        self.app.add_thought(content.strip(), category, self.priority_var.get(), tags, parent_id=parent_id)
+        self.expanded.add(parent_id)
         self.refresh_thoughts_display()
     
+    def selected_thought_ids(self) -> List[str]:
+        """IDs of the selected thought rows, in display order"""
+        ids = []
+        for item in self.thoughts_tree.selection():
+            tags = self.thoughts_tree.item(item, 'tags')
+            if tags and tags[0] != PLACEHOLDER:
+                ids.append(str(tags[0]))  # Store ID in tags
+        return ids
+    
+    def select_all_thoughts(self, event=None):
+        """Select every row shown (expanded sub-thoughts included)"""
+        items = []
+        pending = list(self.thoughts_tree.get_children())
+        while pending:
+            item = pending.pop(0)
+            if PLACEHOLDER not in self.thoughts_tree.item(item, 'tags'):
+                items.append(item)
+                pending[:0] = self.thoughts_tree.get_children(item)
+        self.thoughts_tree.selection_set(items)
+        return 'break'
+    
+    def complete_thought(self):
+        """Mark the selected thoughts as completed"""
+        thought_ids = self.selected_thought_ids()
+        if not thought_ids:
+            messagebox.showwarning("Warning", "Please select a thought")
+            return
+        
+        if len(thought_ids) == 1:
+            self.app.complete_thought(thought_ids[0])
+        else:
+            self.app.bulk_apply(thought_ids, 'complete', save=False)
+        self.refresh_thoughts_display()
+    
+    def bulk_action(self, action: str):
+        """Ask for a priority, category, tag changes or target session and apply it to the selected thoughts"""
+        thought_ids = self.selected_thought_ids()
+        if not thought_ids:
+            messagebox.showwarning("Warning", "Please select a thought")
+            return
+        
+        count = f"{len(thought_ids)} thought{'s' if len(thought_ids) != 1 else ''}"
+        if action == 'priority':
+            value = simpledialog.askinteger("Set Priority", f"Priority (1-5) for {count}:",
+                                            minvalue=1, maxvalue=5, parent=self.root)
+        elif action == 'category':
+            value = simpledialog.askstring("Set Category", f"Category for {count}:", parent=self.root)
+            value = value.strip() if value else None
+        elif action == 'tag':
+            text = simpledialog.askstring("Tags", f"Tags to add (+tag) or remove (-tag) on {count}:",
+                                          parent=self.root)
+            changes = [word for word in (text or "").split() if len(word) > 1 and word[0] in '+-']
+            value = ([c[1:] for c in changes if c[0] == '+'], [c[1:] for c in changes if c[0] == '-'])
+            if not changes:
+                value = None
+        else:
+            value = simpledialog.askstring("Move to Session", f"Move {count} to session (ID or prefix):",
+                                           parent=self.root)
+            value = value.strip() if value else None
+        if not value:
+            return
+        
+        if self.app.bulk_apply(thought_ids, action, value, save=False) is None:
+            messagebox.showwarning("Warning", f"No session matches '{value}'")
+            return
+        if action == 'move':
+            self.refresh_displays()  # session thought counts changed too
+        else:
+            self.refresh_thoughts_display()
+    
     def edit_thought(self):
         """Edit selected thought"""
         selection = self.thoughts_tree.selection()
@@ -264,15 +852,10 @@ class ThinkerGUI:
         thought_id = self.thoughts_tree.item(item)['tags'][0]
         
         # Find the thought
-        thought = None
-        if self.app.current_session:
-            for t in self.app.current_session.thoughts:
-                if t.id == thought_id:
-                    thought = t
-                    break
-        
-        if not thought:
+        found = self.app.find_thought(thought_id)
+        if not found:
             return
+        thought = found[1]
         
         # Create edit dialog
         self.create_edit_dialog(thought)
@@ -307,19 +890,37 @@ class ThinkerGUI:
         tags_var = tk.StringVar(value=', '.join(thought.tags))
         ttk.Entry(meta_frame, textvariable=tags_var, width=40).grid(row=1, column=1, columnspan=3, sticky=(tk.W, tk.E), padx=(5, 0), pady=(5, 0))
         
+        # Due date and reminder accept the same forms as the CLI: friday, +2h, 2026-11-01, ...
+        ttk.Label(meta_frame, text="Due:").grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        due_var = tk.StringVar(value=thought.due_at or "")
+        ttk.Entry(meta_frame, textvariable=due_var).grid(row=2, column=1, padx=(5, 20), pady=(5, 0))
+        
+        ttk.Label(meta_frame, text="Remind:").grid(row=2, column=2, sticky=tk.W, pady=(5, 0))
+        remind_var = tk.StringVar(value=thought.remind_at or "")
+        ttk.Entry(meta_frame, textvariable=remind_var, width=20).grid(row=2, column=3, padx=(5, 0), pady=(5, 0))
+        
         # Buttons
         btn_frame = ttk.Frame(dialog)
         btn_frame.pack(pady=10)
         
         def save_changes():
-            thought.content = content_text.get(1.0, tk.END).strip()
-            thought.category = category_var.get().strip() or "general"
-            thought.priority = priority_var.get()
-            thought.tags = [tag.strip() for tag in tags_var.get().split(',') if tag.strip()]
-            thought.updated_at = datetime.datetime.now().isoformat()
-            
-            if self.app.current_session:
-                self.app.current_session.updated_at = thought.updated_at
+            try:
+                due_text, remind_text = due_var.get().strip(), remind_var.get().strip()
+                due_at = parse_when(due_text) if due_text else ""
+                remind_at = parse_when(remind_text, default_time="09:00") if remind_text else ""
+            except ValueError:
+                messagebox.showerror("Invalid Date", "Use today, tomorrow, a weekday, +2h, +3d, "
+                                     "YYYY-MM-DD or YYYY-MM-DDTHH:MM", parent=dialog)
+                return
+            self.app.edit_thought(
+                thought.id,
+                content=content_text.get(1.0, tk.END).strip(),
+                category=category_var.get().strip() or "general",
+                priority=priority_var.get(),
+                tags=[tag.strip() for tag in tags_var.get().split(',') if tag.strip()],
+                due_at=due_at,
+                remind_at=remind_at
+            )
             
             self.refresh_thoughts_display()
             dialog.destroy()
@@ -328,16 +929,18 @@ class ThinkerGUI:
         ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
     
     def delete_thought(self):
-        """Delete selected thought"""
-        selection = self.thoughts_tree.selection()
-        if not selection:
+        """Delete the selected thoughts"""
+        thought_ids = self.selected_thought_ids()
+        if not thought_ids:
             messagebox.showwarning("Warning", "Please select a thought")
             return
         
-        if messagebox.askyesno("Confirm", "Are you sure you want to delete this thought?"):
-            item = selection[0]
-            thought_id = self.thoughts_tree.item(item)['tags'][0]
-            self.app.delete_thought(thought_id)
+        if len(thought_ids) == 1:
+            if messagebox.askyesno("Confirm", "Are you sure you want to delete this thought?"):
+                self.app.delete_thought(thought_ids[0])
+                self.refresh_thoughts_display()
+        elif messagebox.askyesno("Confirm", f"Are you sure you want to delete these {len(thought_ids)} thoughts?"):
+            self.app.bulk_apply(thought_ids, 'delete', save=False)
             self.refresh_thoughts_display()
     
     def delete_session(self):
@@ -351,11 +954,7 @@ class ThinkerGUI:
             session_info = self.session_listbox.get(selection[0])
             session_id = session_info.split('(')[1].split(')')[0]
             
-            # Find and remove session
-            self.app.sessions = [s for s in self.app.sessions if s.id != session_id]
-            if self.app.current_session and self.app.current_session.id == session_id:
-                self.app.current_session = None
-            
+            self.app.delete_session(session_id)
             self.refresh_displays()
     
     def export_session(self, format_type):
@@ -370,14 +969,21 @@ class ThinkerGUI:
         )
         
         if filename:
-            try:
-                if format_type == "txt":
-                    self.app._export_to_txt(self.app.current_session, filename)
+            # The copy is what gets exported, so edits made meanwhile can't tear the file
+            session = detached_session(self.app.current_session)
+            version = self.app.session_version(self.app.current_session)
+            writer = self.app._export_to_txt if format_type == "txt" else self.app._export_to_markdown
+            
+            def done(result, error):
+                if isinstance(error, OperationCancelled):
+                    if os.path.exists(filename):
+                        os.remove(filename)
+                elif error:
+                    messagebox.showerror("Error", f"Failed to export session: {error}")
                 else:
-                    self.app._export_to_markdown(self.app.current_session, filename)
-                messagebox.showinfo("Success", f"Session exported to {filename}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export session: {e}")
+                    messagebox.showinfo("Success", f"Session exported to {filename}")
+            
+            self.run_task(f"Exporting '{session.title}'", lambda progress: writer(session, filename, progress, version), done)
     
     def brainstorm_mode(self):
         """Open brainstorming mode window"""
@@ -388,21 +994,84 @@ class ThinkerGUI:
         BrainstormWindow(self.root, self.app, self.refresh_thoughts_display)
     
     def save_data(self):
-        """Save data to file"""
-        self.app.save_data()
-        messagebox.showinfo("Success", "Data saved successfully!")
+        """Save data to file in the background"""
+        ready = self.app.check_save()
+        if ready is not None:
+            if ready:
+                messagebox.showinfo("Success", "No changes to save")
+            else:
+                messagebox.showerror("Error", f"Could not save {self.app.data_file}; see the console for details")
+            return
+        
+        app = self.app
+        snapshot = app.snapshot_for_save()
+        
+        def done(encoded, error):
+            if error:
+                app.abort_save(snapshot)
+                if not isinstance(error, OperationCancelled):
+                    messagebox.showerror("Error", f"Failed to save data: {error}")
+            elif app.finish_save(snapshot, encoded):
+                messagebox.showinfo("Success", "Data saved successfully!")
+        
+        self.run_task(f"Saving {os.path.basename(snapshot.data_file)}", snapshot.write, done)
     
     def load_data(self):
         """Load data from file"""
         filename = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=DATA_FILE_TYPES
         )
         
         if filename:
-            self.app.data_file = filename
-            self.app.load_data()
-            self.refresh_displays()
-            messagebox.showinfo("Success", "Data loaded successfully!")
+            compact = self.app.compact
+            
+            def done(app, error):
+                if isinstance(error, OperationCancelled):
+                    return
+                if error:
+                    messagebox.showerror("Error", f"Failed to load data: {error}")
+                    return
+                # The new workspace was built off to the side and only now replaces the old one
+                self.app = app
+                self.sort_keys.clear()
+                self.refresh_displays()
+                if app.load_error:
+                    messagebox.showerror("Error", f"Could not read {filename}: {app.load_error}")
+                else:
+                    messagebox.showinfo("Success", "Data loaded successfully!")
+            
+            export_cache = self.app.render_cache.directory
+            budget = self.app.session_cache.budget
+            self.run_task(f"Loading {os.path.basename(filename)}",
+                          lambda progress: ThinkerApp(filename, compact=compact, progress=progress,
+                                                      export_cache=export_cache, memory_budget=budget),
+                          done, blocks_edits=True)
+    
+    def view_file(self):
+        """Open a (possibly huge) data file read-only without loading it"""
+        filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not filename:
+            return
+        
+        def done(workspace, error):
+            if isinstance(error, OperationCancelled):
+                return
+            if error:
+                messagebox.showerror("Error", f"Cannot view {filename}: {error}")
+                return
+            ViewerWindow(self.root, workspace)
+        
+        self.run_task(f"Indexing {os.path.basename(filename)}",
+                      lambda progress: MappedWorkspace(filename, progress), done)
+    
+    def archive_old(self):
+        """Move dormant sessions and old completed thoughts to the archive file"""
+        days = simpledialog.askinteger("Archive", "Archive sessions and completed thoughts idle for how many days?",
+                                       initialvalue=90, minvalue=0, parent=self.root)
+        if days is None:
+            return
+        self.app.archive_old(days)
+        self.refresh_displays()
     
     def show_help(self):
         """Show help dialog"""
@@ -413,10 +1082,15 @@ class ThinkerGUI:
 • Create new thinking sessions to organize your thoughts by topic
 • Select a session to view and manage its thoughts
 • Export sessions to TXT or Markdown format
+• Archive Old moves idle sessions and old completed thoughts out of the way
 
 💭 Thoughts:
 • Add thoughts with categories, priorities (1-5), and tags
 • Right-click on thoughts to complete, edit, or delete them
+• Right-click > Add Sub-thought nests ideas; expand a row to see its sub-thoughts
+  and the ✓ column shows how many of them are done
+• Edit a thought to give it a due date or a reminder (friday, +2h, 2026-11-01);
+  reminders pop up while the app is open
 • Use categories to group related thoughts
 • Set priorities to focus on important ideas
 
@@ -447,9 +1121,97 @@ class ThinkerGUI:
         text_widget.insert(1.0, help_text)
         text_widget.configure(state='disabled')
     
+    def start_watching(self):
+        """Watch the data file for changes made by other programs"""
+        self.watcher = DataFileWatcher(self.app)
+        self.watch_future = None
+        self.executor.submit(self.watcher.baseline)
+        self.root.after(WATCH_INTERVAL_MS, self.watch_data_file)
+    
+    def watch_data_file(self):
+        """Scan the data file on the worker when it changed, then apply what changed"""
+        future = self.watch_future
+        if future is None:
+            if self.task is None and self.watcher.app is self.app and self.watcher.check():
+                self.watch_future = self.executor.submit(self.watcher.scan)
+        elif future.done():
+            self.watch_future = None
+            # Drop the scan if a save or load started meanwhile; the next check sees the result
+            if future.exception() is None and self.task is None and self.watcher.app is self.app:
+                self.apply_external_changes(future.result())
+        if self.watcher.app is not self.app and future is None:
+            self.watcher = DataFileWatcher(self.app)
+            self.executor.submit(self.watcher.baseline)
+        self.root.after(100 if self.watch_future else WATCH_INTERVAL_MS, self.watch_data_file)
+    
+    def apply_external_changes(self, changes):
+        """Merge sessions changed on disk and update only their rows"""
+        old_positions = {session.id: i for i, session in enumerate(self.app.sessions)}
+        result = self.app.apply_external_changes(changes)
+        self.watcher.accept(changes)
+        if not (result['updated'] or result['added'] or result['removed']):
+            return
+        
+        for position in sorted((old_positions[sid] for sid in result['removed']), reverse=True):
+            self.session_listbox.delete(position)
+        positions = {session.id: i for i, session in enumerate(self.app.sessions)}
+        for session_id in result['updated']:
+            position = positions[session_id]
+            self.session_listbox.delete(position)
+            self.session_listbox.insert(position, self.session_row_text(self.app.sessions[position]))
+        for session_id in result['added']:
+            self.session_listbox.insert(tk.END, self.session_row_text(self.app.session_map[session_id]))
+        
+        self.refresh_analytics_display()
+        self.schedule_reminders()
+        session = self.app.current_session
+        if session is None or session.id in result['added']:
+            self.refresh_thoughts_display()
+        elif session.id in result['updated']:
+            self.update_thought_rows(session, result['thoughts'])
+        if result['skipped']:
+            messagebox.showwarning("Changed Elsewhere", "Another program changed sessions you have unsaved "
+                                   "edits in; saving will keep your version of:\n" + "\n".join(result['skipped']))
+    
+    def update_thought_rows(self, session, changed_ids):
+        """Update, remove or (by re-filtering) add the rows of thoughts changed on disk"""
+        current = {thought.id: thought for thought in session.thoughts}
+        shown = {thought.id for thought in self.base_thoughts}
+        if any(thought_id in current and thought_id not in shown for thought_id in changed_ids):
+            self.refresh_thoughts_display()  # new thoughts need the query, filter and sort applied
+            return
+        # Rows of sub-thoughts (before or after the change) sit in a hierarchy that may have moved
+        hierarchy = self.app.hierarchy
+        before = [thought for thought in self.sorted_rows if thought.id in changed_ids]
+        after = [current[thought_id] for thought_id in changed_ids if thought_id in current]
+        if any(t.parent_id or hierarchy.child_ids(t.id) for t in before + after):
+            self.refresh_thoughts_display()
+            return
+        
+        removed = {thought_id for thought_id in changed_ids if thought_id not in current}
+        rendered = self.rows[:self.rendered_rows]
+        self.rendered_rows -= sum(thought.id in removed for thought in rendered)
+        for name in ('base_thoughts', 'matched', 'rows', 'sorted_rows'):
+            setattr(self, name, [current[t.id] for t in getattr(self, name) if t.id not in removed])
+        self.row_order = {thought.id: position for position, thought in enumerate(self.sorted_rows)}
+        self.last_filter = None
+        for item in list(self.iter_tree_items()):
+            thought_id = str(self.thoughts_tree.item(item, 'tags')[0])
+            if thought_id in removed:
+                self.thoughts_tree.delete(item)
+            elif thought_id in changed_ids:
+                self.thoughts_tree.item(item, values=self.thought_row_values(current[thought_id]))
+    
     def exit_app(self):
         """Exit the application"""
-        if messagebox.askyesno("Exit", "Save data before exiting?"):
+        if self.task:
+            # Stop the running task; an interrupted save leaves the old file intact
+            task = self.task
+            task.cancelled.set()
+            task.future.exception()  # waits for the worker to stop
+            self._finish_task(task)
+        self.executor.shutdown(wait=True)
+        if self.app.is_dirty() and messagebox.askyesno("Exit", "Save data before exiting?"):
             self.app.save_data()
         self.root.destroy()
     
@@ -458,51 +1220,206 @@ class ThinkerGUI:
         self.refresh_sessions_display()
         self.refresh_thoughts_display()
     
+    def session_row_text(self, session) -> str:
+        """The sessions listbox line for a session"""
+        thought_count, completed_count = self.app.analytics.session_counts(session.id)
+        status = "🟢" if session == self.app.current_session else "⚪"
+        return f"{status} {session.title} ({session.id}) - {thought_count} thoughts ({completed_count} done)"
+    
     def refresh_sessions_display(self):
         """Refresh the sessions listbox"""
         self.session_listbox.delete(0, tk.END)
         for session in self.app.sessions:
-            thought_count = len(session.thoughts)
-            completed_count = len([t for t in session.thoughts if t.is_completed])
-            status = "🟢" if session == self.app.current_session else "⚪"
-            display_text = f"{status} {session.title} ({session.id}) - {thought_count} thoughts ({completed_count} done)"
-            self.session_listbox.insert(tk.END, display_text)
+            self.session_listbox.insert(tk.END, self.session_row_text(session))
+    
+    def refresh_analytics_display(self):
+        """Refresh the analytics summary from the maintained aggregates"""
+        stats = self.app.analytics
+        top_categories = ", ".join(f"{c} {n}" for c, n in stats.by_category.most_common(3))
+        latest_week = max(stats.by_week) if stats.by_week else None
+        this_week = f" | {latest_week}: {stats.by_week[latest_week]} new" if latest_week else ""
+        self.analytics_var.set(
+            f"{stats.total} thoughts | {stats.completed} done ({stats.completion_rate():.0%})"
+            f" | Top: {top_categories or '-'}{this_week}"
+        )
+    
+    def schedule_reminders(self):
+        """Wake the event loop when the next reminder is due, instead of polling every thought"""
+        if self.reminder_after_id:
+            self.root.after_cancel(self.reminder_after_id)
+            self.reminder_after_id = None
+        upcoming = self.app.reminders.next()
+        if upcoming is None:
+            return
+        try:
+            wait = datetime.datetime.fromisoformat(upcoming[0]) - datetime.datetime.now()
+            delay = int(min(max(wait.total_seconds(), 0) * 1000, REMINDER_MAX_WAIT_MS))
+        except ValueError:
+            delay = 0  # unparseable times (hand-edited files) fire straight away
+        self.reminder_after_id = self.root.after(delay, self.fire_reminders)
+    
+    def fire_reminders(self):
+        """Show the reminders that have come due and schedule the next one"""
+        self.reminder_after_id = None
+        fired = self.app.pop_due_reminders()
+        if fired:
+            self.show_reminders(fired)
+            session = self.app.current_session
+            if session is not None:
+                self.update_thought_rows(session, {thought.id for owner, thought in fired if owner is session})
+        self.schedule_reminders()
+    
+    def show_reminders(self, fired):
+        """Add fired reminders to the (non-modal) reminders window, opening it if needed"""
+        if self.reminder_window is None or not self.reminder_window.winfo_exists():
+            window = tk.Toplevel(self.root)
+            window.title("🔔 Reminders")
+            window.geometry("500x250")
+            window.transient(self.root)
+            self.reminder_list = tk.Listbox(window)
+            self.reminder_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+            ttk.Button(window, text="Dismiss", command=window.destroy).pack(pady=(0, 10))
+            self.reminder_window = window
+        for session, thought in fired:
+            due = f" (due {thought.due_at[:16]})" if thought.due_at else ""
+            self.reminder_list.insert(tk.END, f"🔔 {thought.content[:60]}{due} - {session.title[:30]}")
+        self.reminder_window.deiconify()
+        self.reminder_window.lift()
+        self.root.bell()
     
     def refresh_thoughts_display(self):
         """Refresh the thoughts treeview"""
-        # Clear existing items
-        for item in self.thoughts_tree.get_children():
-            self.thoughts_tree.delete(item)
+        self.refresh_analytics_display()
+        self.schedule_reminders()
+        self.last_filter = None  # the thoughts changed, so earlier filter results are stale
         
         if not self.app.current_session:
+            self.base_thoughts = []
+            self.apply_live_filter()
             return
         
-        # Sort thoughts by priority (high to low)
-        thoughts = sorted(self.app.current_session.thoughts, key=lambda x: x.priority, reverse=True)
-        
-        for thought in thoughts:
-            status = "✅" if thought.is_completed else "⭕"
-            priority_stars = "⭐" * thought.priority
-            tags_str = ", ".join(thought.tags)
-            created_str = thought.created_at[:19]
-            
-            # Truncate long content for display
-            content_display = thought.content[:80] + "..." if len(thought.content) > 80 else thought.content
+        date_range = self.get_date_range()
+        query_text = self.query_var.get().strip()
+        if query_text:
+            try:
+                _, thoughts = self.app.query_thoughts(query_text, session_only=True)
+            except QueryError as e:
+                messagebox.showerror("Invalid Query", str(e))
+                return
+            if date_range:
+                field, start, end = date_range
+                in_range = set(self.app.time_index.range(field, start, end, self.app.current_session.id))
+                thoughts = [t for t in thoughts if t.id in in_range]
+        else:
+            thoughts = self.app.current_session.thoughts
+            if date_range:
+                field, start, end = date_range
+                thoughts = self.app.thoughts_in_range(start, end, field, self.app.current_session.id)
             
-            item = self.thoughts_tree.insert('', tk.END, values=(
-                status, content_display, thought.category, priority_stars, tags_str, created_str
-            ), tags=(thought.id,))  # Store ID in tags for reference
+            # Sort thoughts by priority (high to low)
+            thoughts = sorted(thoughts, key=lambda x: x.priority, reverse=True)
+        
+        self.base_thoughts = thoughts
+        self.apply_live_filter()
     
     def run(self):
         """Start the GUI application"""
         self.root.mainloop()
 
+class ViewerWindow:
+    """Read-only browser over a memory-mapped data file"""
+    
+    PAGE = 500  # thoughts decoded per session page
+    
+    def __init__(self, parent, workspace: MappedWorkspace):
+        self.workspace = workspace
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"👀 {os.path.basename(workspace.path)} (read-only)")
+        self.window.geometry("900x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.create_widgets()
+    
+    def create_widgets(self):
+        """Create the session list, thoughts list and search bar"""
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+        
+        self.status_var = tk.StringVar(value=f"{len(self.workspace.sessions)} sessions, "
+                                             f"{len(self.workspace)} thoughts")
+        ttk.Label(main_frame, textvariable=self.status_var).grid(row=0, column=0, columnspan=2, sticky=tk.W)
+        
+        self.session_listbox = tk.Listbox(main_frame, width=35)
+        self.session_listbox.grid(row=1, column=0, sticky=(tk.N, tk.S), padx=(0, 10))
+        for entry in self.workspace.sessions:
+            self.session_listbox.insert(tk.END, f"{entry.title} ({entry.thought_count})")
+        self.session_listbox.bind('<<ListboxSelect>>', self.on_session_select)
+        
+        columns = ('Status', 'Content', 'Category', 'Priority', 'Created')
+        self.tree = ttk.Treeview(main_frame, columns=columns, show='headings')
+        for column in columns:
+            self.tree.heading(column, text=HEADINGS[column])
+        self.tree.column('Status', width=40)
+        self.tree.column('Content', width=400)
+        self.tree.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        search_frame = ttk.Frame(main_frame)
+        search_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
+        ttk.Label(search_frame, text="Find:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind('<Return>', lambda e: self.search())
+        ttk.Button(search_frame, text="Search", command=self.search).pack(side=tk.LEFT)
+        ttk.Button(search_frame, text="Close", command=self.close).pack(side=tk.RIGHT)
+    
+    def show(self, thoughts):
+        """Replace the listed thoughts"""
+        self.tree.delete(*self.tree.get_children())
+        for thought in thoughts:
+            self.tree.insert('', tk.END, values=(
+                "✅" if thought.get('is_completed') else "⭕",
+                thought.get('content', '')[:120],
+                thought.get('category', ''),
+                "⭐" * int(thought.get('priority', 0)),
+                thought.get('created_at', '')[:19],
+            ))
+    
+    def on_session_select(self, event):
+        """Decode and list the first page of the selected session"""
+        selection = self.session_listbox.curselection()
+        if not selection:
+            return
+        entry = self.workspace.sessions[selection[0]]
+        self.show(self.workspace.thoughts(selection[0], 0, self.PAGE))
+        shown = min(entry.thought_count, self.PAGE)
+        self.status_var.set(f"{entry.title}: showing {shown} of {entry.thought_count} thoughts")
+    
+    def search(self):
+        """List thoughts whose content contains the search text"""
+        text = self.search_var.get().strip()
+        if not text:
+            return
+        results = self.workspace.search(text, limit=self.PAGE)
+        self.show(thought for _, thought in results)
+        more = "+" if len(results) == self.PAGE else ""
+        self.status_var.set(f"{len(results)}{more} thoughts contain '{text}'")
+    
+    def close(self):
+        """Close the window and unmap the file"""
+        self.window.destroy()
+        self.workspace.close()
+
 class BrainstormWindow:
     """Dedicated brainstorming window"""
     
+    RECENT_LIMIT = 200  # newest thoughts kept in the recent list
+    
     def __init__(self, parent, app, refresh_callback):
         self.app = app
         self.refresh_callback = refresh_callback
+        self.added = 0
         
         self.window = tk.Toplevel(parent)
         self.window.title(f"🧠 Brainstorming: {app.current_session.title}")
@@ -520,18 +1437,20 @@ class BrainstormWindow:
         
         # Instructions
         instructions = ttk.Label(main_frame, 
-            text="💡 Quick Brainstorming Mode - Type thoughts and press Enter to add them",
+            text="💡 Quick Brainstorming Mode - Type or paste thoughts, one per line",
             font=('Arial', 12, 'bold'))
-        instructions.pack(pady=(0, 20))
+        instructions.pack(pady=(0, 5))
+        ttk.Label(main_frame, text="Start a line with !1-5, @category or #tag to override the defaults below",
+                  foreground='gray').pack(pady=(0, 15))
         
         # Input frame
         input_frame = ttk.Frame(main_frame)
         input_frame.pack(fill=tk.X, pady=(0, 10))
         input_frame.columnconfigure(0, weight=1)
         
-        ttk.Label(input_frame, text="Your thought:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(input_frame, text="Your thoughts:").grid(row=0, column=0, sticky=tk.W)
         
-        self.thought_entry = tk.Text(input_frame, height=3, wrap=tk.WORD)
+        self.thought_entry = tk.Text(input_frame, height=5, wrap=tk.WORD)
         self.thought_entry.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(5, 10))
         self.thought_entry.bind('<Control-Return>', self.add_thought)
         
@@ -547,7 +1466,7 @@ class BrainstormWindow:
         self.priority_var = tk.IntVar(value=3)
         ttk.Spinbox(options_frame, from_=1, to=5, textvariable=self.priority_var, width=5).pack(side=tk.LEFT, padx=(5, 15))
         
-        add_btn = ttk.Button(options_frame, text="Add Thought (Ctrl+Enter)", command=self.add_thought)
+        add_btn = ttk.Button(options_frame, text="Add Thoughts (Ctrl+Enter)", command=self.add_thought)
         add_btn.pack(side=tk.LEFT, padx=(10, 0))
         
         # Recent thoughts display
@@ -564,25 +1483,33 @@ class BrainstormWindow:
         ttk.Button(control_frame, text="Clear Input", command=self.clear_input).pack(side=tk.RIGHT)
     
     def add_thought(self, event=None):
-        """Add a thought from the brainstorming window"""
-        content = self.thought_entry.get(1.0, tk.END).strip()
-        if not content:
-            return
-        
+        """Add every line of the input as a thought, in one batch"""
         category = self.category_var.get().strip() or "brainstorm"
-        priority = self.priority_var.get()
-        
-        self.app.add_thought(content, category, priority, ["brainstorm"])
-        
-        # Add to recent list
-        display_text = f"[{priority}⭐] {content[:60]}{'...' if len(content) > 60 else ''}"
-        self.recent_listbox.insert(0, display_text)
+        try:
+            priority = min(max(self.priority_var.get(), 1), 5)
+        except tk.TclError:
+            priority = 3
+        lines = self.thought_entry.get(1.0, tk.END).splitlines()
+        captures = [capture for capture in (parse_capture(line, category, priority, ["brainstorm"]) for line in lines)
+                    if capture]
+        if not captures:
+            return "break"
+        
+        thoughts = self.app.add_thoughts(captures)
+        self.added += len(thoughts)
+        
+        # Newest first, keeping only the last RECENT_LIMIT in the list
+        recent = thoughts[-self.RECENT_LIMIT:]
+        self.recent_listbox.insert(0, *(f"[{t.priority}⭐] {t.content[:60]}{'...' if len(t.content) > 60 else ''}"
+                                        for t in reversed(recent)))
+        self.recent_listbox.delete(self.RECENT_LIMIT, tk.END)
         
         # Clear input
         self.clear_input()
         
         # Keep focus on entry
         self.thought_entry.focus()
+        return "break"  # keep Ctrl+Enter from adding a newline
     
     def clear_input(self):
         """Clear the thought input"""
@@ -590,9 +1517,8 @@ class BrainstormWindow:
     
     def finish_brainstorming(self):
         """Finish brainstorming session"""
-        count = self.recent_listbox.size()
         self.refresh_callback()
-        messagebox.showinfo("Brainstorming Complete", f"Added {count} thoughts to your session!")
+        messagebox.showinfo("Brainstorming Complete", f"Added {self.added} thoughts to your session!")
         self.window.destroy()
 
 def main():
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Record IDs
+New IDs are 16 lowercase Crockford base32 characters: a 50-bit millisecond
+timestamp followed by 30 random bits. They sort by creation time, survive the
+CLI's lowercasing, and are checked against the IDs already in use, so they never
+collide within a workspace. The original 8-character uuid4 IDs stay valid.
+"""
+
+import secrets
+import threading
+import time
+from typing import Container
+
+# Crockford's base32 alphabet, lowercased (no i, l, o or u)
+ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+TIME_CHARS = 10
+RANDOM_CHARS = 6
+RANDOM_BITS = 5 * RANDOM_CHARS
+
+# Two base32 characters per 10 bits, so encoding takes a few table lookups
+_PAIRS = [a + b for a in ALPHABET for b in ALPHABET]
+
+_lock = threading.Lock()
+_last = [0, 0, '']  # milliseconds, random part and encoded time of the last ID from this process
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(0, length, 2):
+        value, pair = divmod(value, 1024)
+        chars.append(_PAIRS[pair])
+    return ''.join(reversed(chars))
+
+
+def new_id(taken: Container[str] = ()) -> str:
+    """Generate a time-ordered ID that is not in taken
+
+    IDs made by one process in the same millisecond increment the random part,
+    so they stay strictly increasing.
+    """
+    while True:
+        with _lock:
+            millis = time.time_ns() // 1_000_000
+            if millis > _last[0]:
+                _last[:] = millis, secrets.randbits(RANDOM_BITS - 1), _encode(millis, TIME_CHARS)
+            elif _last[1] + 1 < 1 << RANDOM_BITS:
+                _last[1] += 1
+            else:
+                _last[0] += 1
+                _last[1:] = secrets.randbits(RANDOM_BITS - 1), _encode(_last[0], TIME_CHARS)
+            candidate = _last[2] + _encode(_last[1], RANDOM_CHARS)
+        if candidate not in taken:
+            return candidate
@@ -0,0 +1,734 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - In-memory indexes kept in step with every thought mutation
+"""
+
+import bisect
+import datetime
+import heapq
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Any
+
+
+def _decrement(counter: Counter, key):
+    """Decrement a counter entry, dropping it once it reaches zero"""
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+
+
+def _merge_sorted(entries: list, new: list):
+    """Merge new items into a sorted list in place
+
+    A batch of fresh timestamps or IDs normally sorts after everything present
+    and is appended; otherwise the sort merges the two sorted runs in one pass.
+    """
+    new.sort()
+    if not new:
+        return
+    entries.extend(new)
+    if len(entries) > len(new) and new[0] < entries[-len(new) - 1]:
+        entries.sort()
+
+
+def _week_key(timestamp: str) -> str:
+    """Return the ISO week ('2026-W42') an ISO timestamp falls in"""
+    year, week, _ = datetime.date.fromisoformat(timestamp[:10]).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class ThoughtIndex:
+    """Base class for indexes maintained through add/remove on every mutation"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Reset the index"""
+        raise NotImplementedError
+
+    def add(self, session, thought):
+        """Account for a thought entering the workspace"""
+        raise NotImplementedError
+
+    def add_many(self, session, thoughts):
+        """Account for a batch of thoughts entering one session"""
+        for thought in thoughts:
+            self.add(session, thought)
+
+    def remove(self, session, thought):
+        """Account for a thought leaving the workspace (before it changes)"""
+        raise NotImplementedError
+
+    def rebuild(self, sessions):
+        """Rebuild the index from scratch"""
+        self.clear()
+        for session in sessions:
+            for thought in session.thoughts:
+                self.add(session, thought)
+
+
+class WorkspaceAnalytics(ThoughtIndex):
+    """Materialized aggregate counters over every thought in the workspace"""
+
+    def clear(self):
+        """Reset all aggregates"""
+        self.total = 0
+        self.completed = 0
+        self.by_category = Counter()
+        self.completed_by_category = Counter()
+        self.by_priority = Counter()
+        self.by_day = Counter()
+        self.by_week = Counter()
+        self.by_session = Counter()
+        self.completed_by_session = Counter()
+
+    def add(self, session, thought):
+        """Account for a thought entering the workspace"""
+        self.total += 1
+        self.by_category[thought.category] += 1
+        self.by_priority[thought.priority] += 1
+        self.by_day[thought.created_at[:10]] += 1
+        self.by_week[_week_key(thought.created_at)] += 1
+        self.by_session[session.id] += 1
+        if thought.is_completed:
+            self.completed += 1
+            self.completed_by_category[thought.category] += 1
+            self.completed_by_session[session.id] += 1
+
+    def add_many(self, session, thoughts):
+        """Account for a batch of thoughts, counting each aggregate in one pass"""
+        completed = [thought for thought in thoughts if thought.is_completed]
+        self.total += len(thoughts)
+        self.completed += len(completed)
+        self.by_category.update(thought.category for thought in thoughts)
+        self.by_priority.update(thought.priority for thought in thoughts)
+        days = Counter(thought.created_at[:10] for thought in thoughts)
+        self.by_day.update(days)
+        for day, count in days.items():
+            self.by_week[_week_key(day)] += count
+        self.by_session[session.id] += len(thoughts)
+        self.completed_by_category.update(thought.category for thought in completed)
+        if completed:
+            self.completed_by_session[session.id] += len(completed)
+
+    def remove(self, session, thought):
+        """Account for a thought leaving the workspace"""
+        self.total -= 1
+        _decrement(self.by_category, thought.category)
+        _decrement(self.by_priority, thought.priority)
+        _decrement(self.by_day, thought.created_at[:10])
+        _decrement(self.by_week, _week_key(thought.created_at))
+        _decrement(self.by_session, session.id)
+        if thought.is_completed:
+            self.completed -= 1
+            _decrement(self.completed_by_category, thought.category)
+            _decrement(self.completed_by_session, session.id)
+
+    def session_counts(self, session_id: str):
+        """Return (thought_count, completed_count) for a session"""
+        return self.by_session[session_id], self.completed_by_session[session_id]
+
+    def completion_rate(self) -> float:
+        """Fraction of all thoughts that are completed"""
+        return self.completed / self.total if self.total else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Snapshot of the aggregates as plain data"""
+        return {
+            'total': self.total,
+            'completed': self.completed,
+            'completion_rate': self.completion_rate(),
+            'by_category': dict(self.by_category),
+            'completed_by_category': dict(self.completed_by_category),
+            'by_priority': dict(self.by_priority),
+            'by_day': dict(self.by_day),
+            'by_week': dict(self.by_week),
+        }
+
+
+class PrefixIndex:
+    """Sorted list of IDs for resolving unique ID prefixes by binary search
+
+    New IDs are time-ordered, so adding one is normally an append.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self.keys: List[str] = sorted(keys)
+
+    def add(self, key: str):
+        """Insert an ID"""
+        if not self.keys or key > self.keys[-1]:
+            self.keys.append(key)
+        else:
+            bisect.insort(self.keys, key)
+
+    def update(self, keys: Iterable[str]):
+        """Insert a batch of IDs"""
+        _merge_sorted(self.keys, list(keys))
+
+    def discard(self, key: str):
+        """Remove an ID if present"""
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+
+    def matches(self, prefix: str, limit: int = 2) -> List[str]:
+        """Return up to limit IDs starting with prefix, in sorted order"""
+        position = bisect.bisect_left(self.keys, prefix)
+        found = []
+        while position < len(self.keys) and len(found) < limit and self.keys[position].startswith(prefix):
+            found.append(self.keys[position])
+            position += 1
+        return found
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class ThoughtIdIndex(ThoughtIndex):
+    """Workspace-wide map from thought ID to its session and thought
+
+    A session evicted by the session cache keeps its IDs here with None for the
+    thought; get() calls fault(session) to bring its thoughts back first.
+    """
+
+    def __init__(self):
+        self.fault: Optional[Callable[[Any], Any]] = None
+        super().__init__()
+
+    def clear(self):
+        """Forget every thought"""
+        self.entries: Dict[str, Tuple[Any, Any]] = {}
+        self.prefixes = PrefixIndex()
+
+    def add(self, session, thought):
+        """Register a thought under its ID"""
+        if thought.id not in self.entries:
+            self.prefixes.add(thought.id)
+        self.entries[thought.id] = (session, thought)
+
+    def add_many(self, session, thoughts):
+        """Register a batch of thoughts, merging their IDs into the prefix index at once"""
+        self.prefixes.update(thought.id for thought in thoughts if thought.id not in self.entries)
+        self.entries.update((thought.id, (session, thought)) for thought in thoughts)
+
+    def remove(self, session, thought):
+        """Drop a thought's ID"""
+        if self.entries.pop(thought.id, None) is not None:
+            self.prefixes.discard(thought.id)
+
+    def rebuild(self, sessions):
+        """Rebuild the map, sorting the prefix index once rather than per thought"""
+        self.entries = {thought.id: (session, thought) for session in sessions for thought in session.thoughts}
+        self.prefixes = PrefixIndex(self.entries)
+
+    def get(self, thought_id: str):
+        """Return (session, thought) for an ID, or None"""
+        entry = self.entries.get(thought_id)
+        if entry is not None and entry[1] is None:
+            self.fault(entry[0])
+            entry = self.entries.get(thought_id)
+        return entry
+
+    def attach(self, session, thoughts):
+        """Point the entries of a session's thoughts at these (faulted-in) objects"""
+        for thought in thoughts:
+            self.entries[thought.id] = (session, thought)
+
+    def detach(self, session, thoughts):
+        """Keep the IDs of an evicted session's thoughts without holding the objects"""
+        for thought in thoughts:
+            self.entries[thought.id] = (session, None)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class AttributeIndex(ThoughtIndex):
+    """Inverted index from an attribute value to the IDs of thoughts having it"""
+
+    def __init__(self, keys: Callable[[Any], Iterable]):
+        self.keys = keys
+        super().__init__()
+
+    def clear(self):
+        """Drop all postings"""
+        self.workspace: Dict[Any, Set[str]] = {}
+        self.sessions: Dict[str, Dict[Any, Set[str]]] = {}
+
+    def add(self, session, thought):
+        """Post a thought under each of its attribute values"""
+        per_session = self.sessions.setdefault(session.id, {})
+        for key in set(self.keys(thought)):
+            self.workspace.setdefault(key, set()).add(thought.id)
+            per_session.setdefault(key, set()).add(thought.id)
+
+    def add_many(self, session, thoughts):
+        """Post a batch of thoughts, grouping them by value first"""
+        grouped: Dict[Any, List[str]] = {}
+        for thought in thoughts:
+            for key in set(self.keys(thought)):
+                grouped.setdefault(key, []).append(thought.id)
+        per_session = self.sessions.setdefault(session.id, {})
+        for key, ids in grouped.items():
+            self.workspace.setdefault(key, set()).update(ids)
+            per_session.setdefault(key, set()).update(ids)
+
+    def remove(self, session, thought):
+        """Remove a thought from the postings of its (current) attribute values"""
+        per_session = self.sessions.get(session.id, {})
+        for key in set(self.keys(thought)):
+            for postings in (self.workspace, per_session):
+                ids = postings.get(key)
+                if ids is not None:
+                    ids.discard(thought.id)
+                    if not ids:
+                        del postings[key]
+        if not per_session:
+            self.sessions.pop(session.id, None)
+
+    def lookup(self, key, session_id: str = None) -> Set[str]:
+        """Return the (read-only) set of thought IDs posted under a value"""
+        postings = self.workspace if session_id is None else self.sessions.get(session_id, {})
+        return postings.get(key, set())
+
+    def values(self, session_id: str = None):
+        """Return the distinct attribute values present"""
+        postings = self.workspace if session_id is None else self.sessions.get(session_id, {})
+        return postings.keys()
+
+
+class TimeIndex(ThoughtIndex):
+    """Sorted (timestamp, thought ID) lists over creation and update times"""
+
+    FIELDS = ('created', 'updated')
+
+    def clear(self):
+        """Reset the workspace-wide and per-session lists"""
+        self.workspace: Dict[str, List[Tuple[str, str]]] = {field: [] for field in self.FIELDS}
+        self.sessions: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+
+    def _lists(self, session_id: str):
+        """Yield the workspace list and the session list for each field"""
+        per_session = self.sessions.setdefault(session_id, {field: [] for field in self.FIELDS})
+        for field in self.FIELDS:
+            yield field, self.workspace[field], per_session[field]
+
+    @staticmethod
+    def _timestamp(thought, field: str) -> str:
+        return thought.created_at if field == 'created' else thought.updated_at
+
+    def add(self, session, thought):
+        """Insert a thought's timestamps in sorted position"""
+        for field, workspace, per_session in self._lists(session.id):
+            key = (self._timestamp(thought, field), thought.id)
+            bisect.insort(workspace, key)
+            bisect.insort(per_session, key)
+
+    def add_many(self, session, thoughts):
+        """Merge a batch's timestamps into each list at once"""
+        for field, workspace, per_session in self._lists(session.id):
+            keys = [(self._timestamp(thought, field), thought.id) for thought in thoughts]
+            _merge_sorted(workspace, keys)
+            _merge_sorted(per_session, keys)
+
+    def rebuild(self, sessions):
+        """Bulk-load every timestamp and sort once instead of inserting one by one"""
+        self.clear()
+        for session in sessions:
+            for field, workspace, per_session in self._lists(session.id):
+                for thought in session.thoughts:
+                    key = (self._timestamp(thought, field), thought.id)
+                    workspace.append(key)
+                    per_session.append(key)
+                per_session.sort()
+        for entries in self.workspace.values():
+            entries.sort()
+
+    def remove(self, session, thought):
+        """Remove a thought's timestamps (must be called before they change)"""
+        for field, workspace, per_session in self._lists(session.id):
+            key = (self._timestamp(thought, field), thought.id)
+            for entries in (workspace, per_session):
+                position = bisect.bisect_left(entries, key)
+                if position < len(entries) and entries[position] == key:
+                    del entries[position]
+        if not self.sessions[session.id]['created']:
+            del self.sessions[session.id]
+
+    def _bounds(self, field: str, start: str, end: str, session_id: str):
+        if session_id is None:
+            entries = self.workspace[field]
+        else:
+            entries = self.sessions.get(session_id, {}).get(field, [])
+        low = bisect.bisect_left(entries, (start,)) if start else 0
+        high = bisect.bisect_left(entries, (end,)) if end else len(entries)
+        return entries, low, high
+
+    def range(self, field: str = 'created', start: str = None, end: str = None,
+              session_id: str = None) -> List[str]:
+        """Return thought IDs with start <= timestamp < end, oldest first"""
+        entries, low, high = self._bounds(field, start, end, session_id)
+        return [thought_id for _, thought_id in entries[low:high]]
+
+    def count(self, field: str = 'created', start: str = None, end: str = None,
+              session_id: str = None) -> int:
+        """Count thoughts in a range without materializing it"""
+        _, low, high = self._bounds(field, start, end, session_id)
+        return max(high - low, 0)
+
+
+class OrderedIndex(ThoughtIndex):
+    """Thoughts kept sorted by a key per session and workspace-wide, for cursor paging"""
+
+    def __init__(self, key: Callable[[Any], Any]):
+        self.key = key
+        super().__init__()
+
+    def clear(self):
+        """Drop every entry"""
+        self.workspace: List[Tuple[Any, str]] = []
+        self.sessions: Dict[str, List[Tuple[Any, str]]] = {}
+
+    def entry(self, thought) -> Tuple[Any, str]:
+        """Return the sort entry for a thought"""
+        return (self.key(thought), thought.id)
+
+    def add(self, session, thought):
+        """Insert a thought at its sorted position"""
+        entry = self.entry(thought)
+        bisect.insort(self.workspace, entry)
+        bisect.insort(self.sessions.setdefault(session.id, []), entry)
+
+    def add_many(self, session, thoughts):
+        """Merge a batch of thoughts into both lists at once"""
+        entries = [self.entry(thought) for thought in thoughts]
+        _merge_sorted(self.workspace, entries)
+        _merge_sorted(self.sessions.setdefault(session.id, []), entries)
+
+    def remove(self, session, thought):
+        """Remove a thought (must be called before its sort key changes)"""
+        entry = self.entry(thought)
+        for entries in (self.workspace, self.sessions.get(session.id, [])):
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+
+    def rebuild(self, sessions):
+        """Bulk-load and sort once"""
+        self.clear()
+        for session in sessions:
+            entries = [self.entry(thought) for thought in session.thoughts]
+            entries.sort()
+            self.sessions[session.id] = entries
+            self.workspace.extend(entries)
+        self.workspace.sort()
+
+    def page(self, after: Tuple[Any, str] = None, limit: int = 50,
+             session_id: str = None) -> List[Tuple[Any, str]]:
+        """Return up to limit entries strictly after the given entry"""
+        entries = self.workspace if session_id is None else self.sessions.get(session_id, [])
+        start = bisect.bisect_right(entries, after) if after else 0
+        return entries[start:start + limit]
+
+    def count(self, session_id: str = None) -> int:
+        """Number of thoughts in scope"""
+        entries = self.workspace if session_id is None else self.sessions.get(session_id, [])
+        return len(entries)
+
+
+class DueIndex(ThoughtIndex):
+    """Open thoughts with a due date, sorted by (due_at, thought ID)"""
+
+    def clear(self):
+        """Drop every entry"""
+        self.entries: List[Tuple[str, str]] = []
+
+    def add(self, session, thought):
+        """Insert an open thought that has a due date"""
+        if thought.due_at and not thought.is_completed:
+            bisect.insort(self.entries, (thought.due_at, thought.id))
+
+    def remove(self, session, thought):
+        """Remove a thought (must be called before its due date changes)"""
+        if thought.due_at:
+            entry = (thought.due_at, thought.id)
+            position = bisect.bisect_left(self.entries, entry)
+            if position < len(self.entries) and self.entries[position] == entry:
+                del self.entries[position]
+
+    def rebuild(self, sessions):
+        """Bulk-load and sort once"""
+        self.entries = sorted((thought.due_at, thought.id) for session in sessions for thought in session.thoughts
+                              if thought.due_at and not thought.is_completed)
+
+    def before(self, end: str = None, limit: int = None) -> List[Tuple[str, str]]:
+        """Return (due_at, thought ID) entries due before end, soonest first"""
+        high = bisect.bisect_left(self.entries, (end,)) if end else len(self.entries)
+        return self.entries[:high if limit is None else min(high, limit)]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ReminderScheduler(ThoughtIndex):
+    """Pending reminders of open thoughts in a min-heap on remind_at
+
+    Removing a thought only forgets its pending time; its heap entry goes stale
+    and is discarded once it reaches the top, so adding, removing and finding the
+    next reminder are all O(log n) however many reminders are pending.
+    """
+
+    def clear(self):
+        """Forget every reminder"""
+        self.heap: List[Tuple[str, str]] = []
+        self.pending: Dict[str, str] = {}  # thought id -> remind_at
+
+    def add(self, session, thought):
+        """Schedule an open thought's reminder"""
+        if thought.remind_at and not thought.is_completed:
+            self.pending[thought.id] = thought.remind_at
+            heapq.heappush(self.heap, (thought.remind_at, thought.id))
+            if len(self.heap) > 2 * len(self.pending) + 64:
+                # Mostly stale entries from edits: rebuild from what is pending
+                self.heap = [(remind_at, thought_id) for thought_id, remind_at in self.pending.items()]
+                heapq.heapify(self.heap)
+
+    def remove(self, session, thought):
+        """Cancel a thought's reminder"""
+        self.pending.pop(thought.id, None)
+
+    def rebuild(self, sessions):
+        """Collect every pending reminder and heapify once"""
+        self.pending = {thought.id: thought.remind_at for session in sessions for thought in session.thoughts
+                        if thought.remind_at and not thought.is_completed}
+        self.heap = [(remind_at, thought_id) for thought_id, remind_at in self.pending.items()]
+        heapq.heapify(self.heap)
+
+    def _discard_stale(self):
+        while self.heap and self.pending.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def next(self) -> Optional[Tuple[str, str]]:
+        """Return (remind_at, thought ID) of the earliest pending reminder, or None"""
+        self._discard_stale()
+        return self.heap[0] if self.heap else None
+
+    def pop_due(self, now: str) -> List[str]:
+        """Remove and return the IDs of thoughts whose reminder time is at or before now"""
+        due = []
+        self._discard_stale()
+        while self.heap and self.heap[0][0] <= now:
+            _, thought_id = heapq.heappop(self.heap)
+            del self.pending[thought_id]
+            due.append(thought_id)
+            self._discard_stale()
+        return due
+
+    def __len__(self):
+        return len(self.pending)
+
+
+class HierarchyIndex(ThoughtIndex):
+    """Parent/child links between thoughts with completion totals kept per subtree
+
+    Each thought's (thoughts, completed) totals cover itself and all of its
+    descendants and are updated along the ancestor chain on every add and
+    remove, so descendant counts are O(1) and no query scans the workspace.
+    Thoughts whose parent is missing (deleted, or in another file) are roots.
+    """
+
+    def clear(self):
+        """Forget every link"""
+        self.parents: Dict[str, str] = {}  # thought id -> parent id
+        self.children: Dict[str, Set[str]] = {}  # parent id -> child ids (present thoughts only)
+        self.totals: Dict[str, Tuple[int, int]] = {}  # thought id -> (subtree size, completed in subtree)
+
+    def _propagate(self, thought_id: str, delta: Tuple[int, int]):
+        """Add delta to the totals of every ancestor of a thought"""
+        seen = {thought_id}
+        parent = self.parents.get(thought_id)
+        while parent in self.totals and parent not in seen:  # seen guards against cycles in bad data
+            size, completed = self.totals[parent]
+            self.totals[parent] = (size + delta[0], completed + delta[1])
+            seen.add(parent)
+            parent = self.parents.get(parent)
+
+    def add(self, session, thought):
+        """Link a thought under its parent; works in any order, so children may come first"""
+        size, completed = 1, int(thought.is_completed)
+        for child in self.children.get(thought.id, ()):
+            child_size, child_completed = self.totals[child]
+            size, completed = size + child_size, completed + child_completed
+        self.totals[thought.id] = (size, completed)
+        if thought.parent_id:
+            self.parents[thought.id] = thought.parent_id
+            self.children.setdefault(thought.parent_id, set()).add(thought.id)
+            self._propagate(thought.id, (size, completed))
+
+    def remove(self, session, thought):
+        """Unlink a thought (must be called before its parent or completion changes)"""
+        parent = self.parents.get(thought.id)
+        if parent is not None:
+            size, completed = self.totals[thought.id]
+            self._propagate(thought.id, (-size, -completed))
+            del self.parents[thought.id]
+            siblings = self.children[parent]
+            siblings.discard(thought.id)
+            if not siblings:
+                del self.children[parent]
+        self.totals.pop(thought.id, None)
+
+    def child_ids(self, thought_id: str) -> Set[str]:
+        """IDs of a thought's direct children"""
+        return self.children.get(thought_id, set())
+
+    def ancestors(self, thought_id: str) -> List[str]:
+        """IDs from a thought's parent up to its root"""
+        chain, seen = [], {thought_id}
+        parent = self.parents.get(thought_id)
+        while parent in self.totals and parent not in seen:
+            chain.append(parent)
+            seen.add(parent)
+            parent = self.parents.get(parent)
+        return chain
+
+    def descendants(self, thought_id: str) -> List[str]:
+        """IDs of every thought below a thought, parents before their children"""
+        found, stack, seen = [], [thought_id], {thought_id}
+        while stack:
+            for child in self.children.get(stack.pop(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    found.append(child)
+                    stack.append(child)
+        return found
+
+    def descendant_count(self, thought_id: str) -> int:
+        """Number of thoughts below a thought"""
+        return self.totals.get(thought_id, (1, 0))[0] - 1
+
+    def progress(self, thought) -> Tuple[int, int]:
+        """(completed, total) over a thought's descendants, not counting the thought itself"""
+        size, completed = self.totals.get(thought.id, (1, int(thought.is_completed)))
+        return completed - int(thought.is_completed), size - 1
+
+
+class LinkIndex(ThoughtIndex):
+    """Typed links between thoughts as adjacency sets in both directions
+
+    Links are stored on their source thought as [target id, type]. Traversals
+    treat them as undirected and visit each thought and link at most once, so
+    paths and components cost O(V + E) however large the graph is. Links to
+    thoughts that are not in the workspace are kept but never traversed.
+    """
+
+    def clear(self):
+        """Forget every link"""
+        self.present: Set[str] = set()
+        self.outgoing: Dict[str, Set[Tuple[str, str]]] = {}  # source -> {(target, type)}
+        self.incoming: Dict[str, Set[Tuple[str, str]]] = {}  # target -> {(source, type)}
+
+    def add(self, session, thought):
+        """Register a thought and its outgoing links"""
+        self.present.add(thought.id)
+        for target, kind in thought.links:
+            self.outgoing.setdefault(thought.id, set()).add((target, kind))
+            self.incoming.setdefault(target, set()).add((thought.id, kind))
+
+    def remove(self, session, thought):
+        """Drop a thought's outgoing links (must be called before they change)"""
+        self.present.discard(thought.id)
+        for target, kind in self.outgoing.pop(thought.id, ()):
+            sources = self.incoming[target]
+            sources.discard((thought.id, kind))
+            if not sources:
+                del self.incoming[target]
+
+    def neighbors(self, thought_id: str) -> List[Tuple[str, str, str]]:
+        """(thought id, type, 'out' or 'in') for every link touching a thought"""
+        found = [(target, kind, 'out') for target, kind in self.outgoing.get(thought_id, ())]
+        found += [(source, kind, 'in') for source, kind in self.incoming.get(thought_id, ())]
+        return sorted(found)
+
+    def _adjacent(self, thought_id: str, kinds: Set[str] = None):
+        for edges in (self.outgoing.get(thought_id, ()), self.incoming.get(thought_id, ())):
+            for other, kind in edges:
+                if other in self.present and (kinds is None or kind in kinds):
+                    yield other, kind
+
+    def shortest_path(self, start: str, goal: str, kinds: Set[str] = None) -> Optional[List[Tuple[str, str]]]:
+        """Fewest-links path as [(thought id, type of the link reaching it)], or None
+
+        Bidirectional breadth-first search, always growing the smaller frontier by
+        a whole layer, so it meets in the middle after touching far fewer thoughts
+        than a one-sided search. The first entry is the start with an empty type.
+        """
+        if start not in self.present or goal not in self.present:
+            return None
+        # thought id -> (neighbour one step nearer that side's origin, link type, distance)
+        sides = ({start: (None, '', 0)}, {goal: (None, '', 0)})
+        frontiers = ([start], [goal])
+        meeting = start if start == goal else None
+        while meeting is None and frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, other_seen = sides[side], sides[1 - side]
+            layer, best = [], None
+            for current in frontiers[side]:
+                distance = seen[current][2] + 1
+                for other, kind in self._adjacent(current, kinds):
+                    if other not in seen:
+                        seen[other] = (current, kind, distance)
+                        layer.append(other)
+                    if other in other_seen:
+                        total = seen[other][2] + other_seen[other][2]
+                        if best is None or total < best[0]:
+                            best = (total, other)
+            frontiers = (layer, frontiers[1]) if side == 0 else (frontiers[0], layer)
+            if best:
+                meeting = best[1]
+        if meeting is None:
+            return None
+
+        path, step = [], meeting
+        while step is not None:
+            previous, kind, _ = sides[0][step]
+            path.append((step, kind))
+            step = previous
+        path.reverse()
+        step = meeting
+        while sides[1][step][0] is not None:
+            following, kind, _ = sides[1][step]
+            path.append((following, kind))
+            step = following
+        return path
+
+    def component(self, thought_id: str) -> List[str]:
+        """IDs of every thought connected to a thought by links, itself first"""
+        seen = {thought_id}
+        order, position = [thought_id], 0
+        while position < len(order):
+            for other, _ in self._adjacent(order[position]):
+                if other not in seen:
+                    seen.add(other)
+                    order.append(other)
+            position += 1
+        return order
+
+    def components(self) -> List[List[str]]:
+        """Every group of two or more linked thoughts, largest first"""
+        seen: Set[str] = set()
+        found = []
+        for thought_id in list(self.outgoing) + list(self.incoming):
+            if thought_id in self.present and thought_id not in seen:
+                members = self.component(thought_id)
+                seen.update(members)
+                if len(members) > 1:
+                    found.append(members)
+        found.sort(key=len, reverse=True)
+        return found
+
+    def link_count(self) -> int:
+        """Number of stored links"""
+        return sum(len(edges) for edges in self.outgoing.values())
@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Thought query language with an index-aware planner
+
+    [all] thoughts [where <condition>] [order by <field> [asc|desc]] [limit <n>]
+
+Conditions combine predicates with and / or / not and parentheses:
+    priority>=4   category:ideas   tag:infra   done   created>2026-09-01
+    updated<=yesterday   content~word   "quoted phrase"
+"""
+
+import datetime
+import heapq
+import operator
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional
+
+# Dates and timestamps come before the operators so the ':' in 10:00 isn't read as one
+TOKEN_RE = re.compile(
+    r'\s*(?:(?P<string>"[^"]*")|(?P<time>\d{4}-\d{2}-\d{2}(?:[Tt][\d:.]+)?)(?=[\s()]|$)'
+    r'|(?P<op>>=|<=|!=|[=<>:~])|(?P<paren>[()])|(?P<word>[^\s()<>=!:~"]+))'
+)
+
+COMPARISONS = {
+    '=': operator.eq, ':': operator.eq, '!=': operator.ne,
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+}
+
+ORDER_KEYS = {
+    'priority': lambda t: t.priority,
+    'created': lambda t: t.created_at,
+    'updated': lambda t: t.updated_at,
+    'category': lambda t: t.category.lower(),
+    'content': lambda t: t.content.lower(),
+}
+
+FIELD_ALIASES = {
+    'cat': 'category', 'tags': 'tag', 'text': 'content',
+    'completed': 'done', 'prio': 'priority',
+}
+
+
+class QueryError(ValueError):
+    """Raised when a query cannot be parsed"""
+
+
+def parse_time_bound(text: str, end: bool = False) -> str:
+    """Turn 'today', 'yesterday', 'YYYY-MM-DD' or an ISO timestamp into a comparable bound
+
+    Date-only end bounds are exclusive of the following day, so 'until 2026-10-05'
+    includes everything on the 5th.
+    """
+    text = text.strip().lower()
+    today = datetime.date.today()
+    if text == 'today':
+        day = today
+    elif text == 'yesterday':
+        day = today - datetime.timedelta(days=1)
+    elif len(text) == 10:
+        day = datetime.date.fromisoformat(text)
+    else:
+        return datetime.datetime.fromisoformat(text.upper()).isoformat()
+    if end:
+        day += datetime.timedelta(days=1)
+    return day.isoformat()
+
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+RELATIVE_RE = re.compile(r'\+(\d+)([mhdw])')
+RELATIVE_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+
+def parse_when(text: str, default_time: str = None, now: datetime.datetime = None) -> str:
+    """Turn 'today', 'tomorrow', a weekday, '+30m'/'+2h'/'+3d'/'+1w', a date or an ISO timestamp into a time
+
+    Days ('friday' is the next Friday, never today) give a bare date, or that date
+    at default_time ('09:00') when one is given; relative offsets give a timestamp.
+    """
+    text = text.strip().lower()
+    now = now or datetime.datetime.now()
+    today = now.date()
+    relative = RELATIVE_RE.fullmatch(text)
+    if relative:
+        moment = now + datetime.timedelta(**{RELATIVE_UNITS[relative.group(2)]: int(relative.group(1))})
+        return moment.isoformat(timespec='seconds')
+    if text == 'today':
+        day = today
+    elif text == 'tomorrow':
+        day = today + datetime.timedelta(days=1)
+    elif text in WEEKDAYS:
+        day = today + datetime.timedelta(days=(WEEKDAYS.index(text) - today.weekday() - 1) % 7 + 1)
+    elif len(text) == 10:
+        day = datetime.date.fromisoformat(text)
+    else:
+        return datetime.datetime.fromisoformat(text.upper()).isoformat()
+    return f"{day.isoformat()}T{default_time}:00" if default_time else day.isoformat()
+
+
+CAPTURE_TOKEN_RE = re.compile(
+    r'\s*(?:!(?P<priority>\d+)|@(?P<category>[^\s!@#]+)|#(?P<tag>[^\s!@#]+)'
+    r'|priority:(?P<long_priority>\d+)|category:(?P<long_category>\S+))(?=\s|$)',
+    re.IGNORECASE)
+
+
+@dataclass
+class Capture:
+    """One line of brainstorm input with its inline markers applied"""
+    content: str
+    category: str
+    priority: int
+    tags: List[str]
+
+
+def parse_capture(line: str, category: str = "general", priority: int = 3,
+                  tags: Iterable[str] = ()) -> Optional[Capture]:
+    """Parse '!5 @ideas #infra #later the thought' (markers first, in any order) over the given defaults
+
+    priority:N and category:name are accepted as long forms; priorities are
+    clamped to 1-5. Returns None for a line with no content.
+    """
+    position, tags = 0, list(tags)
+    while True:
+        token = CAPTURE_TOKEN_RE.match(line, position)
+        if not token:
+            break
+        position = token.end()
+        kind = token.lastgroup
+        if kind in ('priority', 'long_priority'):
+            priority = min(max(int(token.group(kind)), 1), 5)
+        elif kind in ('category', 'long_category'):
+            category = token.group(kind)
+        elif token.group('tag') not in tags:
+            tags.append(token.group('tag'))
+    content = line[position:].strip()
+    return Capture(content, category, priority, tags) if content else None
+
+
+@dataclass
+class Predicate:
+    """A single field comparison such as priority>=4 or tag:infra"""
+    field: str
+    op: str
+    value: Any
+    span: Optional[tuple] = None  # (start, end) superset range for time fields
+    exact_span: bool = False
+    check: Callable = None
+
+    def __post_init__(self):
+        if self.field in ('created', 'updated'):
+            self._compile_time()
+        elif self.field in ('category', 'tag', 'content'):
+            self.value = str(self.value).lower()
+
+    def _compile_time(self):
+        text = str(self.value)
+        date_only = len(text) == 10 or text in ('today', 'yesterday')
+        start = parse_time_bound(text)
+        if date_only:
+            after = parse_time_bound(text, end=True)
+            spans = {
+                '>': (after, None), '>=': (start, None), '<': (None, start),
+                '<=': (None, after), '=': (start, after), ':': (start, after),
+            }
+            if self.op == '!=':
+                self.check = lambda ts: not (start <= ts < after)
+            else:
+                low, high = spans[self.op]
+                self.span, self.exact_span = (low, high), True
+                self.check = lambda ts: (low is None or ts >= low) and (high is None or ts < high)
+        else:
+            compare = COMPARISONS[self.op]
+            self.check = lambda ts: compare(ts, start)
+            spans = {
+                '>': (start, None), '>=': (start, None), '<': (None, start),
+                '<=': (None, start + '\uffff'), '=': (start, start + '\uffff'),
+                ':': (start, start + '\uffff'),
+            }
+            self.span = spans.get(self.op)
+
+    def matches(self, thought) -> bool:
+        if self.field == 'done':
+            return thought.is_completed == self.value
+        if self.field == 'priority':
+            return COMPARISONS[self.op](thought.priority, self.value)
+        if self.field == 'category':
+            return COMPARISONS[self.op](thought.category.lower(), self.value)
+        if self.field == 'tag':
+            has_tag = any(tag.lower() == self.value for tag in thought.tags)
+            return has_tag if self.op != '!=' else not has_tag
+        if self.field == 'content':
+            return self.value in thought.content.lower()
+        if self.field == 'created':
+            return self.check(thought.created_at)
+        return self.check(thought.updated_at)
+
+    def __str__(self):
+        if self.field == 'done':
+            return "done" if self.value else "not done"
+        return f"{self.field}{self.op}{self.value}"
+
+
+@dataclass
+class Not:
+    operand: Any
+
+    def matches(self, thought) -> bool:
+        return not self.operand.matches(thought)
+
+    def __str__(self):
+        return f"not {self.operand}"
+
+
+@dataclass
+class And:
+    operands: List[Any]
+
+    def matches(self, thought) -> bool:
+        return all(operand.matches(thought) for operand in self.operands)
+
+    def __str__(self):
+        return " and ".join(_group(operand) for operand in self.operands)
+
+
+@dataclass
+class Or:
+    operands: List[Any]
+
+    def matches(self, thought) -> bool:
+        return any(operand.matches(thought) for operand in self.operands)
+
+    def __str__(self):
+        return " or ".join(_group(operand) for operand in self.operands)
+
+
+def _group(node) -> str:
+    return f"({node})" if isinstance(node, (And, Or)) else str(node)
+
+
+@dataclass
+class Query:
+    """A parsed thought query"""
+    condition: Any = None
+    order_by: Optional[str] = None
+    descending: bool = True
+    limit: Optional[int] = None
+    workspace: bool = False
+
+
+class _Parser:
+    """Recursive-descent parser for the query grammar"""
+
+    def __init__(self, text: str):
+        self.tokens = []
+        position = 0
+        text = text.strip()
+        while position < len(text):
+            match = TOKEN_RE.match(text, position)
+            if not match or match.end() == position:
+                raise QueryError(f"Unexpected input at: {text[position:]!r}")
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == 'time':
+                kind = 'word'
+            elif kind == 'string':
+                value = value[1:-1]
+            self.tokens.append((kind, value if kind == 'string' else value.lower()))
+            position = match.end()
+        self.position = 0
+
+    def peek(self, offset: int = 0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def accept_word(self, word: str) -> bool:
+        if self.peek() == ('word', word):
+            self.position += 1
+            return True
+        return False
+
+    def expect_word(self) -> str:
+        kind, value = self.take()
+        if kind not in ('word', 'string'):
+            raise QueryError(f"Expected a value but found {value!r}")
+        return value
+
+    def parse(self) -> Query:
+        query = Query()
+        if self.accept_word('all'):
+            query.workspace = True
+        self.accept_word('thoughts')
+        if self.accept_word('where'):
+            query.condition = self.parse_or()
+        if self.accept_word('order'):
+            if not self.accept_word('by'):
+                raise QueryError("Expected 'by' after 'order'")
+            query.order_by = self.expect_word()
+            query.order_by = FIELD_ALIASES.get(query.order_by, query.order_by)
+            if query.order_by not in ORDER_KEYS:
+                raise QueryError(f"Cannot order by {query.order_by!r}")
+            # Priority sorts high-first by default, everything else low-first
+            query.descending = query.order_by == 'priority'
+            if self.accept_word('desc'):
+                query.descending = True
+            elif self.accept_word('asc'):
+                query.descending = False
+        if self.accept_word('limit'):
+            try:
+                query.limit = int(self.expect_word())
+            except ValueError:
+                raise QueryError("limit expects a number")
+        if self.peek()[0] is not None:
+            raise QueryError(f"Unexpected {self.peek()[1]!r}")
+        return query
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.accept_word('or'):
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or(operands)
+
+    def parse_and(self):
+        operands = [self.parse_not()]
+        while True:
+            if self.accept_word('and'):
+                operands.append(self.parse_not())
+            elif self.peek()[0] in ('word', 'string', 'paren') and self.peek() != ('paren', ')') \
+                    and self.peek()[1] not in ('or', 'order', 'limit'):
+                operands.append(self.parse_not())  # implicit 'and'
+            else:
+                break
+        return operands[0] if len(operands) == 1 else And(operands)
+
+    def parse_not(self):
+        if self.accept_word('not'):
+            return Not(self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind, value = self.take()
+        if kind == 'paren' and value == '(':
+            node = self.parse_or()
+            if self.take() != ('paren', ')'):
+                raise QueryError("Missing ')'")
+            return node
+        if kind == 'string':
+            return Predicate('content', '~', value)
+        if kind != 'word':
+            raise QueryError(f"Unexpected {value!r}")
+
+        name = FIELD_ALIASES.get(value, value)
+        if name == 'done':
+            return Predicate('done', '=', True)
+        if name == 'open':
+            return Predicate('done', '=', False)
+        if self.peek()[0] != 'op':
+            raise QueryError(f"Expected an operator after {value!r}")
+        _, op = self.take()
+        operand = self.expect_word()
+
+        if name == 'priority':
+            if op in (':', '~'):
+                op = '='
+            try:
+                return Predicate(name, op, int(operand))
+            except ValueError:
+                raise QueryError("priority expects a number")
+        if name in ('category', 'tag'):
+            if op not in ('=', ':', '!='):
+                raise QueryError(f"{name} supports ':', '=' and '!='")
+            return Predicate(name, '=' if op == ':' else op, operand)
+        if name == 'content':
+            return Predicate(name, '~', operand)
+        if name in ('created', 'updated'):
+            if op == '~':
+                raise QueryError(f"{name} does not support '~'")
+            try:
+                return Predicate(name, op, operand)
+            except ValueError:
+                raise QueryError(f"Invalid date {operand!r}")
+        raise QueryError(f"Unknown field {value!r}")
+
+
+def parse_query(text: str) -> Query:
+    """Parse query text into a Query"""
+    return _Parser(text).parse()
+
+
+@dataclass
+class AccessPath:
+    """One way of producing candidate thought IDs"""
+    description: str
+    estimate: int
+    fetch: Optional[Callable[[], Iterable[str]]]  # None means a full scan
+    conjunct: Any = None
+    exact: bool = False
+
+
+@dataclass
+class QueryPlan:
+    """A compiled query: an access path plus residual filtering, ordering and limit"""
+    query: Query
+    session_id: Optional[str]
+    access: AccessPath
+    residual: List[Any]
+    alternatives: List[AccessPath] = field(default_factory=list)
+
+    def explain(self) -> str:
+        """Describe the chosen plan"""
+        query = self.query
+        lines = ["Query plan:"]
+        scope = "workspace" if self.session_id is None else f"session {self.session_id}"
+        lines.append(f"  scope:   {scope}")
+        lines.append(f"  access:  {self.access.description} (~{self.access.estimate} candidates)")
+        if self.residual:
+            lines.append(f"  filter:  {' and '.join(_group(node) for node in self.residual)}")
+        order = query.order_by or 'priority'
+        lines.append(f"  order:   {order} {'desc' if query.descending else 'asc'}")
+        if query.limit is not None:
+            lines.append(f"  limit:   {query.limit}")
+        if len(self.alternatives) > 1:
+            lines.append("  considered:")
+            for path in self.alternatives:
+                lines.append(f"    {path.description} (~{path.estimate})")
+        return "\n".join(lines)
+
+
+class QueryPlanner:
+    """Compiles queries against a ThinkerApp's indexes and runs them"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _scope_size(self, session_id: Optional[str]) -> int:
+        analytics = self.app.analytics
+        return analytics.total if session_id is None else analytics.by_session[session_id]
+
+    def _access_paths(self, node, session_id):
+        """Return index access paths able to satisfy a single conjunct"""
+        app = self.app
+        if isinstance(node, Not) and isinstance(node.operand, Predicate) \
+                and node.operand.field == 'done':
+            node = Predicate('done', '=', not node.operand.value)
+        if not isinstance(node, Predicate):
+            return []
+
+        if node.field in ('category', 'tag', 'done') and node.op == '=':
+            index = {'category': app.category_index, 'tag': app.tag_index,
+                     'done': app.completed_index}[node.field]
+            ids = index.lookup(node.value, session_id)
+            return [AccessPath(f"index {node.field} = {node.value!r}", len(ids), lambda: ids, node, True)]
+
+        if node.field == 'priority' and node.op != '~':
+            compare = COMPARISONS[node.op]
+            buckets = [app.priority_index.lookup(value, session_id)
+                       for value in list(app.priority_index.values(session_id)) if compare(value, node.value)]
+            estimate = sum(len(ids) for ids in buckets)
+            fetch = lambda: (thought_id for ids in buckets for thought_id in ids)
+            return [AccessPath(f"index priority {node.op} {node.value}", estimate, fetch, node, True)]
+
+        if node.field in ('created', 'updated') and node.span is not None:
+            start, end = node.span
+            estimate = app.time_index.count(node.field, start, end, session_id)
+            fetch = lambda: app.time_index.range(node.field, start, end, session_id)
+            bounds = f"[{start or '-inf'}, {end or '+inf'})"
+            return [AccessPath(f"time index {node.field} in {bounds}", estimate, fetch, node, node.exact_span)]
+        return []
+
+    def plan(self, query: Query, session_id: Optional[str] = None) -> QueryPlan:
+        """Choose the most selective available index for a query"""
+        condition = query.condition
+        if condition is None:
+            conjuncts = []
+        elif isinstance(condition, And):
+            conjuncts = list(condition.operands)
+        else:
+            conjuncts = [condition]
+
+        scan = AccessPath("full scan", self._scope_size(session_id), None)
+        paths = [scan]
+        for conjunct in conjuncts:
+            for path in self._access_paths(conjunct, session_id):
+                path.conjunct = conjunct
+                paths.append(path)
+
+        best = min(paths, key=lambda path: path.estimate)
+        residual = [c for c in conjuncts if not (best.exact and c is best.conjunct)]
+        return QueryPlan(query, session_id, best, residual, paths)
+
+    def execute(self, plan: QueryPlan) -> List[Any]:
+        """Run a plan and return the matching thoughts in query order"""
+        app = self.app
+        if plan.access.fetch is None:
+            if plan.session_id is None:
+                candidates = (t for session in app.sessions for t in app.session_cache.touch(session))
+            else:
+                session = next(s for s in app.sessions if s.id == plan.session_id)
+                candidates = iter(app.session_cache.touch(session))
+        else:
+            candidates = self.fetch(plan.access.fetch())
+
+        residual = plan.residual
+        matches = (t for t in candidates if all(node.matches(t) for node in residual))
+        return self.order(plan.query, matches)
+
+    def fetch(self, thought_ids: Iterable[str]) -> Iterable[Any]:
+        """Resolve IDs from an index to thoughts, faulting each evicted session in once
+
+        Thoughts of evicted sessions come after the resident ones, a session at a time.
+        """
+        entries = self.app.thought_index.entries
+        evicted = {}
+        for thought_id in thought_ids:
+            session, thought = entries[thought_id]
+            if thought is None:
+                evicted.setdefault(session.id, (session, []))[1].append(thought_id)
+            else:
+                yield thought
+        for session, ids in evicted.values():
+            self.app.session_cache.touch(session)
+            for thought_id in ids:
+                yield entries[thought_id][1]
+
+    @staticmethod
+    def order(query: Query, thoughts: Iterable[Any]) -> List[Any]:
+        """Sort thoughts into query order, keeping only the first query.limit"""
+        primary = ORDER_KEYS[query.order_by or 'priority']
+        key = lambda t: (primary(t), t.created_at)
+        if query.limit is not None:
+            select = heapq.nlargest if query.descending else heapq.nsmallest
+            return select(query.limit, thoughts, key=key)
+        return sorted(thoughts, key=key, reverse=query.descending)
+
+
+@dataclass
+class ThoughtFilter:
+    """The GUI's live filter: text, category and tag prefixes, a priority range and status
+
+    Text is a case-insensitive substring of the content; category and tag match
+    by prefix so results narrow as you type.
+    """
+    text: str = ""
+    category: str = ""
+    tag: str = ""
+    min_priority: int = 1
+    max_priority: int = 5
+    done: Optional[bool] = None
+
+    def __post_init__(self):
+        self.text = self.text.strip().lower()
+        self.category = self.category.strip().lower()
+        self.tag = self.tag.strip().lower()
+
+    def is_empty(self) -> bool:
+        return (not self.text and not self.category and not self.tag and self.done is None
+                and self.min_priority <= 1 and self.max_priority >= 5)
+
+    def matches(self, thought) -> bool:
+        if self.done is not None and thought.is_completed != self.done:
+            return False
+        if not self.min_priority <= thought.priority <= self.max_priority:
+            return False
+        if self.category and not thought.category.lower().startswith(self.category):
+            return False
+        if self.tag and not any(tag.lower().startswith(self.tag) for tag in thought.tags):
+            return False
+        return not self.text or self.text in thought.content.lower()
+
+    def refines(self, previous: "ThoughtFilter") -> bool:
+        """Whether every thought this filter matches is also matched by previous
+
+        When it is, filtering can start from previous's results instead of everything.
+        """
+        return (previous.text in self.text
+                and self.category.startswith(previous.category)
+                and self.tag.startswith(previous.tag)
+                and previous.min_priority <= self.min_priority
+                and self.max_priority <= previous.max_priority
+                and (previous.done is None or previous.done == self.done))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Versioned data file schema
+Reads every historical layout of the data file, upgrading session records one at
+a time as they stream past, and writes the current versioned envelope.
+
+Schema versions:
+  0  a bare JSON array of sessions (the original thoughts.json)
+  1  {"sessions": [...], "metadata": {...}} as described by thoughts_template.json
+  2  {"schema_version": 2, "metadata": {...}, "sessions": [...]}
+  3  as 2, with due_at and remind_at on every thought (null when unset)
+  4  as 3, with parent_id on every thought (null for top-level thoughts)
+  5  as 4, with links on every thought: [[target thought id, link type], ...]
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from thinker_storage import JsonStream, encode_json_item, write_encoded_array
+
+SCHEMA_VERSION = 5
+
+# from_version -> function upgrading one session record to from_version + 1
+MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+
+class SchemaError(ValueError):
+    """Raised when a data file is not a workspace this version can read"""
+
+
+def migration(from_version: int):
+    """Register a record-level upgrade from from_version to the next version"""
+    def register(function):
+        MIGRATIONS[from_version] = function
+        return function
+    return register
+
+
+@migration(0)
+def _from_bare_list(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Version 1 only wrapped the array in an envelope; records are unchanged"""
+    return session
+
+
+@migration(1)
+def _fill_defaults(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Version 2 requires every session and thought field to be present"""
+    session.setdefault('description', '')
+    session.setdefault('updated_at', session.get('created_at', ''))
+    session.setdefault('thoughts', [])
+    session.setdefault('deleted_thoughts', {})
+    for thought in session['thoughts']:
+        thought.setdefault('category', 'general')
+        thought.setdefault('priority', 3)
+        thought.setdefault('tags', [])
+        thought.setdefault('updated_at', thought.get('created_at', ''))
+        thought.setdefault('is_completed', False)
+    return session
+
+
+@migration(2)
+def _add_due_dates(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Version 3 adds optional due dates and reminders to thoughts"""
+    for thought in session['thoughts']:
+        thought.setdefault('due_at', None)
+        thought.setdefault('remind_at', None)
+    return session
+
+
+@migration(3)
+def _add_parents(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Version 4 lets thoughts be sub-thoughts of another thought in the same session"""
+    for thought in session['thoughts']:
+        thought.setdefault('parent_id', None)
+    return session
+
+
+@migration(4)
+def _add_links(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Version 5 adds typed links from a thought to others, in any session"""
+    for thought in session['thoughts']:
+        thought.setdefault('links', [])
+    return session
+
+
+def upgrade_record(session: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """Apply every migration between version and SCHEMA_VERSION to one session record"""
+    for step in range(version, SCHEMA_VERSION):
+        session = MIGRATIONS[step](session)
+    return session
+
+
+class DataDocument:
+    """A data file opened for streaming; session records are upgraded as they are read
+
+    The schema version and any metadata placed before "sessions" are known as soon
+    as the document is opened; members after it (as in the template) are merged
+    into metadata once sessions() has been consumed.
+    """
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.stream = JsonStream(f, chunk_size)
+        self.metadata: Dict[str, Any] = {}
+        self.version: Optional[int] = None
+        self._members = None
+        self._has_sessions = True
+
+        first = self.stream.peek()
+        if first == '[':
+            self.version = 0
+        elif first == '{':
+            self._members = self.stream.keys()
+            self._has_sessions = False
+            for key in self._members:
+                if key == 'sessions':
+                    self._has_sessions = True
+                    break
+                self._read_member(key)
+            if self.version is None:
+                self.version = 1
+        else:
+            raise SchemaError("Not a Python Thinker data file")
+
+        if not isinstance(self.version, int) or self.version < 0:
+            raise SchemaError(f"Invalid schema version: {self.version!r}")
+        if self.version > SCHEMA_VERSION:
+            raise SchemaError(f"Data file uses schema version {self.version}; "
+                              f"this app only understands up to {SCHEMA_VERSION}")
+
+    def _read_member(self, key: str):
+        value = self.stream.value()
+        if key == 'schema_version':
+            self.version = value
+        elif key == 'metadata':
+            if not isinstance(value, dict):
+                raise SchemaError("metadata must be a JSON object")
+            self.metadata.update(value)
+
+    def sessions(self) -> Iterator[Dict[str, Any]]:
+        """Yield each session record upgraded to SCHEMA_VERSION"""
+        if self._has_sessions:
+            for record in self.stream.items():
+                if not isinstance(record, dict):
+                    raise SchemaError("Session records must be JSON objects")
+                yield upgrade_record(record, self.version)
+        if self._members is not None:
+            for key in self._members:
+                self._read_member(key)
+
+
+def encode_session(session: Dict[str, Any], indent: Optional[int] = 2) -> str:
+    """Encode one session record as it appears inside the envelope's sessions array"""
+    return encode_json_item(session, indent, level=2)
+
+
+def write_document(f, encoded_sessions: Iterable[str], metadata: Dict[str, Any], indent: Optional[int] = 2):
+    """Write the current envelope around sessions already encoded with encode_session
+
+    With indent=2 the output matches json.dump of the whole document with indent=2.
+    """
+    if indent is None:
+        f.write(f'{{"schema_version":{SCHEMA_VERSION},"metadata":')
+        f.write(json.dumps(metadata, ensure_ascii=False, separators=(',', ':')))
+        f.write(',"sessions":')
+        write_encoded_array(f, encoded_sessions, None)
+        f.write('}')
+        return
+
+    pad = ' ' * indent
+    f.write(f'{{\n{pad}"schema_version": {SCHEMA_VERSION},\n{pad}"metadata": ')
+    f.write(json.dumps(metadata, indent=indent, ensure_ascii=False).replace('\n', '\n' + pad))
+    f.write(f',\n{pad}"sessions": ')
+    write_encoded_array(f, encoded_sessions, indent, level=2)
+    f.write('\n}')
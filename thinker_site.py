@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Static site generation
+Renders every session, plus index pages by category, tag and month, to static
+HTML laid out like the markdown export. Each page's input is hashed and kept in
+a manifest, so a rebuild renders only the pages whose content changed; those
+are rendered in parallel across processes.
+"""
+
+import functools
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Tuple
+
+SITE_VERSION = 3  # bump when the page templates change to force a full rebuild
+MANIFEST = ".manifest.json"
+PARALLEL_THRESHOLD = 16  # fewer changed pages than this are rendered in-process
+
+STYLE = """body { font-family: sans-serif; max-width: 52em; margin: 2em auto; padding: 0 1em; color: #222; }
+li { margin-bottom: .6em; } .meta { color: #666; font-size: .9em; } .done { color: #888; text-decoration: line-through; }
+nav a { margin-right: 1em; }"""
+
+
+@dataclass
+class SiteReport:
+    """What one site build did"""
+    rendered: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    seconds: float = 0.0  # the whole build
+    render_seconds: float = 0.0  # rendering and writing changed pages
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.rendered / self.render_seconds if self.render_seconds else 0.0
+
+
+@functools.lru_cache(maxsize=4096)
+def slug(name: str) -> str:
+    """File-name-safe form of a category, tag or month, distinct for distinct names
+
+    Names that don't survive slugging unchanged get a hash of the name after a
+    double dash, which a plain slug never contains.
+    """
+    plain = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+    if plain == name:
+        return plain
+    return f"{plain or 'untitled'}--{hashlib.sha1(name.encode('utf-8')).hexdigest()[:10]}"
+
+
+def _page(title: str, body: List[str], root: str) -> str:
+    return "\n".join([
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8">',
+        f"<title>{html.escape(title)}</title>",
+        f"<style>{STYLE}</style></head><body>",
+        f'<nav><a href="{root}index.html">🧠 All sessions</a></nav>',
+        f"<h1>{html.escape(title)}</h1>",
+        *body,
+        "</body></html>",
+        "",
+    ])
+
+
+def _thought_item(thought: Dict[str, Any], extra: str = "") -> str:
+    checkbox = "☑" if thought['is_completed'] else "☐"
+    css = ' class="done"' if thought['is_completed'] else ""
+    tags = f" | Tags: {html.escape(', '.join(thought['tags']))}" if thought['tags'] else ""
+    due = f" | Due: {html.escape(thought['due_at'][:16])}" if thought['due_at'] else ""
+    return (f"<li><span{css}>{checkbox} <strong>{html.escape(thought['content'])}</strong></span>{extra}<br>"
+            f'<span class="meta">Priority: {"⭐" * thought["priority"]}{tags}{due} | '
+            f"Created: {html.escape(thought['created_at'][:19])}</span></li>")
+
+
+def render_session(session: Dict[str, Any]) -> str:
+    """A session page, grouped by category like the markdown export"""
+    body = []
+    if session['description']:
+        body.append(f"<p><strong>Description:</strong> {html.escape(session['description'])}</p>")
+    body.append(f'<p class="meta">Created: {html.escape(session["created_at"][:19])} | '
+                f'Updated: {html.escape(session["updated_at"][:19])} | '
+                f'Total Thoughts: {len(session["thoughts"])}</p>')
+
+    categories: Dict[str, List[Dict[str, Any]]] = {}
+    for thought in session['thoughts']:
+        categories.setdefault(thought['category'], []).append(thought)
+    for category, thoughts in categories.items():
+        body.append(f'<h2><a href="../categories/{slug(category)}.html">{html.escape(category.title())}</a></h2>')
+        body.append("<ul>")
+        thoughts.sort(key=lambda t: t['priority'], reverse=True)
+        body.extend(_thought_item(thought) for thought in thoughts)
+        body.append("</ul>")
+    return _page(session['title'], body, "../")
+
+
+def render_listing(title: str, entries: List[Tuple[Dict[str, Any], str, str]]) -> str:
+    """An index page of thoughts, each linking back to its session"""
+    body = [f'<p class="meta">{len(entries)} thoughts</p>', "<ul>"]
+    for thought, session_id, session_title in entries:
+        link = f' — <a href="../sessions/{session_id}.html">{html.escape(session_title)}</a>'
+        body.append(_thought_item(thought, link))
+    body.append("</ul>")
+    return _page(title, body, "../")
+
+
+def render_home(sessions: List[Dict[str, Any]], indexes: Dict[str, List[Tuple[str, str, int]]]) -> str:
+    """The front page: every session plus links to the index pages"""
+    body = ["<h2>Sessions</h2>", "<ul>"]
+    for session in sessions:
+        body.append(f'<li><a href="sessions/{session["id"]}.html">{html.escape(session["title"])}</a> '
+                    f'<span class="meta">{session["thoughts"]} thoughts ({session["completed"]} completed) | '
+                    f'Updated: {html.escape(session["updated_at"][:19])}</span></li>')
+    body.append("</ul>")
+    for heading, links in indexes.items():
+        body.append(f"<h2>{heading}</h2>")
+        body.append("<p>" + " · ".join(f'<a href="{path}">{html.escape(name)}</a> ({count})'
+                                       for name, path, count in links) + "</p>")
+    return _page("Thinking Sessions", body, "")
+
+
+RENDERERS: Dict[str, Callable[..., str]] = {
+    'session': render_session,
+    'listing': render_listing,
+    'home': render_home,
+}
+
+
+# Jobs of the build in progress; forked workers inherit them, so only paths are pickled
+_PENDING: Dict[str, Tuple[str, str, str, tuple]] = {}
+
+
+def write_page(job) -> str:
+    """Render one page and write it atomically (runs in a worker process)
+
+    job is a (directory, path, kind, arguments) tuple, or a path in _PENDING.
+    """
+    directory, path, kind, arguments = _PENDING[job] if isinstance(job, str) else job
+    target = os.path.join(directory, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(RENDERERS[kind](*arguments))
+    os.replace(target + ".tmp", target)
+    return path
+
+
+def _sha1(*parts: str) -> str:
+    return hashlib.sha1("\x00".join(parts).encode('utf-8')).hexdigest()
+
+
+def _collect_pages(app) -> Dict[str, Tuple[str, str, tuple]]:
+    """Every page of the site as path -> (content hash, renderer, arguments)
+
+    Each thought is encoded and hashed once; page hashes combine those digests.
+    """
+    pages: Dict[str, Tuple[str, str, tuple]] = {}
+    groups: Dict[str, Dict[str, list]] = {'categories': {}, 'tags': {}, 'months': {}}
+    home_sessions = []
+    for session in app.sessions:
+        thoughts = [dict(vars(thought)) for thought in session.thoughts]
+        digests = [_sha1(json.dumps(thought, sort_keys=True, ensure_ascii=False)) for thought in thoughts]
+        record = {'id': session.id, 'title': session.title, 'description': session.description,
+                  'created_at': session.created_at, 'updated_at': session.updated_at, 'thoughts': thoughts}
+        meta = [session.id, session.title, session.description, session.created_at, session.updated_at]
+        pages[f"sessions/{session.id}.html"] = (_sha1('session', *meta, *digests), 'session', (record,))
+        total, completed = app.analytics.session_counts(session.id)
+        home_sessions.append({'id': session.id, 'title': session.title, 'updated_at': session.updated_at,
+                              'thoughts': total, 'completed': completed})
+        for thought, digest in zip(thoughts, digests):
+            # (sort key, hash part, entry), listed highest priority first, then oldest
+            item = ((-thought['priority'], thought['created_at']), f"{session.id}:{session.title}:{digest}",
+                    (thought, session.id, session.title))
+            keys = [('categories', thought['category']), ('months', thought['created_at'][:7])]
+            keys += [('tags', tag) for tag in dict.fromkeys(thought['tags'])]
+            for group, name in keys:
+                groups[group].setdefault(name, []).append(item)
+
+    titles = {'categories': "Category", 'tags': "Tag", 'months': "Month"}
+    indexes = {}
+    for group, by_name in groups.items():
+        links = []
+        for name, items in sorted(by_name.items(), reverse=group == 'months'):
+            items.sort(key=itemgetter(0))
+            title = f"{titles[group]}: {name}"
+            path = f"{group}/{slug(name)}.html"
+            pages[path] = (_sha1('listing', title, *(part for _, part, _ in items)), 'listing',
+                           (title, [entry for _, _, entry in items]))
+            links.append((name, path, len(items)))
+        indexes[group.title()] = links
+    home = (home_sessions, indexes)
+    pages["index.html"] = (_sha1('home', json.dumps(home, sort_keys=True, ensure_ascii=False)), 'home', home)
+    return pages
+
+
+def build_site(app, directory: str = "site", workers: int = None,
+               progress: Callable[[float], None] = None) -> SiteReport:
+    """Render the workspace to directory, skipping pages whose input is unchanged"""
+    start = time.perf_counter()
+    report = SiteReport()
+    manifest_path = os.path.join(directory, MANIFEST)
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest: Dict[str, str] = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    pages = _collect_pages(app)
+    hashes, jobs = {}, []
+    for path, (digest, kind, arguments) in pages.items():
+        hashes[path] = _sha1(str(SITE_VERSION), digest)
+        if manifest.get(path) == hashes[path] and os.path.exists(os.path.join(directory, path)):
+            report.unchanged += 1
+        else:
+            jobs.append((directory, path, kind, arguments))
+
+    render_start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    executor = None
+    if len(jobs) >= PARALLEL_THRESHOLD and workers > 1:
+        if 'fork' in multiprocessing.get_all_start_methods():
+            _PENDING.update((job[1], job) for job in jobs)
+            executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+            jobs_to_send = [job[1] for job in jobs]
+        else:
+            executor = ProcessPoolExecutor(workers)
+            jobs_to_send = jobs
+        done = executor.map(write_page, jobs_to_send, chunksize=max(1, len(jobs) // (4 * workers)))
+    else:
+        done = map(write_page, jobs)
+    try:
+        for count, _ in enumerate(done, 1):
+            report.rendered = count
+            if progress:
+                progress(count / len(jobs))
+    finally:
+        if executor:
+            executor.shutdown()
+        _PENDING.clear()
+    report.render_seconds = time.perf_counter() - render_start
+
+    for path in set(manifest) - set(pages):
+        target = os.path.join(directory, path)
+        if os.path.exists(target):
+            os.remove(target)
+        report.removed += 1
+
+    os.makedirs(directory, exist_ok=True)
+    with open(manifest_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(hashes, f)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    report.seconds = time.perf_counter() - start
+    return report
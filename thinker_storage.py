@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Data file storage helpers
+Transparent gzip/bz2/lzma compression chosen by file extension, plus streaming
+JSON array reading and writing so large workspaces never exist twice in memory.
+"""
+
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional
+
+CODECS = {
+    '.gz': gzip,
+    '.bz2': bz2,
+    '.xz': lzma,
+    '.lzma': lzma,
+}
+
+# Errors a corrupt or truncated compressed stream can raise on top of JSON errors
+STREAM_ERRORS = (OSError, EOFError, lzma.LZMAError)
+
+DATA_FILE_TYPES = [
+    ("JSON files", "*.json"),
+    ("Compressed JSON", "*.json.gz *.json.bz2 *.json.xz"),
+    ("All files", "*.*"),
+]
+
+
+def codec_for(path: str) -> Optional[str]:
+    """Return the compression extension for a path ('.gz', '.xz', ...) or None"""
+    extension = os.path.splitext(path)[1].lower()
+    return extension if extension in CODECS else None
+
+
+def archive_file(data_file: str) -> str:
+    """Return the cold-store path for a data file (thoughts.json.gz -> thoughts.archive.json.gz)"""
+    codec = codec_for(data_file) or ''
+    stem, extension = os.path.splitext(data_file[:len(data_file) - len(codec)])
+    return f"{stem}.archive{extension or '.json'}{codec}"
+
+
+def open_data_file(path: str, mode: str = 'r', codec: str = None, fileobj=None):
+    """Open a data file in text mode, (de)compressing according to its extension
+
+    fileobj, if given, is an already open binary file for path; its position then
+    tracks how much of the (possibly compressed) file has been consumed.
+    """
+    codec = codec if codec is not None else codec_for(path)
+    if codec:
+        return CODECS[codec].open(fileobj or path, mode + 't', encoding='utf-8')
+    if fileobj is not None:
+        return io.TextIOWrapper(fileobj, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+@contextmanager
+def atomic_data_writer(path: str):
+    """Write a data file through a temporary file that replaces it only on success"""
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.tmp")
+    try:
+        with open_data_file(temp_path, 'w', codec=codec_for(path) or '') as f:
+            yield f
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def encode_json_item(item: Any, indent: Optional[int] = 2, level: int = 1) -> str:
+    """Encode one array element exactly as it appears inside the saved array
+
+    level is the element's nesting depth in the document (1 for a top-level array).
+    """
+    if indent is None:
+        return json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+    # Encoded JSON never contains a raw newline inside a string, so this indents every line
+    pad = ' ' * (indent * level)
+    return pad + json.dumps(item, indent=indent, ensure_ascii=False).replace('\n', '\n' + pad)
+
+
+def write_encoded_array(f, encoded_items: Iterable[str], indent: Optional[int] = 2, level: int = 1):
+    """Write already-encoded elements (from encode_json_item) as a JSON array"""
+    if indent is None:
+        f.write('[')
+        for position, text in enumerate(encoded_items):
+            if position:
+                f.write(',')
+            f.write(text)
+        f.write(']')
+        return
+
+    empty = True
+    for text in encoded_items:
+        f.write('[\n' if empty else ',\n')
+        f.write(text)
+        empty = False
+    f.write('[]' if empty else '\n' + ' ' * (indent * (level - 1)) + ']')
+
+
+def write_json_array(f, items: Iterable[Any], indent: Optional[int] = 2):
+    """Stream a JSON array to a file one element at a time
+
+    With indent=2 the output matches json.dump(list(items), f, indent=2); with
+    indent=None a compact separator-free form is written.
+    """
+    write_encoded_array(f, (encode_json_item(item, indent) for item in items), indent)
+
+
+class JsonStream:
+    """Incremental reader over a text file holding one JSON document
+
+    Values are decoded with raw_decode as soon as they are complete. When a value
+    spans the buffered text the read size grows geometrically, keeping the total
+    decoding work linear even for one very large value.
+    """
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = f.read(chunk_size)
+        self.position = 0
+        self.eof = not self.buffer
+
+    def _read_more(self, size: int):
+        chunk = self.f.read(size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or '' at the end of the file"""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in ' \t\r\n':
+                self.position += 1
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position + 1]
+            self._read_more(self.chunk_size)
+
+    def expect(self, char: str, message: str = None):
+        """Consume char or raise JSONDecodeError"""
+        if self.peek() != char:
+            raise json.JSONDecodeError(message or f"Expected '{char}'", self.buffer, self.position)
+        self.position += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, self.position)
+                complete = end < len(self.buffer) or self.eof
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                complete = False
+            if complete:
+                break
+            self._read_more(max(self.chunk_size, len(self.buffer) - self.position))
+        self.position = end
+        if self.position > self.chunk_size:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+        return item
+
+    def items(self) -> Iterator[Any]:
+        """Yield the elements of the array that starts at the current position"""
+        self.expect('[', "Expected a JSON array")
+        if self.peek() == ']':
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ']':
+                self.position += 1
+                return
+            self.expect(',', "Expected ',' between array elements")
+
+    def keys(self) -> Iterator[str]:
+        """Yield the keys of the object that starts here; consume each value before resuming"""
+        self.expect('{', "Expected a JSON object")
+        if self.peek() == '}':
+            self.position += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise json.JSONDecodeError("Expected an object key", self.buffer, self.position)
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == '}':
+                self.position += 1
+                return
+            self.expect(',', "Expected ',' between object members")
+
+
+def iter_json_array(f, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without reading the whole file"""
+    return JsonStream(f, chunk_size).items()
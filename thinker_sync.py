@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Incremental change feeds and replica sync
+Watermark-based export of only the thoughts created, updated or deleted since the
+previous export of a session, and Merkle-tree reconciliation of two workspaces.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from thinker_schema import DataDocument, encode_session, write_document
+from thinker_storage import open_data_file, atomic_data_writer
+
+
+def tombstone_file(data_file: str) -> str:
+    """Return the path of the deleted-session tombstones kept next to a data file"""
+    return f"{data_file}.tombstones.json"
+
+
+def load_tombstones(data_file: str) -> Dict[str, str]:
+    """Load {session_id: deleted_at} for sessions deleted from a workspace"""
+    path = tombstone_file(data_file)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def save_tombstones(data_file: str, tombstones: Dict[str, str]):
+    """Persist deleted-session tombstones (the file is only written once there are any)"""
+    path = tombstone_file(data_file)
+    if tombstones or os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(tombstones, f, indent=2)
+
+
+def watermark_file(data_file: str) -> str:
+    """Return the path of the export watermark state kept next to a data file"""
+    return f"{data_file}.exports.json"
+
+
+def load_watermarks(path: str) -> Dict[str, Dict[str, str]]:
+    """Load {target: {session_id: watermark}}; missing or unreadable state means 'export everything'"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def save_watermarks(path: str, watermarks: Dict[str, Dict[str, str]]):
+    """Persist export watermarks"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(watermarks, f, indent=2)
+
+
+def _after(watermark: str) -> str:
+    """Smallest bound strictly greater than a watermark, for start-inclusive range queries"""
+    return watermark + '\x00'
+
+
+def session_changes(app, session, since: str = None) -> List[dict]:
+    """Collect change records for one session since a watermark (None means everything)
+
+    Updated thoughts come from the updated_at time index, so the cost is
+    proportional to the number of changes rather than the size of the session.
+    """
+    changes = []
+    if since is None or session.updated_at > since:
+        changes.append({
+            'op': 'session', 'session_id': session.id, 'title': session.title,
+            'description': session.description, 'created_at': session.created_at,
+            'updated_at': session.updated_at,
+        })
+
+    start = _after(since) if since else None
+    for thought_id in app.time_index.range('updated', start, None, session.id):
+        _, thought = app.thought_index.get(thought_id)
+        changes.append({'op': 'upsert', 'session_id': session.id, 'thought': asdict(thought)})
+
+    for thought_id, deleted_at in session.deleted_thoughts.items():
+        if since is None or deleted_at > since:
+            changes.append({'op': 'delete', 'session_id': session.id, 'id': thought_id,
+                            'deleted_at': deleted_at})
+    return changes
+
+
+def export_changes(app, sessions, target: str) -> Dict[str, int]:
+    """Append changes for each session since its last export to target as JSON lines
+
+    Returns counts per operation. Watermarks only advance after the feed has
+    been written, so a failed export is retried in full next time.
+    """
+    state_path = watermark_file(app.data_file)
+    watermarks = load_watermarks(state_path)
+    target_key = os.path.abspath(target)
+    marks = watermarks.setdefault(target_key, {})
+    export_time = datetime.datetime.now().isoformat()
+
+    counts = {'session': 0, 'upsert': 0, 'delete': 0, 'delete_session': 0}
+    with open(target, 'a', encoding='utf-8') as f:
+        for session in sessions:
+            for change in session_changes(app, session, marks.get(session.id)):
+                f.write(json.dumps(change, ensure_ascii=False) + '\n')
+                counts[change['op']] += 1
+
+        if sessions is app.sessions:
+            # Whole-workspace exports also report deleted sessions
+            since = marks.get('*')
+            for session_id, deleted_at in app.deleted_sessions.items():
+                if since is None or deleted_at > since:
+                    change = {'op': 'delete_session', 'session_id': session_id, 'deleted_at': deleted_at}
+                    f.write(json.dumps(change) + '\n')
+                    counts['delete_session'] += 1
+            marks['*'] = export_time
+
+    for session in sessions:
+        marks[session.id] = export_time
+    save_watermarks(state_path, watermarks)
+    return counts
+
+
+META_FIELDS = ('title', 'description', 'updated_at')
+THOUGHT_FIELDS = ('id', 'content', 'category', 'priority', 'tags', 'created_at', 'updated_at', 'is_completed',
+                  'due_at', 'remind_at', 'parent_id', 'links')
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def thought_digest(thought: Dict[str, Any]) -> str:
+    """Content hash of a thought in its saved dictionary form"""
+    return hashlib.sha1(repr(tuple(thought[key] for key in THOUGHT_FIELDS)).encode('utf-8')).hexdigest()
+
+
+def _bucket(thought_id: str) -> str:
+    return thought_id[-2:]
+
+
+def _thoughts(session: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Iterate a session dictionary's thoughts whether held as a list or an ID map"""
+    thoughts = session['thoughts']
+    return thoughts.values() if isinstance(thoughts, dict) else thoughts
+
+
+def _thought_map(session: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Return a session dictionary's thoughts keyed by ID"""
+    thoughts = session['thoughts']
+    return thoughts if isinstance(thoughts, dict) else {t['id']: t for t in thoughts}
+
+
+def session_node(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Hash one session dictionary into its Merkle subtree (session -> bucket -> thought)"""
+    buckets: Dict[str, Dict[str, str]] = {}
+    for thought in _thoughts(session):
+        buckets.setdefault(_bucket(thought['id']), {})[thought['id']] = thought_digest(thought)
+    bucket_hashes = {
+        key: _digest(*(f"{tid}:{leaf}" for tid, leaf in sorted(leaves.items())))
+        for key, leaves in buckets.items()
+    }
+    meta = _digest(*(session[key] for key in META_FIELDS))
+    tombstones = _digest(*(f"{tid}:{at}" for tid, at in sorted(session.get('deleted_thoughts', {}).items())))
+    return {
+        'hash': _digest(meta, tombstones, *(f"{key}:{value}" for key, value in sorted(bucket_hashes.items()))),
+        'meta': meta,
+        'tombstones': tombstones,
+        'bucket_hashes': bucket_hashes,
+        'buckets': buckets,
+    }
+
+
+class MerkleTree:
+    """Content hashes arranged workspace -> session -> bucket -> thought
+
+    Buckets group thoughts by the last two characters of their ID, so when
+    two large sessions differ in a handful of thoughts only those buckets'
+    leaves are compared. Built from session nodes (see session_node), which a
+    replica may keep from one sync to the next.
+    """
+
+    def __init__(self, sessions: Dict[str, Dict[str, Any]], deleted_sessions: Dict[str, str]):
+        self.sessions = sessions
+        self.root = _digest(
+            *(f"{sid}:{node['hash']}" for sid, node in sorted(self.sessions.items())),
+            *(f"-{sid}:{at}" for sid, at in sorted(deleted_sessions.items())),
+        )
+
+
+class SyncReport:
+    """Counts of what a sync compared and changed on each side"""
+
+    def __init__(self):
+        self.sessions_compared = 0
+        self.sessions_identical = 0
+        self.buckets_compared = 0
+        self.thoughts_compared = 0
+        self.changes = {'local': {}, 'remote': {}}
+
+    def count(self, side: str, op: str):
+        self.changes[side][op] = self.changes[side].get(op, 0) + 1
+
+    def lines(self) -> List[str]:
+        lines = [
+            f"Sessions compared: {self.sessions_compared} ({self.sessions_identical} identical by hash)",
+            f"Buckets compared: {self.buckets_compared} | thoughts compared: {self.thoughts_compared}",
+        ]
+        for side in ('local', 'remote'):
+            ops = self.changes[side]
+            summary = ", ".join(f"{count} {op.replace('_', ' ')}" for op, count in sorted(ops.items()))
+            lines.append(f"{side.title()} changes: {summary or 'none'}")
+        return lines
+
+
+class FileReplica:
+    """A workspace held as plain dictionaries, loaded from and written back to a data file
+
+    Each session's thoughts are kept as an ID -> thought map while syncing so
+    individual changes cost O(1) instead of a scan of the session.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.owner: Dict[str, str] = {}  # thought id -> session id
+        self.metadata: Dict[str, Any] = {"created_by": "Python Thinker App"}
+        if os.path.exists(path):
+            with open_data_file(path) as f:
+                document = DataDocument(f)
+                for session in document.sessions():
+                    self._adopt(session)
+            self.metadata = document.metadata
+        self.deleted_sessions = load_tombstones(path)
+
+    def _adopt(self, session: Dict[str, Any]):
+        session.setdefault('deleted_thoughts', {})
+        session['thoughts'] = {thought['id']: thought for thought in _thoughts(session)}
+        for thought_id in session['thoughts']:
+            self.owner[thought_id] = session['id']
+        self.sessions[session['id']] = session
+
+    def session_dict(self, session_id: str) -> Dict[str, Any]:
+        return self.sessions[session_id]
+
+    def merkle_tree(self) -> MerkleTree:
+        nodes = {session_id: session_node(session) for session_id, session in self.sessions.items()}
+        return MerkleTree(nodes, self.deleted_sessions)
+
+    def add_session(self, session: Dict[str, Any]):
+        self._adopt(json.loads(json.dumps(session)))
+        self.deleted_sessions.pop(session['id'], None)
+
+    def delete_session(self, session_id: str, deleted_at: str):
+        session = self.sessions.pop(session_id, None)
+        for thought_id in (session['thoughts'] if session else ()):
+            if self.owner.get(thought_id) == session_id:
+                del self.owner[thought_id]
+        self.deleted_sessions[session_id] = deleted_at
+
+    def set_session_meta(self, session_id: str, meta: Dict[str, Any]):
+        self.sessions[session_id].update(meta)
+
+    def put_thought(self, session_id: str, thought: Dict[str, Any]):
+        previous = self.owner.get(thought['id'])
+        if previous is not None and previous in self.sessions:
+            self.sessions[previous]['thoughts'].pop(thought['id'], None)
+        session = self.sessions[session_id]
+        session['thoughts'][thought['id']] = dict(thought)
+        session['deleted_thoughts'].pop(thought['id'], None)
+        self.owner[thought['id']] = session_id
+
+    def drop_thought(self, session_id: str, thought_id: str, deleted_at: str):
+        session = self.sessions[session_id]
+        if session['thoughts'].pop(thought_id, None) is not None and self.owner.get(thought_id) == session_id:
+            del self.owner[thought_id]
+        session['deleted_thoughts'][thought_id] = max(deleted_at, session['deleted_thoughts'].get(thought_id, ''))
+
+    def commit(self, indent=2):
+        """Write the merged workspace back to its data file"""
+        records = (encode_session(dict(session, thoughts=list(session['thoughts'].values())), indent)
+                   for session in self.sessions.values())
+        with atomic_data_writer(self.path) as f:
+            write_document(f, records, self.metadata, indent)
+        save_tombstones(self.path, self.deleted_sessions)
+
+
+class AppReplica:
+    """The open ThinkerApp workspace, mutated through its index-aware methods
+
+    Session nodes are kept on the app between syncs and rehashed only when the
+    session's version changed, so an unchanged (or evicted) session is neither
+    rehashed nor faulted back in. Sessions that do differ are read on demand.
+    Every change logs its inverse, so rollback() can undo a failed merge.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._by_id = {session.id: session for session in app.sessions}
+        self.deleted_sessions = app.deleted_sessions
+        self._undo: List[Callable[[], None]] = []
+        self._dirty = ({session_id: set(ids) for session_id, ids in app.dirty.items()}, app.structure_dirty)
+
+    def session_dict(self, session_id: str) -> Dict[str, Any]:
+        # Thought __dict__s are shared rather than copied: they are only read while
+        # merging, and copied by the other replica before being stored
+        session = self._by_id[session_id]
+        return dict(vars(session), thoughts=[vars(thought) for thought in session.thoughts])
+
+    def merkle_tree(self) -> MerkleTree:
+        app = self.app
+        cached, app.merkle_nodes = app.merkle_nodes, {}
+        nodes = {}
+        for session in app.sessions:
+            version = app.session_version(session)
+            entry = cached.get(session.id)
+            # A reload replaces the session objects (and may reuse versions), so the object must match too
+            if entry is None or entry[0] is not session or entry[1] != version:
+                spill = app.session_cache.spilled_record(session)
+                record = json.loads(spill.text(spill.indent)) if spill else self.session_dict(session.id)
+                entry = (session, version, session_node(record))
+            app.merkle_nodes[session.id] = entry
+            nodes[session.id] = entry[2]
+        return MerkleTree(nodes, self.deleted_sessions)
+
+    def add_session(self, session: Dict[str, Any]):
+        from thinker_app import session_from_dict
+        new_session = session_from_dict(json.loads(json.dumps(dict(session, thoughts=list(_thoughts(session))))))
+        restore_tombstone = _entry_restorer(self.app.deleted_sessions, new_session.id)
+        self.app.insert_session(new_session)
+        self._by_id[new_session.id] = new_session
+
+        def undo():
+            self.app.remove_session(new_session, None)
+            del self._by_id[new_session.id]
+            restore_tombstone()
+        self._undo.append(undo)
+
+    def delete_session(self, session_id: str, deleted_at: str):
+        app = self.app
+        session = self._by_id.pop(session_id, None)
+        restore_tombstone = _entry_restorer(app.deleted_sessions, session_id)
+        if not session:
+            app.deleted_sessions[session_id] = deleted_at
+            app.structure_dirty = True
+            self._undo.append(restore_tombstone)
+            return
+        position, current = app.sessions.index(session), app.current_session is session
+        app.remove_session(session, deleted_at)
+
+        def undo():
+            app.insert_session(session)
+            app.sessions.remove(session)
+            app.sessions.insert(position, session)
+            if current:
+                app.current_session = session
+            self._by_id[session_id] = session
+            restore_tombstone()
+        self._undo.append(undo)
+
+    def set_session_meta(self, session_id: str, meta: Dict[str, Any]):
+        session = self._by_id[session_id]
+        previous = {key: getattr(session, key) for key in meta}
+        for key, value in meta.items():
+            setattr(session, key, value)
+        self.app.mark_dirty(session)
+
+        def undo():
+            for key, value in previous.items():
+                setattr(session, key, value)
+            self.app.mark_dirty(session)
+        self._undo.append(undo)
+
+    def put_thought(self, session_id: str, thought: Dict[str, Any]):
+        from thinker_app import Thought
+        session, new_thought = self._by_id[session_id], Thought(**thought)
+        found = self._place(thought['id'])
+        restore_tombstone = _entry_restorer(session.deleted_thoughts, thought['id'])
+        self.app.put_thought(session, new_thought)
+
+        def undo():
+            self.app._unindex_thought(session, new_thought)
+            session.thoughts.remove(new_thought)
+            if found:
+                self._put_back(*found)
+            restore_tombstone()
+        self._undo.append(undo)
+
+    def drop_thought(self, session_id: str, thought_id: str, deleted_at: str):
+        session = self._by_id[session_id]
+        found = self._place(thought_id)
+        removed = found if found and found[0] is session else None
+        restore_tombstone = _entry_restorer(session.deleted_thoughts, thought_id)
+        self.app.drop_thought(session, thought_id, deleted_at)
+
+        def undo():
+            if removed:
+                self._put_back(*removed)
+            restore_tombstone()
+        self._undo.append(undo)
+
+    def _place(self, thought_id: str) -> Optional[tuple]:
+        """(session, thought, position in the session's list) of a thought, if present"""
+        found = self.app.thought_index.get(thought_id)
+        return (found[0], found[1], found[0].thoughts.index(found[1])) if found else None
+
+    def _put_back(self, session, thought, position: int):
+        session.thoughts.insert(position, thought)
+        self.app._index_thought(session, thought)
+
+    def rollback(self):
+        """Undo every change made through this replica, newest first, and restore the dirty state"""
+        while self._undo:
+            self._undo.pop()()
+        self.app.dirty, self.app.structure_dirty = self._dirty
+
+    def commit(self, indent=2):
+        """Nothing to write: the caller saves the app as usual"""
+
+
+def _entry_restorer(mapping: Dict[str, Any], key: str) -> Callable[[], None]:
+    """Return a function putting mapping[key] back as it is now (present or not)"""
+    present, value = key in mapping, mapping.get(key)
+
+    def restore():
+        if present:
+            mapping[key] = value
+        else:
+            mapping.pop(key, None)
+    return restore
+
+
+def _newer(mine: Dict[str, Any], theirs: Dict[str, Any]) -> bool:
+    """Whether mine wins a conflict: later updated_at, ties broken by content hash"""
+    return (mine['updated_at'], thought_digest(mine)) >= (theirs['updated_at'], thought_digest(theirs))
+
+
+def _plan_meta(session_id, local_session, remote_session, local_node, remote_node, plan):
+    """Metadata: the copy with the later updated_at wins"""
+    if local_node['meta'] != remote_node['meta']:
+        newer, older = (local_session, 'remote') if local_session['updated_at'] >= remote_session['updated_at'] \
+            else (remote_session, 'local')
+        plan.append((older, 'set_session_meta', session_id, ({key: newer[key] for key in META_FIELDS},)))
+
+
+def _differing_places(session_id, local_session, remote_session, local_node, remote_node,
+                      local_places, remote_places, report):
+    """Record where each thought of a differing bucket lives on either side"""
+    local_thoughts = remote_thoughts = None
+    for key in set(local_node['bucket_hashes']) | set(remote_node['bucket_hashes']):
+        if local_node['bucket_hashes'].get(key) == remote_node['bucket_hashes'].get(key):
+            continue
+        report.buckets_compared += 1
+        local_leaves = local_node['buckets'].get(key, {})
+        remote_leaves = remote_node['buckets'].get(key, {})
+        for thought_id in set(local_leaves) | set(remote_leaves):
+            if local_leaves.get(thought_id) == remote_leaves.get(thought_id):
+                continue
+            if local_thoughts is None:
+                local_thoughts, remote_thoughts = _thought_map(local_session), _thought_map(remote_session)
+            if thought_id in local_thoughts:
+                local_places[thought_id] = (session_id, local_thoughts[thought_id])
+            if thought_id in remote_thoughts:
+                remote_places[thought_id] = (session_id, remote_thoughts[thought_id])
+
+
+def _plan_thoughts(local_places, remote_places, local_dead, remote_dead, plan, report):
+    """Decide every differing thought across sessions, so a thought moved to another
+    session is a put where it now lives plus a tombstone where it was
+    """
+    places = {'local': local_places, 'remote': remote_places}
+    dead = {'local': local_dead, 'remote': remote_dead}
+    for thought_id in set(local_places) | set(remote_places):
+        mine, theirs = local_places.get(thought_id), remote_places.get(thought_id)
+        if mine is None and theirs is None:
+            continue
+        report.thoughts_compared += 1
+        if mine and theirs:
+            winner, loser = ('local', 'remote') if _newer(mine[1], theirs[1]) else ('remote', 'local')
+            (winner_session, thought), (loser_session, _) = places[winner][thought_id], places[loser][thought_id]
+            plan.append((loser, 'put_thought', winner_session, (thought,)))
+            if winner_session != loser_session:
+                moved_at = thought['updated_at']
+                plan.append((loser, 'drop_thought', loser_session, (thought_id, moved_at)))
+                if dead[winner].get(loser_session, {}).get(thought_id, '') < moved_at:
+                    plan.append((winner, 'drop_thought', loser_session, (thought_id, moved_at)))
+            continue
+        side, other = ('local', 'remote') if mine else ('remote', 'local')
+        session_id, thought = mine or theirs
+        deleted_at = dead[other].get(session_id, {}).get(thought_id)
+        if deleted_at and deleted_at >= thought['updated_at']:
+            plan.append((side, 'drop_thought', session_id, (thought_id, deleted_at)))
+        else:
+            plan.append((other, 'put_thought', session_id, (thought,)))
+
+
+def _plan_tombstones(session_id, local_dead, remote_dead, handled, plan):
+    """Tombstones are merged as a union, keeping the latest deletion time"""
+    for thought_id, deleted_at in remote_dead.items():
+        if thought_id not in handled and local_dead.get(thought_id, '') < deleted_at:
+            plan.append(('local', 'drop_thought', session_id, (thought_id, deleted_at)))
+    for thought_id, deleted_at in local_dead.items():
+        if thought_id not in handled and remote_dead.get(thought_id, '') < deleted_at:
+            plan.append(('remote', 'drop_thought', session_id, (thought_id, deleted_at)))
+
+
+def reconcile(local, remote) -> SyncReport:
+    """Bring two replicas to the same state, transferring only differing subtrees
+
+    Every change is planned from both sides as they were before any is made,
+    then applied: additions of whole sessions first, then metadata and
+    thoughts, then deletions.
+    """
+    report = SyncReport()
+    local_tree, remote_tree = local.merkle_tree(), remote.merkle_tree()
+    if local_tree.root == remote_tree.root:
+        return report
+
+    adds, plan, deletes = [], [], []
+    local_places: Dict[str, tuple] = {}  # thought id -> (session id, thought) in differing buckets
+    remote_places: Dict[str, tuple] = {}
+    local_dead: Dict[str, Dict[str, str]] = {}  # session id -> deleted_thoughts, for shared sessions
+    remote_dead: Dict[str, Dict[str, str]] = {}
+    local_ids, remote_ids = set(local_tree.sessions), set(remote_tree.sessions)
+    for session_id in local_ids | remote_ids:
+        report.sessions_compared += 1
+        local_node, remote_node = local_tree.sessions.get(session_id), remote_tree.sessions.get(session_id)
+        if local_node and remote_node:
+            if local_node['hash'] == remote_node['hash']:
+                report.sessions_identical += 1
+                continue
+            mine, theirs = local.session_dict(session_id), remote.session_dict(session_id)
+            local_dead[session_id] = dict(mine['deleted_thoughts'])
+            remote_dead[session_id] = dict(theirs['deleted_thoughts'])
+            _plan_meta(session_id, mine, theirs, local_node, remote_node, plan)
+            _differing_places(session_id, mine, theirs, local_node, remote_node, local_places, remote_places, report)
+            continue
+        side, other = ('local', 'remote') if local_node else ('remote', 'local')
+        replica, other_replica = (local, remote) if local_node else (remote, local)
+        session = replica.session_dict(session_id)
+        deleted_at = other_replica.deleted_sessions.get(session_id)
+        if deleted_at and deleted_at >= session['updated_at']:
+            deletes.append((side, 'delete_session', session_id, (deleted_at,)))
+        else:
+            # Added empty: its thoughts are placed like any other, in case one moved there
+            adds.append((other, 'add_session', session_id,
+                         (dict(session, thoughts=[], deleted_thoughts=dict(session['deleted_thoughts'])),)))
+            places = local_places if local_node else remote_places
+            for thought in _thoughts(session):
+                places[thought['id']] = (session_id, thought)
+
+    _plan_thoughts(local_places, remote_places, local_dead, remote_dead, plan, report)
+    handled = set(local_places) | set(remote_places)
+    for session_id in local_dead:
+        _plan_tombstones(session_id, local_dead[session_id], remote_dead[session_id], handled, plan)
+
+    # Session tombstones for sessions neither side still has
+    for source, target, side in ((local, remote, 'remote'), (remote, local, 'local')):
+        for session_id, deleted_at in source.deleted_sessions.items():
+            if target.deleted_sessions.get(session_id, '') < deleted_at and \
+                    session_id not in local_ids and session_id not in remote_ids:
+                deletes.append((side, 'delete_session', session_id, (deleted_at,)))
+
+    replicas = {'local': local, 'remote': remote}
+    for side, op, session_id, args in adds + plan + deletes:
+        if op == 'add_session':
+            replicas[side].add_session(*args)
+        else:
+            getattr(replicas[side], op)(session_id, *args)
+        report.count(side, op)
+    return report
+
+
+def sync_with_file(app, path: str, indent=2) -> SyncReport:
+    """Two-way sync of the open workspace with another data file"""
+    remote = FileReplica(path)
+    local = AppReplica(app)
+    try:
+        report = reconcile(local, remote)
+        if report.changes['remote']:
+            remote.commit(indent)
+    except BaseException:
+        # The file is only written once the merge is complete; the workspace is put back
+        local.rollback()
+        raise
+    return report
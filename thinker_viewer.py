@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - Read-only viewer for huge data files
+Memory-maps an uncompressed data file, indexes where each session and thought
+starts and ends in one pass, and decodes only the records being shown or
+searched. Opening a multi-GB file costs a few bytes per thought instead of
+the Python objects load_data would build.
+
+    python thinker_viewer.py old_thoughts.json
+"""
+
+import bisect
+import json
+import mmap
+import re
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from thinker_storage import codec_for
+
+# One JSON string (escapes included) or one bracket; everything else is skipped in C
+TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_STRING = rb'"(?:[^"\\]|\\.)*"'
+# A whole thought in one match: an object of scalars and arrays of scalars (like tags)
+FLAT_OBJECT_RE = re.compile(rb'\{(?:' + _STRING + rb'|[^"{}\[\]]|\[(?:' + _STRING + rb'|[^"{}\[\]])*\])*\}',
+                            re.DOTALL)
+WHITESPACE = b' \t\r\n'
+
+
+@dataclass
+class SessionEntry:
+    """Where a session lives in the mapped file"""
+    id: str
+    title: str
+    start: int
+    end: int
+    first_thought: int  # position of its first thought in MappedWorkspace.thought_spans
+    thought_count: int
+
+
+class MappedWorkspace:
+    """A read-only, memory-mapped view of a data file
+
+    Works with every schema version. Thought spans are kept as a flat array of
+    (start, end) byte offsets, in file order.
+    """
+
+    def __init__(self, path: str, progress: Callable[[float], None] = None):
+        if codec_for(path):
+            raise ValueError(f"{path} is compressed; decompress it to view it memory-mapped")
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # an empty file cannot be mapped
+            self.file.close()
+            raise ValueError(f"{path} is empty")
+        self.sessions: List[SessionEntry] = []
+        self.thought_spans = array('q')
+        self._build_index(progress)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _followed_by_colon(self, position: int) -> bool:
+        data = self.map
+        while position < len(data) and data[position] in WHITESPACE:
+            position += 1
+        return data[position:position + 1] == b':'
+
+    def _build_index(self, progress: Callable[[float], None] = None):
+        """Record session and thought offsets in a single pass over the file"""
+        # Each open container is (role, last key seen in it); roles are 'top',
+        # 'sessions', 'session', 'thoughts', 'thought' or None for anything else
+        stack: List[list] = []
+        session = None
+        thought_start = 0
+        size = len(self.map) or 1
+        position, count = 0, 0
+        while True:
+            match = TOKEN_RE.search(self.map, position)
+            if match is None:
+                break
+            position = match.end()
+            count += 1
+            if progress and count % 65536 == 0:
+                progress(position / size)
+            if stack and stack[-1][0] == 'thoughts' and match.group() == b'{':
+                # Thoughts are flat, so one C-level match usually skips the whole record
+                whole = FLAT_OBJECT_RE.match(self.map, match.start())
+                if whole:
+                    self.thought_spans.extend((whole.start(), whole.end()))
+                    session.thought_count += 1
+                    position = whole.end()
+                    continue
+            token = match.group()
+            first = token[0]
+            if first == 0x22:  # '"'
+                if not stack:
+                    continue
+                frame = stack[-1]
+                if frame[0] in ('top', 'session'):
+                    if self._followed_by_colon(match.end()):
+                        frame[1] = token[1:-1]
+                    elif frame[0] == 'session' and frame[1] in (b'id', b'title'):
+                        setattr(session, frame[1].decode(), json.loads(token))
+                continue
+
+            parent = stack[-1] if stack else None
+            if first == 0x7b:  # '{'
+                role = None
+                if parent is None:
+                    role = 'top'
+                elif parent[0] == 'sessions':
+                    role = 'session'
+                    session = SessionEntry('', '', match.start(), 0, len(self.thought_spans) // 2, 0)
+                elif parent[0] == 'thoughts':
+                    role = 'thought'
+                    thought_start = match.start()
+                stack.append([role, None])
+            elif first == 0x5b:  # '['
+                role = None
+                if parent is None or (parent[0] == 'top' and parent[1] == b'sessions'):
+                    role = 'sessions'
+                elif parent[0] == 'session' and parent[1] == b'thoughts':
+                    role = 'thoughts'
+                stack.append([role, None])
+            else:  # '}' or ']'
+                if not stack:
+                    raise ValueError(f"Unbalanced JSON at byte {match.start()}")
+                role = stack.pop()[0]
+                if role == 'thought':
+                    self.thought_spans.extend((thought_start, match.end()))
+                    session.thought_count += 1
+                elif role == 'session':
+                    session.end = match.end()
+                    self.sessions.append(session)
+                if not stack:
+                    break
+        if stack:
+            raise ValueError("Truncated data file")
+
+    def __len__(self) -> int:
+        return len(self.thought_spans) // 2
+
+    def _decode(self, start: int, end: int) -> Dict[str, Any]:
+        return json.loads(self.map[start:end].decode('utf-8'))
+
+    def thought(self, position: int) -> Dict[str, Any]:
+        """Decode the thought at a position in file order"""
+        return self._decode(self.thought_spans[2 * position], self.thought_spans[2 * position + 1])
+
+    def session_meta(self, index: int) -> Dict[str, Any]:
+        """Decode a session's fields other than its thoughts"""
+        entry = self.sessions[index]
+        if not entry.thought_count:
+            return self._decode(entry.start, entry.end)
+        # Splice the thoughts array out so only the metadata is decoded
+        first = self.thought_spans[2 * entry.first_thought]
+        last = self.thought_spans[2 * (entry.first_thought + entry.thought_count) - 1]
+        return json.loads((self.map[entry.start:first] + self.map[last:entry.end]).decode('utf-8'))
+
+    def thoughts(self, index: int, offset: int = 0, limit: int = None) -> Iterator[Dict[str, Any]]:
+        """Decode a page of one session's thoughts"""
+        entry = self.sessions[index]
+        stop = entry.thought_count if limit is None else min(entry.thought_count, offset + limit)
+        for position in range(entry.first_thought + offset, entry.first_thought + stop):
+            yield self.thought(position)
+
+    def find_session(self, key: str) -> Optional[int]:
+        """Resolve a 1-based session number or a session ID to an index"""
+        if key.isdigit() and 1 <= int(key) <= len(self.sessions):
+            return int(key) - 1
+        return next((i for i, entry in enumerate(self.sessions) if entry.id == key), None)
+
+    def search(self, text: str, limit: int = 50) -> List[Tuple[SessionEntry, Dict[str, Any]]]:
+        """Thoughts whose content contains text (case-insensitive), in file order
+
+        The raw bytes are scanned in C; only thoughts with a hit are decoded.
+        Letters outside ASCII are matched case-sensitively.
+        """
+        needle = json.dumps(text, ensure_ascii=False)[1:-1].encode('utf-8')
+        pattern = re.compile(re.escape(needle), re.IGNORECASE)
+        starts = self.thought_spans[0::2]
+        session_starts = [entry.first_thought for entry in self.sessions]
+        results, last = [], -1
+        lowered = text.lower()
+        for match in pattern.finditer(self.map):
+            position = bisect.bisect_right(starts, match.start()) - 1
+            if position <= last or position < 0 or match.end() > self.thought_spans[2 * position + 1]:
+                continue
+            last = position
+            thought = self.thought(position)
+            if lowered in thought.get('content', '').lower():
+                session = self.sessions[bisect.bisect_right(session_starts, position) - 1]
+                results.append((session, thought))
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def format_thought(thought: Dict[str, Any]) -> str:
+    """One display line for a decoded thought"""
+    status = "✅" if thought.get('is_completed') else "⭕"
+    stars = "⭐" * int(thought.get('priority', 0))
+    return f"{status} {thought.get('content', '')[:80]}  [{thought.get('category', '')}] {stars} ({thought.get('id', '')})"
+
+
+def run_viewer(path: str):
+    """Interactive read-only viewer for the CLI"""
+    try:
+        workspace = MappedWorkspace(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot view {path}: {e}")
+        return
+
+    with workspace:
+        print(f"\n👀 Viewing {path} read-only: {len(workspace.sessions)} sessions, {len(workspace)} thoughts")
+        print("Commands: sessions [page] | open <n|id> [page] | find <text> | done")
+        page_size = 20
+        while True:
+            command = input("👀 view> ").strip()
+            words = command.split()
+            if not words:
+                continue
+            if words[0] in ('done', 'quit', 'exit'):
+                break
+            if words[0] == 'sessions':
+                page = int(words[1]) if len(words) > 1 and words[1].isdigit() else 1
+                start = (page - 1) * page_size
+                for number, entry in enumerate(workspace.sessions[start:start + page_size], start + 1):
+                    print(f"{number}. {entry.title} ({entry.id}) - {entry.thought_count} thoughts")
+                if start + page_size < len(workspace.sessions):
+                    print(f"➡️ More: sessions {page + 1}")
+            elif words[0] == 'open' and len(words) > 1:
+                index = workspace.find_session(words[1])
+                if index is None:
+                    print(f"❌ No session '{words[1]}'")
+                    continue
+                page = int(words[2]) if len(words) > 2 and words[2].isdigit() else 1
+                meta = workspace.session_meta(index)
+                print(f"\n📖 {meta.get('title')} - {meta.get('description', '')}")
+                for thought in workspace.thoughts(index, (page - 1) * page_size, page_size):
+                    print(f"   {format_thought(thought)}")
+                if page * page_size < workspace.sessions[index].thought_count:
+                    print(f"➡️ More: open {words[1]} {page + 1}")
+            elif words[0] == 'find' and len(words) > 1:
+                results = workspace.search(command[5:].strip())
+                for entry, thought in results:
+                    print(f"   {entry.title}: {format_thought(thought)}")
+                if not results:
+                    print("🤔 No matching thoughts")
+            else:
+                print("❌ Commands: sessions [page] | open <n|id> [page] | find <text> | done")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python thinker_viewer.py <data file>")
+    else:
+        run_viewer(sys.argv[1])
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Python Thinker App - External change watcher
+Notices when another process rewrites the data file and works out which
+sessions changed without parsing the whole file: every session record is
+hashed (an uncompressed file is memory-mapped and hashed byte-for-byte) and
+only records whose hash differs from the previous scan are decoded.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from thinker_export import file_stamp
+from thinker_schema import DataDocument, encode_session, upgrade_record
+from thinker_storage import codec_for, open_data_file
+from thinker_viewer import MappedWorkspace
+
+
+def record_hash(text: str) -> str:
+    """Hash of a session record as it appears in the file, from its '{' to its '}'"""
+    return hashlib.sha1(text.strip().encode('utf-8')).hexdigest()
+
+
+@dataclass
+class ExternalChanges:
+    """What a scan found: changed session records (already upgraded) and the new baseline"""
+    stamp: Any
+    hashes: Dict[str, str]  # session id -> record hash, for every session in the file
+    changed: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class DataFileWatcher:
+    """Polls a ThinkerApp's data file and diffs it session by session
+
+    check() is cheap (one stat) and is meant for the UI thread; scan() reads the
+    file and may run on a worker thread; accept() records a scan once applied.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.stamp = None
+        self.hashes: Dict[str, str] = {}
+
+    def _current_stamp(self):
+        try:
+            return file_stamp(self.app.data_file)
+        except OSError:
+            return None
+
+    def baseline(self):
+        """Hash the file as loaded, so the first scan only decodes what changed since"""
+        stamp = self.app.loaded_stamp
+        if stamp is None or self._current_stamp() != stamp:
+            return  # already changed (or missing): the first scan compares everything
+        changes = self.scan(previous={}, decode=False)
+        if changes.stamp == stamp:
+            self.stamp, self.hashes = changes.stamp, changes.hashes
+
+    def check(self) -> bool:
+        """Whether the file changed since the last scan, other than by the app's own saves"""
+        stamp = self._current_stamp()
+        if stamp is None or stamp == self.stamp:
+            return False
+        if stamp == self.app.saved_stamp:
+            # Our own save: the hashes of exactly what it wrote, spilled sessions included
+            self.stamp = stamp
+            self.hashes = dict(self.app.saved_hashes)
+            return False
+        return True
+
+    def scan(self, previous: Dict[str, str] = None, decode: bool = True) -> ExternalChanges:
+        """Hash every session record in the file and decode the ones that changed"""
+        previous = self.hashes if previous is None else previous
+        path = self.app.data_file
+        stamp = self._current_stamp()
+        with open_data_file(path) as f:
+            version = DataDocument(f).version
+        hashes: Dict[str, str] = {}
+        changed: Dict[str, Dict[str, Any]] = {}
+        if codec_for(path):
+            indent = None if self.app.compact else 2
+            with open_data_file(path) as f:
+                for record in DataDocument(f).sessions():
+                    digest = record_hash(encode_session(record, indent))
+                    hashes[record['id']] = digest
+                    if decode and previous.get(record['id']) != digest:
+                        changed[record['id']] = record
+        else:
+            with MappedWorkspace(path) as workspace:
+                for entry in workspace.sessions:
+                    digest = hashlib.sha1(workspace.map[entry.start:entry.end]).hexdigest()
+                    hashes[entry.id] = digest
+                    if decode and previous.get(entry.id) != digest:
+                        record = json.loads(workspace.map[entry.start:entry.end].decode('utf-8'))
+                        changed[entry.id] = upgrade_record(record, version)
+        return ExternalChanges(stamp, hashes, changed)
+
+    def accept(self, changes: ExternalChanges):
+        """Make a scan the baseline for the next one"""
+        self.stamp, self.hashes = changes.stamp, changes.hashes
+
+    def poll(self) -> Optional[ExternalChanges]:
+        """check() and scan() in one call, for callers without a worker thread"""
+        return self.scan() if self.check() else None